@@ -0,0 +1,223 @@
+"""baseline schema
+
+Skema yang sebelumnya dibuat Base.metadata.create_all saat startup.
+Idempotent: tabel yang sudah ada (database lama) dilewati, sehingga database existing cukup `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _missing(table: str) -> bool:
+    if context.is_offline_mode():
+        return True
+    return not sa.inspect(op.get_bind()).has_table(table)
+
+
+def upgrade() -> None:
+    if _missing('talent'):
+        op.create_table(
+            'talent',
+            sa.Column('idtalent', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('nama', sa.String(255)),
+            sa.Column('email', sa.String(255), unique=True),
+            sa.Column('password', sa.String(255)),
+            sa.Column('pretest_score', sa.Float()),
+            sa.Column('role', sa.String(50)),
+        )
+    if _missing('manajemen'):
+        op.create_table(
+            'manajemen',
+            sa.Column('idmanajemen', sa.Integer(), primary_key=True),
+            sa.Column('namamanajemen', sa.String(255)),
+            sa.Column('email', sa.String(255)),
+            sa.Column('password', sa.String(255)),
+        )
+    if _missing('materiujian'):
+        op.create_table(
+            'materiujian',
+            sa.Column('idmateriujian', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('kategori', sa.String(255)),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+        )
+    if _missing('materiujiankalimat'):
+        op.create_table(
+            'materiujiankalimat',
+            sa.Column('idmateriujiankalimat', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('idmateriujian', sa.Integer(), sa.ForeignKey('materiujian.idmateriujian')),
+            sa.Column('kalimat', sa.String(255)),
+            sa.Column('fonem', sa.String(255)),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+        )
+    if _missing('ujianfonem'):
+        op.create_table(
+            'ujianfonem',
+            sa.Column('idujian', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('idmateriujian', sa.Integer(), sa.ForeignKey('materiujian.idmateriujian')),
+            sa.Column('idtalent', sa.Integer(), sa.ForeignKey('talent.idtalent')),
+            sa.Column('kategori', sa.String(255)),
+            sa.Column('nilai', sa.Float()),
+            sa.Column('waktuujian', sa.DateTime()),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+        )
+    if _missing('detailujianfonem'):
+        op.create_table(
+            'detailujianfonem',
+            sa.Column('iddetail', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('idujian', sa.Integer(), sa.ForeignKey('ujianfonem.idujian')),
+            sa.Column('idsoal', sa.Integer(), sa.ForeignKey('materiujiankalimat.idmateriujiankalimat')),
+            sa.Column('nilai', sa.Float()),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+        )
+    if _missing('materifonemkalimat'):
+        op.create_table(
+            'materifonemkalimat',
+            sa.Column('idmaterifonemkalimat', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('kategori', sa.String(255)),
+            sa.Column('kalimat', sa.String(255)),
+            sa.Column('fonem', sa.String(255)),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+        )
+    if _missing('materifonemkata'):
+        op.create_table(
+            'materifonemkata',
+            sa.Column('idmaterifonemkata', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('kategori', sa.String(255)),
+            sa.Column('kata', sa.String(255)),
+            sa.Column('fonem', sa.String(255)),
+            sa.Column('meaning', sa.String(255)),
+            sa.Column('definition', sa.String(255)),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+        )
+    if _missing('materipercakapan'):
+        op.create_table(
+            'materipercakapan',
+            sa.Column('idmateripercakapan', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('topic', sa.String(255)),
+        )
+    if _missing('materiinterview'):
+        op.create_table(
+            'materiinterview',
+            sa.Column('idmateriinterview', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('question', sa.String(255)),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.Column('is_active', sa.Boolean(), nullable=False, server_default='true'),
+        )
+    if _missing('hasillatihanfonem'):
+        op.create_table(
+            'hasillatihanfonem',
+            sa.Column('idhasilfonem', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('typelatihan', sa.String(255)),
+            sa.Column('idtalent', sa.Integer(), sa.ForeignKey('talent.idtalent')),
+            sa.Column('idsoal', sa.Integer()),
+            sa.Column('nilai', sa.Float()),
+            sa.Column('waktulatihan', sa.DateTime()),
+            sa.Column('phoneme_comparison', postgresql.JSON()),
+        )
+    if _missing('talentphonemeconfusion'):
+        op.create_table(
+            'talentphonemeconfusion',
+            sa.Column('idtalent', sa.Integer(), sa.ForeignKey('talent.idtalent', ondelete='CASCADE')),
+            sa.Column('target_phoneme', sa.String(16)),
+            sa.Column('realised_phoneme', sa.String(16)),
+            sa.Column('status', sa.String(16)),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.PrimaryKeyConstraint('idtalent', 'target_phoneme', 'realised_phoneme'),
+        )
+    if _missing('hasillatihanpercakapan'):
+        op.create_table(
+            'hasillatihanpercakapan',
+            sa.Column('idhasilpercakapan', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('idtalent', sa.Integer(), sa.ForeignKey('talent.idtalent')),
+            sa.Column('idmateripercakapan', sa.Integer(), sa.ForeignKey('materipercakapan.idmateripercakapan')),
+            sa.Column('wpm', sa.Float()),
+            sa.Column('grammar', sa.String(255)),
+            sa.Column('waktulatihan', sa.DateTime()),
+        )
+    if _missing('hasillatihaninterview'):
+        op.create_table(
+            'hasillatihaninterview',
+            sa.Column('idhasilinterview', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('idtalent', sa.Integer(), sa.ForeignKey('talent.idtalent')),
+            sa.Column('waktulatihan', sa.DateTime()),
+            sa.Column('feedback', sa.Text()),
+            sa.Column('wpm', sa.Float()),
+            sa.Column('grammar', sa.String(255)),
+        )
+    if _missing('appsession'):
+        op.create_table(
+            'appsession',
+            sa.Column('namespace', sa.String(32)),
+            sa.Column('key', sa.String(64)),
+            sa.Column('data', sa.LargeBinary(), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.PrimaryKeyConstraint('namespace', 'key'),
+        )
+        op.create_index('ix_appsession_expires_at', 'appsession', ['expires_at'])
+    if _missing('statcounter'):
+        op.create_table(
+            'statcounter',
+            sa.Column('name', sa.String(64), primary_key=True),
+            sa.Column('value', sa.BigInteger(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+        )
+    if _missing('talentstats'):
+        op.create_table(
+            'talentstats',
+            sa.Column('idtalent', sa.Integer(), sa.ForeignKey('talent.idtalent', ondelete='CASCADE'), primary_key=True),
+            sa.Column('phoneme_count', sa.Integer(), nullable=False),
+            sa.Column('phoneme_score_sum', sa.Float(), nullable=False),
+            sa.Column('phoneme_items_done', sa.Integer(), nullable=False),
+            sa.Column('conversation_count', sa.Integer(), nullable=False),
+            sa.Column('conversation_wpm_sum', sa.Float(), nullable=False),
+            sa.Column('interview_count', sa.Integer(), nullable=False),
+            sa.Column('interview_wpm_sum', sa.Float(), nullable=False),
+            sa.Column('exam_count', sa.Integer(), nullable=False),
+            sa.Column('exam_score_sum', sa.Float(), nullable=False),
+            sa.Column('latest_exam', sa.Float()),
+            sa.Column('latest_exam_at', sa.DateTime()),
+            sa.Column('highest_exam', sa.Float()),
+            sa.Column('last_activity_date', sa.Date()),
+            sa.Column('current_run', sa.Integer(), nullable=False),
+            sa.Column('highest_streak', sa.Integer(), nullable=False),
+            sa.Column('week_start', sa.Date()),
+            sa.Column('week_active_days', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+        )
+    if _missing('leaderboardsnapshot'):
+        op.create_table(
+            'leaderboardsnapshot',
+            sa.Column('category', sa.String(32)),
+            sa.Column('rank', sa.Integer()),
+            sa.Column('idtalent', sa.Integer(), sa.ForeignKey('talent.idtalent', ondelete='CASCADE'), nullable=False),
+            sa.Column('nama', sa.String(255)),
+            sa.Column('email', sa.String(255)),
+            sa.Column('score', sa.Float()),
+            sa.Column('attempts', sa.Integer()),
+            sa.Column('total_attempts', sa.Integer()),
+            sa.Column('last_date', sa.DateTime()),
+            sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False),
+            sa.PrimaryKeyConstraint('category', 'rank'),
+        )
+
+
+def downgrade() -> None:
+    for table in (
+        'leaderboardsnapshot', 'talentstats', 'statcounter', 'appsession', 'hasillatihaninterview',
+        'hasillatihanpercakapan', 'talentphonemeconfusion', 'hasillatihanfonem', 'materiinterview',
+        'materipercakapan', 'materifonemkata', 'materifonemkalimat', 'detailujianfonem', 'ujianfonem',
+        'materiujiankalimat', 'materiujian', 'manajemen', 'talent',
+    ):
+        op.drop_table(table)
@@ -0,0 +1,46 @@
+"""hot path indexes
+
+Index komposit sesuai pola akses repository:
+- riwayat/progress per talent diurutkan (waktu, id) -> keyset pagination & window count (TalentRepository, HistoryRepository)
+- hitung attempt per soal (TalentStatsRepository.record_phoneme), ujian terbuka per talent (ExamRepository)
+- detail per ujian, kalimat per set ujian, filter materi per kategori (MaterialRepository)
+Dibuat CONCURRENTLY agar tabel hasil tetap bisa ditulis selama migrasi.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_hasillatihanfonem_idtalent_waktulatihan', 'hasillatihanfonem', ['idtalent', 'waktulatihan', 'idhasilfonem']),
+    ('ix_hasillatihanfonem_idtalent_typelatihan_waktulatihan', 'hasillatihanfonem', ['idtalent', 'typelatihan', 'waktulatihan', 'idhasilfonem']),
+    ('ix_hasillatihanfonem_idtalent_typelatihan_idsoal', 'hasillatihanfonem', ['idtalent', 'typelatihan', 'idsoal']),
+    ('ix_ujianfonem_idtalent_waktuujian', 'ujianfonem', ['idtalent', 'waktuujian', 'idujian']),
+    ('ix_ujianfonem_idtalent_idmateriujian', 'ujianfonem', ['idtalent', 'idmateriujian']),
+    ('ix_detailujianfonem_idujian', 'detailujianfonem', ['idujian', 'iddetail']),
+    ('ix_hasillatihanpercakapan_idtalent_waktulatihan', 'hasillatihanpercakapan', ['idtalent', 'waktulatihan', 'idhasilpercakapan']),
+    ('ix_hasillatihaninterview_idtalent_waktulatihan', 'hasillatihaninterview', ['idtalent', 'waktulatihan', 'idhasilinterview']),
+    ('ix_materiujian_kategori', 'materiujian', ['kategori']),
+    ('ix_materiujiankalimat_idmateriujian', 'materiujiankalimat', ['idmateriujian']),
+    ('ix_materifonemkata_kategori', 'materifonemkata', ['kategori']),
+    ('ix_materifonemkalimat_kategori', 'materifonemkalimat', ['kategori']),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY tidak boleh di dalam transaksi
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,31 @@
+"""leaderboard trigram index
+
+Index GIN trigram untuk search nama leaderboard (ILIKE '%x%' di LeaderboardRepository.get_page).
+Butuh ekstensi pg_trgm; role migrasi harus boleh CREATE EXTENSION (atau ekstensi sudah dipasang DBA).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_leaderboardsnapshot_nama_trgm', 'leaderboardsnapshot', ['nama'],
+            if_not_exists=True, postgresql_concurrently=True,
+            postgresql_using='gin', postgresql_ops={'nama': 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    # Ekstensi pg_trgm dibiarkan: bisa dipakai objek lain di database
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_leaderboardsnapshot_nama_trgm', table_name='leaderboardsnapshot', if_exists=True, postgresql_concurrently=True)
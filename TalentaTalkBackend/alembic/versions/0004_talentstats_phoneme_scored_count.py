@@ -0,0 +1,29 @@
+"""talentstats phoneme scored count
+
+Jumlah attempt fonem yang bernilai (nilai NOT NULL), pembagi avg_pronunciation.
+phoneme_count tetap menghitung semua attempt (jumlah sesi). Diisi dari tabel hasil untuk baris yang sudah ada.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('talentstats', sa.Column('phoneme_scored_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute(
+        "UPDATE talentstats SET phoneme_scored_count = scored.count "
+        "FROM (SELECT idtalent, count(nilai) AS count FROM hasillatihanfonem GROUP BY idtalent) AS scored "
+        "WHERE scored.idtalent = talentstats.idtalent"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('talentstats', 'phoneme_scored_count')
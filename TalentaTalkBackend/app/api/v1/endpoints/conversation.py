@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
-from app.core.database import get_db
+from app.core.database import get_db, AsyncSessionLocal
 from app.services.conversation_service import ConversationService
 from app.schemas.conversation import ChatInput, ChatResponse, ConversationStart, TopicListResponse
 from app.schemas.response import ResponseBase
 from app.api.deps import get_current_user
 from app.models.models import Hasillatihanpercakapan
+from app.utils.sse import sse_from_events, SSE_MEDIA_TYPE, SSE_HEADERS
 
 router = APIRouter()
 
@@ -27,20 +29,49 @@ async def start_conversation(db: AsyncSession = Depends(get_db)):
 
 @router.post("/chat", response_model=ResponseBase[ChatResponse])
 async def chat(
+    request: Request,
     input_data: ChatInput,
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
+    """Header X-Session-ID opsional: jika ada, giliran sebelumnya ikut jadi konteks"""
     service = ConversationService(db)
     talent_id = current_user["idtalent"]
     result = await service.process_chat(
         user_input=input_data.user_input,
         duration=input_data.duration,
         talent_id=talent_id,
-        topic_id=input_data.topic_id
+        topic_id=input_data.topic_id,
+        session_id=request.headers.get("X-Session-ID")
     )
     return ResponseBase(data=ChatResponse(**result))
 
+@router.post("/chat/stream")
+async def chat_stream(
+    request: Request,
+    input_data: ChatInput,
+    current_user: dict = Depends(get_current_user)
+):
+    """SSE: event 'token' per potongan balasan AI, event 'done' berisi grammar + skor setelah tersimpan"""
+    talent_id = current_user["idtalent"]
+    session_id = request.headers.get("X-Session-ID")
+
+    async def event_stream():
+        # Session sendiri: dependency get_db bisa sudah ditutup saat body stream berjalan
+        async with AsyncSessionLocal() as db:
+            service = ConversationService(db)
+            events = service.stream_chat(
+                user_input=input_data.user_input,
+                duration=input_data.duration,
+                talent_id=talent_id,
+                topic_id=input_data.topic_id,
+                session_id=session_id
+            )
+            async for frame in sse_from_events(events):
+                yield frame
+
+    return StreamingResponse(event_stream(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
+
 @router.get("/report", response_model=ResponseBase)
 async def get_conversation_report(
     current_user: dict = Depends(get_current_user),
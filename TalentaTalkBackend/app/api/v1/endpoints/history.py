@@ -1,23 +1,33 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.repositories.history_repository import HistoryRepository
 from app.schemas.response import ResponseBase
+from app.utils.pagination import Page
 from app.utils.time_utils import TimeUtils
+from typing import Optional
 
 router = APIRouter()
 
+def set_next_cursor(response: Response, page: Page):
+    # Cursor halaman berikutnya lewat header agar bentuk body tetap list
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+
 @router.get("/phoneme", response_model=ResponseBase)
 async def get_phoneme_history(
+    response: Response,
     page: int = 1, size: int = 10,
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db)
 ):
     talent_id = 1
     repo = HistoryRepository(db)
-    items = await repo.get_phoneme_history(talent_id, skip=(page-1)*size, limit=size)
+    result = await repo.get_phoneme_history(talent_id, skip=(page-1)*size, limit=size, cursor=cursor)
+    set_next_cursor(response, result)
     
     data = []
-    for item in items:
+    for item in result.rows:
         raw = item["raw"]
         data.append({
             "idsoal": raw.idsoal,
@@ -31,14 +41,19 @@ async def get_phoneme_history(
 
 @router.get("/conversation", response_model=ResponseBase)
 async def get_conversation_history(
+    response: Response,
+    page: int = 1, size: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db)
 ):
     talent_id = 1
     repo = HistoryRepository(db)
-    rows = await repo.get_conversation_history(talent_id)
+    skip = (page-1)*size if size else 0
+    result = await repo.get_conversation_history(talent_id, skip=skip, limit=size, cursor=cursor)
+    set_next_cursor(response, result)
     
     data = []
-    for model, topic in rows:
+    for model, topic in result.rows:
         data.append({
             "topic": topic,
             "wpm": model.wpm,
@@ -49,14 +64,19 @@ async def get_conversation_history(
 
 @router.get("/exam", response_model=ResponseBase)
 async def get_exam_history(
+    response: Response,
+    page: int = 1, size: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db)
 ):
     talent_id = 1
     repo = HistoryRepository(db)
-    history_data = await repo.get_exam_history(talent_id)
+    skip = (page-1)*size if size else 0
+    result = await repo.get_exam_history(talent_id, skip=skip, limit=size, cursor=cursor)
+    set_next_cursor(response, result)
     
     formatted_data = []
-    for h in history_data:
+    for h in result.rows:
         exam = h["exam"]
         formatted_data.append({
             "idujian": exam.idujian,
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.services.talent_service import TalentService
-from app.repositories.dashboard_repository import DashboardRepository
+from app.repositories.talent_stats_repository import TalentStatsRepository
+from app.utils.time_utils import TimeUtils
 from app.schemas.response import ResponseBase
 from app.api.deps import get_current_user
 
@@ -14,19 +15,19 @@ async def get_home_summary(
     db: AsyncSession = Depends(get_db)
 ):
     talent_id = current_user["idtalent"]
-    dash_repo = DashboardRepository(db)
     talent_service = TalentService(db)
     
     talent_detail = await talent_service.get_talent_detail(talent_id)
-    phoneme_count = await dash_repo.get_user_phoneme_counts(talent_id)
-    avg_pronunciation = await dash_repo.get_user_avg_pronunciation(talent_id)
-    conv_stats = await dash_repo.get_user_conversation_stats(talent_id)
-    int_stats = await dash_repo.get_user_interview_stats(talent_id)
+    # Statistik dari satu baris rollup talentstats
+    stats = TalentStatsRepository.summary(await TalentStatsRepository(db).get_or_build(talent_id))
+    phoneme_count = stats["phoneme_count"]
+    avg_pronunciation = stats["avg_pronunciation"]
     
-    speaking_sessions = (conv_stats["count"] or 0) + (int_stats["count"] or 0)
-    avg_wpm = ((conv_stats["avg_wpm"] or 0) + (int_stats["avg_wpm"] or 0)) / 2 if speaking_sessions > 0 else 0
+    speaking_sessions = stats["conversation_count"] + stats["interview_count"]
+    avg_wpm = (stats["avg_wpm_conversation"] + stats["avg_wpm_interview"]) / 2 if speaking_sessions > 0 else 0
     
-    progress = await talent_service.repo.get_talent_progress_stats(talent_id)
+    last_exam_at = stats["latest_exam_at"]
+    last_exam_days_ago = (TimeUtils.today_wib() - TimeUtils.to_wib_date(last_exam_at)).days if last_exam_at else 0
     
     data = {
         "user": {
@@ -34,8 +35,8 @@ async def get_home_summary(
             "name": talent_detail["nama"]
         },
         "learning_streak": {
-            "current_streak": 1,
-            "this_week_activities": 0
+            "current_streak": stats["current_streak"],
+            "this_week_activities": stats["week_active_days"]
         },
         "quick_stats": {
             "total_training_sessions": phoneme_count + speaking_sessions,
@@ -49,10 +50,10 @@ async def get_home_summary(
             "data": [] 
         },
         "exam_summary": {
-            "latest_exam_score": progress.get('latest_exam') or 0,
-            "total_exams": 0,
-            "average_exam_score": 0,
-            "last_exam_days_ago": 0
+            "latest_exam_score": stats["latest_exam"] or 0,
+            "total_exams": stats["exam_count"],
+            "average_exam_score": round(stats["avg_exam_score"], 1),
+            "last_exam_days_ago": last_exam_days_ago
         }
     }
     
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
+from app.core.database import get_db, AsyncSessionLocal
 from app.services.interview_service import InterviewService
 from app.schemas.response import ResponseBase
 from app.schemas.conversation import ChatInput
 from app.api.deps import get_current_user
+from app.utils.sse import sse_from_events, SSE_MEDIA_TYPE, SSE_HEADERS
 import uuid
 
 router = APIRouter()
@@ -48,6 +50,25 @@ async def answer_question(
     result = await service.process_answer(session_id, input_data.user_input, input_data.duration)
     return ResponseBase(data=result)
 
+@router.post("/answer/stream")
+async def answer_question_stream(
+    request: Request,
+    input_data: ChatInput
+):
+    """SSE: follow-up question di-stream per token, feedback + status dikirim di event 'done'"""
+    session_id = request.headers.get("X-Session-ID")
+    if not session_id:
+        return ResponseBase(success=False, message="Missing X-Session-ID header")
+
+    async def event_stream():
+        # Session sendiri: dependency get_db bisa sudah ditutup saat body stream berjalan
+        async with AsyncSessionLocal() as db:
+            events = InterviewService(db).stream_answer(session_id, input_data.user_input, input_data.duration)
+            async for frame in sse_from_events(events):
+                yield frame
+
+    return StreamingResponse(event_stream(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
+
 @router.post("/summary", response_model=ResponseBase)
 async def get_summary(
     request: Request,
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.services.material_service import MaterialService
 from app.repositories.material_repository import MaterialRepository
+from app.services.interview_snapshot import InterviewQuestionSnapshot
 from app.schemas.material import (
     PhonemeWordCreate, PhonemeWordUpdate,
     PhonemeSentenceCreate, PhonemeSentenceUpdate,
@@ -48,7 +49,7 @@ async def get_exam_template():
 
 @router.get("/interview-questions/import-template")
 async def get_interview_template():
-    buffer = TemplateGenerator.get_phoneme_word_template()
+    buffer = TemplateGenerator.get_interview_question_template()
     return StreamingResponse(
         buffer,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
@@ -109,19 +110,16 @@ async def import_words(file: UploadFile = File(...), db: AsyncSession = Depends(
 @router.get("/phoneme-material/{category}/detail", response_model=ResponseBase)
 async def get_words_by_category_detail(
     category: str, 
-    page: int = 1, 
-    limit: int = 10, 
+    page: int = Query(1, ge=1), 
+    limit: int = Query(10, ge=1), 
     db: AsyncSession = Depends(get_db)
 ):
     repo = MaterialRepository(db)
-    all_words = await repo.get_words_by_category(category)
-    total = len(all_words)
-    start = (page - 1) * limit
-    end = start + limit
-    paginated_words = all_words[start:end]
+    result = await repo.get_words_by_category_paginated(category, (page - 1) * limit, limit)
+    total = result.total
     
     data = []
-    for w in paginated_words:
+    for w in result.rows:
         data.append({
             "id": w.idmaterifonemkata,
             "word": w.kata,
@@ -190,19 +188,16 @@ async def import_sentences(file: UploadFile = File(...), db: AsyncSession = Depe
 @router.get("/exercise-phoneme/{category}/detail", response_model=ResponseBase)
 async def get_sentences_by_category_detail(
     category: str, 
-    page: int = 1, 
-    limit: int = 10, 
+    page: int = Query(1, ge=1), 
+    limit: int = Query(10, ge=1), 
     db: AsyncSession = Depends(get_db)
 ):
     repo = MaterialRepository(db)
-    all_sentences = await repo.get_sentences_by_category(category)
-    total = len(all_sentences)
-    start = (page - 1) * limit
-    end = start + limit
-    paginated = all_sentences[start:end]
+    result = await repo.get_sentences_by_category_paginated(category, (page - 1) * limit, limit)
+    total = result.total
     
     data = []
-    for s in paginated:
+    for s in result.rows:
         data.append({
             "id": s.idmaterifonemkalimat,
             "sentence": s.kalimat,
@@ -271,31 +266,21 @@ async def import_exams(file: UploadFile = File(...), db: AsyncSession = Depends(
 @router.get("/exam-phoneme/{category}/detail", response_model=ResponseBase)
 async def get_exam_by_category_detail(
     category: str,
-    page: int = 1,
-    limit: int = 10,
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1),
     db: AsyncSession = Depends(get_db)
 ):
-    from sqlalchemy import select, func
-    from app.models.models import Materiujian, Materiujiankalimat
-    
-    q = select(Materiujian).where(Materiujian.kategori == category)
-    result = await db.execute(q)
-    exams = result.scalars().all()
-    
-    total = len(exams)
+    repo = MaterialRepository(db)
     start = (page - 1) * limit
-    end = start + limit
-    paginated = exams[start:end]
+    result = await repo.get_exams_by_category_paginated(category, start, limit)
+    total = result.total
     
     data = []
-    for idx, ex in enumerate(paginated):
-        q_count = select(func.count(Materiujiankalimat.idmateriujiankalimat)).where(Materiujiankalimat.idmateriujian == ex.idmateriujian)
-        count = await db.scalar(q_count)
-        
+    for idx, ex in enumerate(result.rows):
         data.append({
             "exam_id": ex.idmateriujian,
             "test_number": f"Test {start + idx + 1}",
-            "total_sentence": count,
+            "total_sentence": ex.total_sentence,
             "last_update": TimeUtils.format_to_wib(ex.updated_at)
         })
         
@@ -356,18 +341,13 @@ async def get_interview_questions(page: int = 1, size: int = 10, db: AsyncSessio
 
 @router.get("/interview-questions/mobile-order", response_model=ResponseBase)
 async def get_mobile_order(limit: int = None, db: AsyncSession = Depends(get_db)):
-    from sqlalchemy import select
-    from app.models.models import Materiinterview
-    
-    q = select(Materiinterview).where(Materiinterview.is_active == True).order_by(Materiinterview.idmateriinterview.asc())
+    snapshot = await InterviewQuestionSnapshot.get(MaterialRepository(db))
+    pairs = list(zip(snapshot.ids, snapshot.questions))
     if limit:
-        q = q.limit(limit)
-        
-    result = await db.execute(q)
-    questions = result.scalars().all()
-    
-    data = [{"id": q.idmateriinterview, "question": q.question} for q in questions]
-    return ResponseBase(data={"questions": data})
+        pairs = pairs[:limit]
+
+    data = [{"id": qid, "question": question} for qid, question in pairs]
+    return ResponseBase(data={"questions": data, "version": snapshot.version})
 
 @router.post("/interview-questions", response_model=ResponseBase)
 async def add_interview_question(request: InterviewQuestionCreate, db: AsyncSession = Depends(get_db)):
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.services.profile_service import ProfileService
@@ -14,4 +14,14 @@ async def get_profile_summary(
 ):
     service = ProfileService(db)
     data = await service.get_mobile_profile(current_user["idtalent"])
-    return ResponseBase(data=data)
\ No newline at end of file
+    return ResponseBase(data=data)
+
+@router.get("/weakest-phonemes", response_model=ResponseBase)
+async def get_weakest_phonemes(
+    limit: int = Query(5, ge=1, le=50),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    service = ProfileService(db)
+    data = await service.get_weakest_phonemes(current_user["idtalent"], limit)
+    return ResponseBase(data=data)
@@ -1,38 +1,102 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, Path
+from fastapi import APIRouter, Depends, UploadFile, File, Form, Path, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, AsyncSessionLocal
 from app.services.phoneme_service import PhonemeService
+from app.services.analysis_worker import PhonemeAnalysisWorker
 from app.repositories.material_repository import MaterialRepository
 from app.repositories.score_repository import ScoreRepository
 from app.schemas.response import ResponseBase
 from app.schemas.phoneme import PhonemeCheckResponse
+from app.utils.sse import format_sse, sse_comment, SSE_MEDIA_TYPE, SSE_HEADERS
+from app.utils.pipeline import StageTimer, cancel_on_disconnect
+import asyncio
 
 router = APIRouter()
 
 @router.post("/compare", response_model=ResponseBase[PhonemeCheckResponse])
 async def compare_phonemes(
+    request: Request,
+    response: Response,
     idContent: int = Form(...),
     type: str = Form("sentence"),
+    deferred: bool = Form(False),
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db)
 ):
+    """deferred=true: skor langsung dikembalikan, analisis AI diambil via /analysis/{analysis_id}"""
     talent_id = 1 # TODO: Auth
     mat_repo = MaterialRepository(db)
     score_repo = ScoreRepository(db)
     service = PhonemeService(mat_repo, score_repo)
 
     audio_content = await file.read()
-    result = await service.process_pronunciation(talent_id, idContent, audio_content, type)
-    return ResponseBase(message="Analysis completed", data=PhonemeCheckResponse(**result))
+    timer = StageTimer()
+    # Pipeline dibatalkan jika client memutus koneksi (tidak membuang kuota Gemini/CPU)
+    result = await cancel_on_disconnect(
+        request,
+        service.process_pronunciation(talent_id, idContent, audio_content, type, deferred=deferred, timer=timer)
+    )
+    response.headers["Server-Timing"] = timer.server_timing()
+    message = "Scoring completed, analysis pending" if result["analysis_status"] == PhonemeAnalysisWorker.STATUS_PENDING else "Analysis completed"
+    return ResponseBase(message=message, data=PhonemeCheckResponse(**result))
 
 @router.post("/compare_word", response_model=ResponseBase[PhonemeCheckResponse])
 async def compare_phonemes_word(
+    request: Request,
+    response: Response,
     idContent: int = Form(...),
+    deferred: bool = Form(False),
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db)
 ):
     """Alias khusus untuk compare word (mobile legacy)"""
-    return await compare_phonemes(idContent=idContent, type="word", file=file, db=db)
+    return await compare_phonemes(request, response, idContent=idContent, type="word", deferred=deferred, file=file, db=db)
+
+# --- DEFERRED AI ANALYSIS ---
+
+@router.get("/analysis/{analysis_id}", response_model=ResponseBase)
+async def get_analysis(analysis_id: int, db: AsyncSession = Depends(get_db)):
+    """Polling hasil analisis AI (status: pending/completed/failed)"""
+    service = PhonemeService(MaterialRepository(db), ScoreRepository(db))
+    data = await service.get_analysis(analysis_id)
+    return ResponseBase(data=data)
+
+@router.get("/analysis/{analysis_id}/stream")
+async def stream_analysis(analysis_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    """SSE: kirim event 'analysis' sekali saat analisis AI selesai"""
+    service = PhonemeService(MaterialRepository(db), ScoreRepository(db))
+    initial = await service.get_analysis(analysis_id)  # 404 sebelum stream dimulai
+
+    async def event_stream():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.PHONEME_ANALYSIS_STREAM_TIMEOUT
+        data = initial
+        try:
+            while True:
+                if data["status"] != PhonemeAnalysisWorker.STATUS_PENDING:
+                    yield format_sse(data, event="analysis")
+                    return
+
+                remaining = deadline - loop.time()
+                if remaining <= 0 or await request.is_disconnected():
+                    yield format_sse({"analysis_id": analysis_id, "status": data["status"]}, event="timeout")
+                    return
+
+                # Dibangunkan worker di proses ini; cek ulang DB berkala untuk worker lain
+                event = PhonemeAnalysisWorker.get_event(analysis_id)
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=min(remaining, 2.0))
+                except asyncio.TimeoutError:
+                    yield sse_comment()
+
+                async with AsyncSessionLocal() as session:
+                    data = await PhonemeService(MaterialRepository(session), ScoreRepository(session)).get_analysis(analysis_id)
+        finally:
+            PhonemeAnalysisWorker.release_event(analysis_id)
+
+    return StreamingResponse(event_stream(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
 
 # --- MISSING ENDPOINTS RESTORED ---
 
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from app.services.llm_service import LLMService
+from app.services.session_store import get_session_store
+from app.core.scheduler import Scheduler
+from app.schemas.response import ResponseBase
+from app.api.deps import get_current_admin_user
+
+router = APIRouter(dependencies=[Depends(get_current_admin_user)])
+
+@router.get("/llm", response_model=ResponseBase)
+async def get_llm_metrics():
+    """Metrik runtime client Gemini (connection pool, hit-rate cache, rate limiter & circuit breaker)"""
+    return ResponseBase(data={
+        "pool": LLMService.get_pool_stats(),
+        "cache": LLMService.get_cache_stats(),
+        "resilience": LLMService.get_resilience_stats()
+    })
+
+
+@router.get("/sessions", response_model=ResponseBase)
+async def get_session_metrics():
+    """Metrik session store interview/percakapan (backend, hit/miss, konflik versi)"""
+    return ResponseBase(data=get_session_store().get_stats())
+
+
+@router.get("/jobs", response_model=ResponseBase)
+async def get_job_metrics():
+    """Status job berkala (rekonsiliasi stat counter, dsb.)"""
+    return ResponseBase(data=Scheduler.get_stats())
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, Query, UploadFile, File, HTTPException, status
 from fastapi.responses import StreamingResponse
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.services.talent_service import TalentService
@@ -11,20 +12,28 @@ from app.api.deps import get_current_admin_user
 
 router = APIRouter(dependencies=[Depends(get_current_admin_user)])
 
+def build_pagination(result: dict, page: int, limit: int) -> dict:
+    # totalRecords/totalPages null jika includeTotal=false; nextCursor null di halaman terakhir
+    total = result["total"]
+    return {
+        "currentPage": page,
+        "totalRecords": total,
+        "totalPages": (total + limit - 1) // limit if total is not None else None,
+        "nextCursor": result["nextCursor"]
+    }
+
 @router.get("", response_model=ResponseBase)
 async def get_talent_list(
     searchQuery: str = Query(None), 
     page: int = Query(1, ge=1), 
     limit: int = Query(10, ge=1), 
+    cursor: Optional[str] = Query(None),
+    includeTotal: bool = Query(True),
     db: AsyncSession = Depends(get_db)
 ):
     service = TalentService(db)
-    result = await service.get_talents_list(page, limit, searchQuery)
-    pagination = {
-        "currentPage": result["page"], 
-        "totalRecords": result["total"], 
-        "totalPages": (result["total"] + limit - 1) // limit
-    }
+    result = await service.get_talents_list(page, limit, searchQuery, cursor, includeTotal)
+    pagination = build_pagination(result, result["page"], limit)
     return ResponseBase(data={"talents": result["data"], "pagination": pagination}, message="Data talent berhasil diambil")
 
 @router.post("", response_model=ResponseBase, status_code=status.HTTP_201_CREATED)
@@ -61,6 +70,12 @@ async def get_talent_detail(talent_id: int, db: AsyncSession = Depends(get_db)):
     data = await service.get_talent_detail(talent_id)
     return ResponseBase(data=data)
 
+@router.get("/{talent_id}/weakest-phonemes", response_model=ResponseBase)
+async def get_talent_weakest_phonemes(talent_id: int, limit: int = Query(5, ge=1, le=50), db: AsyncSession = Depends(get_db)):
+    service = TalentService(db)
+    data = await service.get_weakest_phonemes(talent_id, limit)
+    return ResponseBase(data=data)
+
 @router.put("/{talent_id}", response_model=ResponseBase)
 async def update_talent(
     talent_id: int, 
@@ -88,22 +103,22 @@ async def change_talent_password(
     return ResponseBase(message="Password berhasil diubah")
 
 @router.get("/{talent_id}/phoneme-material-exercise", response_model=ResponseBase)
-async def get_phoneme_word_progress(talent_id: int, page: int = Query(1, ge=1), limit: int = Query(10, ge=1), db: AsyncSession = Depends(get_db)):
+async def get_phoneme_word_progress(talent_id: int, page: int = Query(1, ge=1), limit: int = Query(10, ge=1), cursor: Optional[str] = Query(None), includeTotal: bool = Query(True), db: AsyncSession = Depends(get_db)):
     service = TalentService(db)
-    result = await service.get_phoneme_progress(talent_id, "Word", page, limit)
-    return ResponseBase(data={"phonemeCategories": result["data"], "pagination": {"currentPage": page, "totalRecords": result["total"], "totalPages": (result["total"] + limit - 1) // limit}})
+    result = await service.get_phoneme_progress(talent_id, "Word", page, limit, cursor, includeTotal)
+    return ResponseBase(data={"phonemeCategories": result["data"], "pagination": build_pagination(result, page, limit)})
 
 @router.get("/{talent_id}/phoneme-exercise", response_model=ResponseBase)
-async def get_phoneme_sentence_progress(talent_id: int, page: int = Query(1, ge=1), limit: int = Query(10, ge=1), db: AsyncSession = Depends(get_db)):
+async def get_phoneme_sentence_progress(talent_id: int, page: int = Query(1, ge=1), limit: int = Query(10, ge=1), cursor: Optional[str] = Query(None), includeTotal: bool = Query(True), db: AsyncSession = Depends(get_db)):
     service = TalentService(db)
-    result = await service.get_phoneme_progress(talent_id, "Sentence", page, limit)
-    return ResponseBase(data={"phonemeExercises": result["data"], "pagination": {"currentPage": page, "totalRecords": result["total"], "totalPages": (result["total"] + limit - 1) // limit}})
+    result = await service.get_phoneme_progress(talent_id, "Sentence", page, limit, cursor, includeTotal)
+    return ResponseBase(data={"phonemeExercises": result["data"], "pagination": build_pagination(result, page, limit)})
 
 @router.get("/{talent_id}/phoneme-exam", response_model=ResponseBase)
-async def get_phoneme_exam_progress(talent_id: int, page: int = Query(1, ge=1), limit: int = Query(10, ge=1), db: AsyncSession = Depends(get_db)):
+async def get_phoneme_exam_progress(talent_id: int, page: int = Query(1, ge=1), limit: int = Query(10, ge=1), cursor: Optional[str] = Query(None), includeTotal: bool = Query(True), db: AsyncSession = Depends(get_db)):
     service = TalentService(db)
-    result = await service.get_exam_progress(talent_id, page, limit)
-    return ResponseBase(data={"phonemeExams": result["data"], "pagination": {"currentPage": page, "totalRecords": result["total"], "totalPages": (result["total"] + limit - 1) // limit}})
+    result = await service.get_exam_progress(talent_id, page, limit, cursor, includeTotal)
+    return ResponseBase(data={"phonemeExams": result["data"], "pagination": build_pagination(result, page, limit)})
 
 @router.get("/{talent_id}/phoneme-exam/attempt/{attempt_id}/detail", response_model=ResponseBase)
 async def get_exam_attempt_detail(talent_id: int, attempt_id: int, db: AsyncSession = Depends(get_db)):
@@ -112,16 +127,16 @@ async def get_exam_attempt_detail(talent_id: int, attempt_id: int, db: AsyncSess
     return ResponseBase(data={"examAttemptDetail": data})
 
 @router.get("/{talent_id}/conversation", response_model=ResponseBase)
-async def get_conversation_progress(talent_id: int, page: int = Query(1, ge=1), limit: int = Query(10, ge=1), db: AsyncSession = Depends(get_db)):
+async def get_conversation_progress(talent_id: int, page: int = Query(1, ge=1), limit: int = Query(10, ge=1), cursor: Optional[str] = Query(None), includeTotal: bool = Query(True), db: AsyncSession = Depends(get_db)):
     service = TalentService(db)
-    result = await service.get_conversation_progress(talent_id, page, limit)
-    return ResponseBase(data={"conversations": result["data"], "pagination": {"currentPage": page, "totalRecords": result["total"], "totalPages": (result["total"] + limit - 1) // limit}})
+    result = await service.get_conversation_progress(talent_id, page, limit, cursor, includeTotal)
+    return ResponseBase(data={"conversations": result["data"], "pagination": build_pagination(result, page, limit)})
 
 @router.get("/{talent_id}/interview", response_model=ResponseBase)
-async def get_interview_progress(talent_id: int, page: int = Query(1, ge=1), limit: int = Query(10, ge=1), db: AsyncSession = Depends(get_db)):
+async def get_interview_progress(talent_id: int, page: int = Query(1, ge=1), limit: int = Query(10, ge=1), cursor: Optional[str] = Query(None), includeTotal: bool = Query(True), db: AsyncSession = Depends(get_db)):
     service = TalentService(db)
-    result = await service.get_interview_progress(talent_id, page, limit)
-    return ResponseBase(data={"interviews": result["data"], "pagination": {"currentPage": page, "totalRecords": result["total"], "totalPages": (result["total"] + limit - 1) // limit}})
+    result = await service.get_interview_progress(talent_id, page, limit, cursor, includeTotal)
+    return ResponseBase(data={"interviews": result["data"], "pagination": build_pagination(result, page, limit)})
 
 @router.get("/{talent_id}/interview/{attempt_id}/detail", response_model=ResponseBase)
 async def get_interview_detail(talent_id: int, attempt_id: int, db: AsyncSession = Depends(get_db)):
@@ -0,0 +1,27 @@
+import argparse
+import asyncio
+import logging
+from app.core.database import AsyncSessionLocal
+from app.repositories.phoneme_confusion_repository import PhonemeConfusionRepository
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def backfill_phoneme_confusion(talent_id: int = None):
+    async with AsyncSessionLocal() as session:
+        try:
+            processed = await PhonemeConfusionRepository(session).rebuild(talent_id)
+            scope = f"talent {talent_id}" if talent_id is not None else "semua talent"
+            logger.info(f"✅ Confusion matrix dibangun ulang untuk {scope} dari {processed} hasil latihan")
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"❌ Backfill Error: {e}")
+            raise
+        finally:
+            await session.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill tabel talentphonemeconfusion dari hasillatihanfonem")
+    parser.add_argument("--talent-id", type=int, default=None, help="Hanya bangun ulang untuk satu talent")
+    args = parser.parse_args()
+    asyncio.run(backfill_phoneme_confusion(args.talent_id))
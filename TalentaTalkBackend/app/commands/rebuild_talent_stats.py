@@ -0,0 +1,28 @@
+import argparse
+import asyncio
+import logging
+from app.core.database import AsyncSessionLocal
+from app.repositories.talent_stats_repository import TalentStatsRepository
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def rebuild_talent_stats(talent_id: int = None):
+    async with AsyncSessionLocal() as session:
+        try:
+            rows = await TalentStatsRepository(session).rebuild(talent_id)
+            await session.commit()
+            scope = f"talent {talent_id}" if talent_id is not None else "semua talent"
+            logger.info(f"✅ Rollup talentstats dibangun ulang untuk {scope} ({rows} baris)")
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"❌ Rebuild Error: {e}")
+            raise
+        finally:
+            await session.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bangun ulang tabel talentstats dari tabel hasil latihan & ujian")
+    parser.add_argument("--talent-id", type=int, default=None, help="Hanya bangun ulang untuk satu talent")
+    args = parser.parse_args()
+    asyncio.run(rebuild_talent_stats(args.talent_id))
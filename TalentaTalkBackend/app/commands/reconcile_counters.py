@@ -0,0 +1,17 @@
+import asyncio
+import logging
+from app.services.counter_service import reconcile_counters
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def main():
+    drift = await reconcile_counters()
+    if drift:
+        for name, values in drift.items():
+            logger.info(f"✅ {name}: {values['stored']} -> {values['actual']}")
+    else:
+        logger.info("✅ Semua stat counter sudah sesuai")
+
+if __name__ == "__main__":
+    asyncio.run(main())
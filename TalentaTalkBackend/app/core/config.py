@@ -30,9 +30,72 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY")
     GEMINI_MODEL_ID: str = os.getenv("GEMINI_MODEL_ID", "gemini-2.0-flash")
     
+    # Ganti ke stub lokal untuk load test, mis. http://127.0.0.1:8090/v1beta (benchmarks/gemini_stub.py)
+    GEMINI_API_BASE_URL: str = os.getenv("GEMINI_API_BASE_URL", "https://generativelanguage.googleapis.com/v1beta")
+
     @property
     def GEMINI_API_URL(self) -> str:
-        return f"https://generativelanguage.googleapis.com/v1beta/models/{self.GEMINI_MODEL_ID}:generateContent"
+        return f"{self.GEMINI_API_BASE_URL.rstrip('/')}/models/{self.GEMINI_MODEL_ID}:generateContent"
+
+    @property
+    def GEMINI_STREAM_URL(self) -> str:
+        return f"{self.GEMINI_API_BASE_URL.rstrip('/')}/models/{self.GEMINI_MODEL_ID}:streamGenerateContent"
+
+    # AI HTTP CLIENT (Shared connection pool, dibuat di lifespan)
+    GEMINI_HTTP_POOL_LIMIT: int = int(os.getenv("GEMINI_HTTP_POOL_LIMIT", "100"))
+    GEMINI_HTTP_POOL_LIMIT_PER_HOST: int = int(os.getenv("GEMINI_HTTP_POOL_LIMIT_PER_HOST", "20"))
+    GEMINI_HTTP_DNS_TTL: int = int(os.getenv("GEMINI_HTTP_DNS_TTL", "300"))
+    GEMINI_HTTP_KEEPALIVE: float = float(os.getenv("GEMINI_HTTP_KEEPALIVE", "60"))
+    GEMINI_CONNECT_TIMEOUT: float = float(os.getenv("GEMINI_CONNECT_TIMEOUT", "5"))
+    GEMINI_READ_TIMEOUT: float = float(os.getenv("GEMINI_READ_TIMEOUT", "30"))
+    # Batas total per request non-streaming (session pool tanpa total timeout karena streaming)
+    GEMINI_TOTAL_TIMEOUT: float = float(os.getenv("GEMINI_TOTAL_TIMEOUT", "30"))
+
+    # AI RESPONSE CACHE (LRU memory + SQLite lokal)
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3")
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+    LLM_CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+
+    # LLM Resilience (rate limit client-side, retry, circuit breaker)
+    LLM_RATE_LIMIT_PER_MINUTE: float = float(os.getenv("LLM_RATE_LIMIT_PER_MINUTE", "60"))
+    LLM_RATE_BURST: int = int(os.getenv("LLM_RATE_BURST", "10"))
+    LLM_RATE_WAIT_TIMEOUT: float = float(os.getenv("LLM_RATE_WAIT_TIMEOUT", "10"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_BACKOFF_BASE: float = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+    LLM_BACKOFF_MAX: float = float(os.getenv("LLM_BACKOFF_MAX", "8"))
+    LLM_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+    LLM_BREAKER_RECOVERY_SECONDS: float = float(os.getenv("LLM_BREAKER_RECOVERY_SECONDS", "30"))
+
+    # Conversation Memory (giliran terbaru verbatim + rolling summary)
+    CONVERSATION_MEMORY_TOKEN_BUDGET: int = int(os.getenv("CONVERSATION_MEMORY_TOKEN_BUDGET", "1200"))
+    CONVERSATION_MEMORY_SUMMARY_TOKENS: int = int(os.getenv("CONVERSATION_MEMORY_SUMMARY_TOKENS", "300"))
+    CONVERSATION_MEMORY_RECENT_TURNS: int = int(os.getenv("CONVERSATION_MEMORY_RECENT_TURNS", "6"))
+
+    # Session Store (interview & percakapan). "postgres" wajib jika uvicorn > 1 worker
+    SESSION_STORE_BACKEND: str = os.getenv("SESSION_STORE_BACKEND", "memory")
+    SESSION_TTL_SECONDS: int = int(os.getenv("SESSION_TTL_SECONDS", str(2 * 3600)))
+    SESSION_MAX_ENTRIES: int = int(os.getenv("SESSION_MAX_ENTRIES", "10000"))
+
+    # Snapshot pertanyaan interview aktif (in-process, di-invalidate saat admin mengubah data)
+    INTERVIEW_SNAPSHOT_TTL: int = int(os.getenv("INTERVIEW_SNAPSHOT_TTL", "300"))
+    INTERVIEW_SNAPSHOT_HISTORY: int = int(os.getenv("INTERVIEW_SNAPSHOT_HISTORY", "5"))
+
+    # Sampler materi acak (id in-process, di-invalidate saat admin mengubah kata/kalimat)
+    MATERIAL_SAMPLER_TTL: int = int(os.getenv("MATERIAL_SAMPLER_TTL", "300"))
+
+    # Stat counters (total talent & materi) + job rekonsiliasi berkala
+    COUNTER_RECONCILE_INTERVAL: int = int(os.getenv("COUNTER_RECONCILE_INTERVAL", "900"))
+
+    # Snapshot leaderboard highest-scoring (dibangun ulang berkala oleh scheduler)
+    LEADERBOARD_REFRESH_INTERVAL: int = int(os.getenv("LEADERBOARD_REFRESH_INTERVAL", "300"))
+
+    # DEFERRED PHONEME ANALYSIS (background worker)
+    PHONEME_ANALYSIS_WORKERS: int = int(os.getenv("PHONEME_ANALYSIS_WORKERS", "2"))
+    PHONEME_ANALYSIS_QUEUE_SIZE: int = int(os.getenv("PHONEME_ANALYSIS_QUEUE_SIZE", "1000"))
+    PHONEME_ANALYSIS_TIMEOUT: float = float(os.getenv("PHONEME_ANALYSIS_TIMEOUT", "30"))
+    PHONEME_ANALYSIS_STREAM_TIMEOUT: float = float(os.getenv("PHONEME_ANALYSIS_STREAM_TIMEOUT", "60"))
 
     # CORS (Support Local & Production via Env)
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -30,4 +30,12 @@ class DuplicateError(AppError):
         super().__init__(
             status_code=status.HTTP_409_CONFLICT,
             detail=detail
-        )
\ No newline at end of file
+        )
+
+class ClientDisconnectedError(AppError):
+    def __init__(self, detail: str = "Client closed request"):
+        # 499 (konvensi nginx): client memutus koneksi sebelum respons dikirim
+        super().__init__(
+            status_code=499,
+            detail=detail
+        )
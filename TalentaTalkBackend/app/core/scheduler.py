@@ -0,0 +1,65 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PeriodicJob:
+    name: str
+    interval: float
+    func: Callable[[], Awaitable[object]]
+    run_on_start: bool = True
+
+class Scheduler:
+    """
+    Penjadwal in-process untuk job berkala ringan (rekonsiliasi counter, refresh snapshot).
+    Setiap job jalan di task sendiri; error dicatat lalu job dicoba lagi di interval berikutnya.
+    """
+    _jobs: List[PeriodicJob] = []
+    _tasks: List[asyncio.Task] = []
+    _stats: Dict[str, Dict[str, object]] = {}
+
+    @classmethod
+    def register(cls, name: str, interval: float, func: Callable[[], Awaitable[object]], run_on_start: bool = True):
+        if any(job.name == name for job in cls._jobs):
+            return
+        cls._jobs.append(PeriodicJob(name, interval, func, run_on_start))
+        cls._stats[name] = {"interval": interval, "runs": 0, "failures": 0, "lastResult": None, "lastError": None}
+
+    @classmethod
+    async def start(cls):
+        if cls._tasks:
+            return
+        cls._tasks = [asyncio.create_task(cls._run(job), name=f"scheduler-{job.name}") for job in cls._jobs if job.interval > 0]
+        logger.info(f"Scheduler started ({len(cls._tasks)} jobs)")
+
+    @classmethod
+    async def stop(cls):
+        for task in cls._tasks:
+            task.cancel()
+        await asyncio.gather(*cls._tasks, return_exceptions=True)
+        cls._tasks = []
+
+    @classmethod
+    async def _run(cls, job: PeriodicJob):
+        if not job.run_on_start:
+            await asyncio.sleep(job.interval)
+        while True:
+            stats = cls._stats[job.name]
+            try:
+                stats["lastResult"] = await job.func()
+                stats["lastError"] = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats["failures"] += 1
+                stats["lastError"] = str(e)
+                logger.error(f"Scheduled job {job.name} failed: {e}")
+            stats["runs"] += 1
+            await asyncio.sleep(job.interval)
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Dict[str, object]]:
+        return {name: dict(stats) for name, stats in cls._stats.items()}
@@ -5,24 +5,37 @@ from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.exceptions import AppError
-from app.core.database import engine, Base
 from app.seeder import seed_admins
+from app.services.llm_service import LLMService
+from app.services.analysis_worker import PhonemeAnalysisWorker
+from app.services.counter_service import reconcile_counters
+from app.services.leaderboard_service import refresh_leaderboards
+from app.core.scheduler import Scheduler
 from app.api.v1.endpoints import (
     auth, conversation, phoneme, dashboard, material, 
     talents, history, exam, transcribe, interview_flow, 
-    mobile_profile, pretest, home
+    mobile_profile, pretest, home, system
 )
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Skema dikelola Alembic (alembic upgrade head), tidak lagi create_all saat startup
     try:
         await seed_admins()
     except Exception as e:
         print(f"Startup Seeder Error: {e}")
-        
-    yield
+
+    await LLMService.startup()
+    await PhonemeAnalysisWorker.start()
+    Scheduler.register("reconcile_counters", settings.COUNTER_RECONCILE_INTERVAL, reconcile_counters)
+    Scheduler.register("refresh_leaderboards", settings.LEADERBOARD_REFRESH_INTERVAL, refresh_leaderboards)
+    await Scheduler.start()
+    try:
+        yield
+    finally:
+        await Scheduler.stop()
+        await PhonemeAnalysisWorker.stop()
+        await LLMService.shutdown()
 
 app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
@@ -32,6 +45,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Next-Cursor"],
 )
 
 @app.exception_handler(AppError)
@@ -48,6 +62,7 @@ app.include_router(auth.router, prefix="/web/admin", tags=["Auth Admin"])
 app.include_router(dashboard.router, prefix="/web/admin", tags=["Dashboard"])
 app.include_router(material.router, prefix="/web/admin", tags=["Material"])
 app.include_router(talents.router, prefix="/web/admin/talents", tags=["Talent Management"])
+app.include_router(system.router, prefix="/web/admin/system", tags=["System"])
 
 # Mobile Routes
 app.include_router(auth.router, prefix=f"{api_v1}/auth", tags=["Auth Mobile"])
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, PrimaryKeyConstraint, LargeBinary, BigInteger, Date, Index
 from sqlalchemy.dialects.postgresql import JSON
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class Ujianfonem(Base):
     __tablename__ = 'ujianfonem'
+    __table_args__ = (
+        Index('ix_ujianfonem_idtalent_waktuujian', 'idtalent', 'waktuujian', 'idujian'),
+        Index('ix_ujianfonem_idtalent_idmateriujian', 'idtalent', 'idmateriujian'),
+    )
 
     idujian = Column(Integer, primary_key=True, autoincrement=True)
     idmateriujian = Column(Integer, ForeignKey('materiujian.idmateriujian'))
@@ -16,6 +20,9 @@ class Ujianfonem(Base):
 
 class Detailujianfonem(Base):
     __tablename__ = 'detailujianfonem'
+    __table_args__ = (
+        Index('ix_detailujianfonem_idujian', 'idujian', 'iddetail'),
+    )
 
     iddetail = Column(Integer, primary_key=True, autoincrement=True)
     idujian = Column(Integer, ForeignKey('ujianfonem.idujian'))
@@ -25,6 +32,9 @@ class Detailujianfonem(Base):
 
 class Materiujian(Base):
     __tablename__ = 'materiujian'
+    __table_args__ = (
+        Index('ix_materiujian_kategori', 'kategori'),
+    )
 
     idmateriujian = Column(Integer, primary_key=True, autoincrement=True)
     kategori = Column(String(255))
@@ -32,6 +42,9 @@ class Materiujian(Base):
 
 class Materiujiankalimat(Base):
     __tablename__ = 'materiujiankalimat'
+    __table_args__ = (
+        Index('ix_materiujiankalimat_idmateriujian', 'idmateriujian'),
+    )
 
     idmateriujiankalimat = Column(Integer, primary_key=True, autoincrement=True)
     idmateriujian = Column(Integer, ForeignKey('materiujian.idmateriujian'))
@@ -41,6 +54,11 @@ class Materiujiankalimat(Base):
 
 class Hasillatihanfonem(Base):
     __tablename__ = 'hasillatihanfonem'
+    __table_args__ = (
+        Index('ix_hasillatihanfonem_idtalent_waktulatihan', 'idtalent', 'waktulatihan', 'idhasilfonem'),
+        Index('ix_hasillatihanfonem_idtalent_typelatihan_waktulatihan', 'idtalent', 'typelatihan', 'waktulatihan', 'idhasilfonem'),
+        Index('ix_hasillatihanfonem_idtalent_typelatihan_idsoal', 'idtalent', 'typelatihan', 'idsoal'),
+    )
 
     idhasilfonem = Column(Integer, primary_key=True, autoincrement=True)
     typelatihan = Column(String(255))
@@ -50,8 +68,28 @@ class Hasillatihanfonem(Base):
     waktulatihan = Column(DateTime)
     phoneme_comparison = Column(JSON) 
 
+class Talentphonemeconfusion(Base):
+    """
+    Agregat confusion matrix per talent (fonem target x fonem yang diucapkan).
+    Diupdate inkremental setiap hasil latihan fonem disimpan.
+    """
+    __tablename__ = 'talentphonemeconfusion'
+    __table_args__ = (
+        PrimaryKeyConstraint('idtalent', 'target_phoneme', 'realised_phoneme'),
+    )
+
+    idtalent = Column(Integer, ForeignKey('talent.idtalent', ondelete='CASCADE'))
+    target_phoneme = Column(String(16))
+    realised_phoneme = Column(String(16))
+    status = Column(String(16))
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
 class Hasillatihanpercakapan(Base):
     __tablename__ = 'hasillatihanpercakapan'
+    __table_args__ = (
+        Index('ix_hasillatihanpercakapan_idtalent_waktulatihan', 'idtalent', 'waktulatihan', 'idhasilpercakapan'),
+    )
 
     idhasilpercakapan = Column(Integer, primary_key=True, autoincrement=True)
     idtalent = Column(Integer, ForeignKey('talent.idtalent'))
@@ -62,6 +100,9 @@ class Hasillatihanpercakapan(Base):
 
 class Hasillatihaninterview(Base):
     __tablename__ = 'hasillatihaninterview'
+    __table_args__ = (
+        Index('ix_hasillatihaninterview_idtalent_waktulatihan', 'idtalent', 'waktulatihan', 'idhasilinterview'),
+    )
 
     idhasilinterview = Column(Integer, primary_key=True, autoincrement=True)
     idtalent = Column(Integer, ForeignKey('talent.idtalent'))
@@ -80,6 +121,9 @@ class Manajemen(Base):
 
 class Materifonemkalimat(Base):
     __tablename__ = 'materifonemkalimat'
+    __table_args__ = (
+        Index('ix_materifonemkalimat_kategori', 'kategori'),
+    )
 
     idmaterifonemkalimat = Column(Integer, primary_key=True, autoincrement=True)
     kategori = Column(String(255))
@@ -89,6 +133,9 @@ class Materifonemkalimat(Base):
 
 class Materifonemkata(Base):
     __tablename__ = 'materifonemkata'
+    __table_args__ = (
+        Index('ix_materifonemkata_kategori', 'kategori'),
+    )
 
     idmaterifonemkata = Column(Integer, primary_key=True, autoincrement=True)
     kategori = Column(String(255))
@@ -120,4 +167,83 @@ class Talent(Base):
     email = Column(String(255), unique=True)
     password = Column(String(255))
     pretest_score = Column(Float)
-    role = Column(String(50), default='talent')
\ No newline at end of file
+    role = Column(String(50), default='talent')
+
+class Appsession(Base):
+    """
+    Session interview/percakapan bersama antar worker (SESSION_STORE_BACKEND=postgres).
+    data = JSON terkompresi zlib, version untuk optimistic concurrency.
+    """
+    __tablename__ = 'appsession'
+    __table_args__ = (
+        PrimaryKeyConstraint('namespace', 'key'),
+    )
+
+    namespace = Column(String(32))
+    key = Column(String(64))
+    data = Column(LargeBinary, nullable=False)
+    version = Column(Integer, nullable=False, default=1)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class Statcounter(Base):
+    """
+    Counter agregat (total talent & materi) yang dipelihara transaksional saat insert/delete.
+    Direkonsiliasi berkala dengan COUNT(*) sebenarnya (app/core/scheduler.py).
+    """
+    __tablename__ = 'statcounter'
+
+    name = Column(String(64), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class Talentstats(Base):
+    """
+    Rollup statistik per talent, diupdate inkremental saat hasil latihan/ujian disimpan.
+    Dibangun ulang dari tabel hasil lewat app/commands/rebuild_talent_stats.py.
+    Tanggal streak dalam WIB.
+    """
+    __tablename__ = 'talentstats'
+
+    idtalent = Column(Integer, ForeignKey('talent.idtalent', ondelete='CASCADE'), primary_key=True)
+    phoneme_count = Column(Integer, nullable=False, default=0)
+    phoneme_score_sum = Column(Float, nullable=False, default=0)
+    phoneme_scored_count = Column(Integer, nullable=False, default=0)
+    phoneme_items_done = Column(Integer, nullable=False, default=0)
+    conversation_count = Column(Integer, nullable=False, default=0)
+    conversation_wpm_sum = Column(Float, nullable=False, default=0)
+    interview_count = Column(Integer, nullable=False, default=0)
+    interview_wpm_sum = Column(Float, nullable=False, default=0)
+    exam_count = Column(Integer, nullable=False, default=0)
+    exam_score_sum = Column(Float, nullable=False, default=0)
+    latest_exam = Column(Float)
+    latest_exam_at = Column(DateTime)
+    highest_exam = Column(Float)
+    last_activity_date = Column(Date)
+    current_run = Column(Integer, nullable=False, default=0)
+    highest_streak = Column(Integer, nullable=False, default=0)
+    week_start = Column(Date)
+    week_active_days = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class Leaderboardsnapshot(Base):
+    """
+    Snapshot leaderboard highest-scoring per kategori, dengan rank siap pakai.
+    Dibangun ulang berkala oleh scheduler (LEADERBOARD_REFRESH_INTERVAL).
+    """
+    __tablename__ = 'leaderboardsnapshot'
+    __table_args__ = (
+        PrimaryKeyConstraint('category', 'rank'),
+        Index('ix_leaderboardsnapshot_nama_trgm', 'nama', postgresql_using='gin', postgresql_ops={'nama': 'gin_trgm_ops'}),
+    )
+
+    category = Column(String(32))
+    rank = Column(Integer)
+    idtalent = Column(Integer, ForeignKey('talent.idtalent', ondelete='CASCADE'), nullable=False)
+    nama = Column(String(255))
+    email = Column(String(255))
+    score = Column(Float)
+    attempts = Column(Integer)
+    total_attempts = Column(Integer)
+    last_date = Column(DateTime)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
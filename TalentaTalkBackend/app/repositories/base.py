@@ -11,9 +11,8 @@ class BaseRepository(Generic[ModelType]):
         self.db = db
 
     async def get_by_id(self, id: Any) -> Optional[ModelType]:
-        query = select(self.model).where(self.model.id == id) # Asumsi primary key bernama 'id', override jika beda
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        # Lookup lewat primary key mapper (idtalent, idmanajemen, ...), bukan kolom bernama 'id'
+        return await self.db.get(self.model, id)
 
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         query = select(self.model).offset(skip).limit(limit)
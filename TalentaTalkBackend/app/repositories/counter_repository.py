@@ -0,0 +1,60 @@
+from sqlalchemy import select, func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import Statcounter, Talent, Materifonemkata, Materifonemkalimat, Materiujian, Materiinterview
+from typing import Dict
+
+class CounterRepository:
+    """
+    Total talent & materi di tabel statcounter.
+    increment() tidak commit: dipanggil di transaksi yang sama dengan insert/delete pemanggil.
+    """
+    TALENT = "talent"
+    WORD = "phoneme_word"
+    SENTENCE = "phoneme_sentence"
+    EXAM_CATEGORY = "exam_category"
+    INTERVIEW_QUESTION = "interview_question"
+    NAMES = (TALENT, WORD, SENTENCE, EXAM_CATEGORY, INTERVIEW_QUESTION)
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def increment(self, name: str, delta: int = 1):
+        # Baris belum ada (DB baru) -> no-op; rekonsiliasi berikutnya mengisi nilai sebenarnya
+        if delta:
+            await self.db.execute(update(Statcounter).where(Statcounter.name == name).values(value=Statcounter.value + delta))
+
+    async def refresh_exam_categories(self):
+        """Jumlah kategori ujian = COUNT(DISTINCT kategori); dihitung ulang saat set ujian ditambah/dihapus"""
+        distinct_categories = select(func.count(func.distinct(Materiujian.kategori))).scalar_subquery()
+        await self.db.execute(update(Statcounter).where(Statcounter.name == self.EXAM_CATEGORY).values(value=distinct_categories))
+
+    async def _actual_counts(self) -> Dict[str, int]:
+        query = select(
+            select(func.count(Talent.idtalent)).scalar_subquery().label(self.TALENT),
+            select(func.count(Materifonemkata.idmaterifonemkata)).scalar_subquery().label(self.WORD),
+            select(func.count(Materifonemkalimat.idmaterifonemkalimat)).scalar_subquery().label(self.SENTENCE),
+            select(func.count(func.distinct(Materiujian.kategori))).scalar_subquery().label(self.EXAM_CATEGORY),
+            select(func.count(Materiinterview.idmateriinterview)).scalar_subquery().label(self.INTERVIEW_QUESTION),
+        )
+        row = (await self.db.execute(query)).one()
+        return {name: row._mapping[name] or 0 for name in self.NAMES}
+
+    async def get_counts(self) -> Dict[str, int]:
+        """Semua counter dalam satu query; jatuh ke COUNT(*) langsung jika belum pernah direkonsiliasi"""
+        rows = (await self.db.execute(select(Statcounter.name, Statcounter.value))).all()
+        counts = {r.name: r.value for r in rows}
+        if any(name not in counts for name in self.NAMES):
+            return await self._actual_counts()
+        return counts
+
+    async def reconcile(self) -> Dict[str, Dict[str, int]]:
+        """Samakan counter dengan COUNT(*) sebenarnya; mengembalikan counter yang bergeser"""
+        stored = {r.name: r.value for r in (await self.db.execute(select(Statcounter.name, Statcounter.value))).all()}
+        actual = await self._actual_counts()
+
+        stmt = insert(Statcounter).values([{"name": name, "value": value} for name, value in actual.items()])
+        stmt = stmt.on_conflict_do_update(index_elements=["name"], set_={"value": stmt.excluded.value, "updated_at": func.now()})
+        await self.db.execute(stmt)
+        await self.db.commit()
+        return {name: {"stored": stored.get(name), "actual": value} for name, value in actual.items() if stored.get(name) != value}
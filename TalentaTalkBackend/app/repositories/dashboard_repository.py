@@ -1,9 +1,11 @@
-from sqlalchemy import select, func, desc, union_all, literal_column, and_, cast, Date, distinct
+from sqlalchemy import select, func, desc, union_all, literal_column, and_, cast, Date, distinct, case, Integer
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.models import (
-    Talent, Materifonemkata, Materifonemkalimat, Materiujian, Materiinterview,
-    Hasillatihanfonem, Hasillatihanpercakapan, Hasillatihaninterview, Ujianfonem, Manajemen
+    Talent, Hasillatihanfonem, Hasillatihanpercakapan, Hasillatihaninterview, Ujianfonem, Manajemen
 )
+from app.repositories.counter_repository import CounterRepository
+from app.repositories.talent_stats_repository import TalentStatsRepository
+from app.utils.time_utils import TimeUtils
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import pytz
@@ -13,17 +15,12 @@ class DashboardRepository:
         self.db = db
 
     async def get_total_counts(self) -> Dict[str, int]:
-        total_talent = await self.db.scalar(select(func.count(Talent.idtalent)))
-        count_word = await self.db.scalar(select(func.count(Materifonemkata.idmaterifonemkata)))
-        count_sent = await self.db.scalar(select(func.count(Materifonemkalimat.idmaterifonemkalimat)))
-        total_exam = await self.db.scalar(select(func.count(func.distinct(Materiujian.kategori))))
-        total_interview = await self.db.scalar(select(func.count(Materiinterview.idmateriinterview)))
-        
+        counts = await CounterRepository(self.db).get_counts()
         return {
-            "totalTalent": total_talent or 0,
-            "totalPronunciationMaterial": (count_word or 0) + (count_sent or 0),
-            "totalExamPhonemMaterial": total_exam or 0,
-            "totalInterviewQuestion": total_interview or 0
+            "totalTalent": counts[CounterRepository.TALENT],
+            "totalPronunciationMaterial": counts[CounterRepository.WORD] + counts[CounterRepository.SENTENCE],
+            "totalExamPhonemMaterial": counts[CounterRepository.EXAM_CATEGORY],
+            "totalInterviewQuestion": counts[CounterRepository.INTERVIEW_QUESTION]
         }
 
     async def get_recent_activities(self, limit: int = 10, days_back: int = 30, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None):
@@ -178,24 +175,42 @@ class DashboardRepository:
         result = await self.db.execute(query)
         return result.scalars().all()
 
-    async def get_all_activities_dates(self):
-        q1 = select(Hasillatihanfonem.idtalent, Hasillatihanfonem.waktulatihan)
-        q2 = select(Ujianfonem.idtalent, Ujianfonem.waktuujian.label("waktulatihan"))
-        q3 = select(Hasillatihanpercakapan.idtalent, Hasillatihanpercakapan.waktulatihan)
-        q4 = select(Hasillatihaninterview.idtalent, Hasillatihaninterview.waktulatihan)
-        return (await self.db.execute(union_all(q1, q2, q3, q4))).all()
-
-    async def get_highest_scoring_phoneme(self, type_latihan: str):
-        return (await self.db.execute(select(Talent.idtalent, Talent.nama, Talent.email, func.count(func.distinct(Hasillatihanfonem.idsoal)).label('attempted'), func.avg(Hasillatihanfonem.nilai).label('avg_score')).join(Hasillatihanfonem, Talent.idtalent == Hasillatihanfonem.idtalent).where(Hasillatihanfonem.typelatihan == type_latihan).group_by(Talent.idtalent))).all()
-
-    async def get_highest_scoring_exam(self):
-        return (await self.db.execute(select(Talent.idtalent, Talent.nama, Talent.email, func.count(func.distinct(Ujianfonem.kategori)).label('categories_attempted'), func.avg(Ujianfonem.nilai).label('avg_score'), func.count(Ujianfonem.idujian).label('total_attempts')).join(Ujianfonem, Talent.idtalent == Ujianfonem.idtalent).where(Ujianfonem.nilai != None).group_by(Talent.idtalent))).all()
-
-    async def get_highest_scoring_conversation(self):
-        return (await self.db.execute(select(Talent.idtalent, Talent.nama, Talent.email, func.avg(Hasillatihanpercakapan.wpm).label('avg_wpm'), func.count(Hasillatihanpercakapan.idhasilpercakapan).label('total_attempts'), func.max(Hasillatihanpercakapan.waktulatihan).label('last_date')).join(Hasillatihanpercakapan, Talent.idtalent == Hasillatihanpercakapan.idtalent).group_by(Talent.idtalent))).all()
-
-    async def get_highest_scoring_interview(self):
-        return (await self.db.execute(select(Talent.idtalent, Talent.nama, Talent.email, func.avg(Hasillatihaninterview.wpm).label('avg_wpm'), func.count(Hasillatihaninterview.idhasilinterview).label('total_attempts'), func.max(Hasillatihaninterview.waktulatihan).label('last_date')).join(Hasillatihaninterview, Talent.idtalent == Hasillatihaninterview.idtalent).group_by(Talent.idtalent))).all()
+    async def get_top_active_paginated(self, skip: int, limit: int, search: str = None):
+        """
+        Streak per talent dihitung di SQL (gaps-and-islands atas tanggal aktivitas unik WIB):
+        day - row_number() konstan dalam satu rentetan hari berturut-turut.
+        Sort, search & paginasi juga di DB; total dari window count.
+        """
+        days = TalentStatsRepository.activity_days()
+        islands = select(
+            days.c.idtalent, days.c.day,
+            # row_number() bigint; date - integer -> date
+            (days.c.day - cast(func.row_number().over(partition_by=days.c.idtalent, order_by=days.c.day), Integer)).label("grp")
+        ).where(days.c.day != None).subquery("islands")
+        runs = select(
+            islands.c.idtalent, func.count().label("length"), func.max(islands.c.day).label("end_day")
+        ).group_by(islands.c.idtalent, islands.c.grp).subquery("runs")
+        yesterday = TimeUtils.today_wib() - timedelta(days=1)
+        streaks = select(
+            runs.c.idtalent,
+            func.max(runs.c.length).label("highest"),
+            func.max(case((runs.c.end_day >= yesterday, runs.c.length), else_=0)).label("current")
+        ).group_by(runs.c.idtalent).subquery("streaks")
+
+        current = func.coalesce(streaks.c.current, 0).label("current_streak")
+        highest = func.coalesce(streaks.c.highest, 0).label("highest_streak")
+        query = (
+            select(Talent.idtalent, Talent.nama, Talent.email, current, highest, func.count().over().label("total"))
+            .outerjoin(streaks, streaks.c.idtalent == Talent.idtalent)
+        )
+        if search: query = query.where(Talent.nama.ilike(f"%{search}%"))
+        query = query.order_by(desc(current), desc(highest), Talent.nama, Talent.idtalent).offset(skip).limit(limit)
+        rows = (await self.db.execute(query)).all()
+        if rows:
+            return rows, rows[0].total
+        count_query = select(func.count(Talent.idtalent))
+        if search: count_query = count_query.where(Talent.nama.ilike(f"%{search}%"))
+        return rows, await self.db.scalar(count_query) or 0
 
     async def get_admin_by_email(self, email: str):
         return (await self.db.execute(select(Manajemen).where(Manajemen.email == email))).scalar_one_or_none()
\ No newline at end of file
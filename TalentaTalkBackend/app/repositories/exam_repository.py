@@ -1,11 +1,13 @@
 from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.models import Ujianfonem, Detailujianfonem, Materiujian, Materiujiankalimat
+from app.repositories.talent_stats_repository import TalentStatsRepository
 from datetime import datetime
 
 class ExamRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.stats_repo = TalentStatsRepository(db)
 
     async def get_active_exam(self, talent_id: int, exam_id: int):
         """Mencari ujian yang sedang berlangsung (nilai masih None)"""
@@ -32,6 +34,8 @@ class ExamRepository:
             waktuujian=datetime.utcnow()
         )
         self.db.add(exam)
+        await self.db.flush()
+        await self.stats_repo.record_activity(talent_id, exam.waktuujian)
         await self.db.commit()
         await self.db.refresh(exam)
         return exam
@@ -78,7 +82,10 @@ class ExamRepository:
         """Update nilai akhir ujian"""
         ujian = await self.get_exam_by_id(ujian_id)
         if ujian:
+            previous_score = ujian.nilai
             ujian.nilai = score
+            await self.db.flush()
+            await self.stats_repo.record_exam_score(ujian, previous_score)
             await self.db.commit()
             await self.db.refresh(ujian)
         return ujian
\ No newline at end of file
@@ -1,51 +1,60 @@
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, func, and_, literal
+from sqlalchemy.dialects.postgresql import aggregate_order_by, JSON
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.models import (
     Hasillatihanfonem, Hasillatihanpercakapan, Hasillatihaninterview, 
     Ujianfonem, Detailujianfonem, Materifonemkata, Materifonemkalimat, 
     Materipercakapan, Materiujiankalimat
 )
+from app.utils.pagination import Page, fetch_page
 from datetime import datetime, timedelta
+from typing import Optional
+
+def join_phoneme_material(query):
+    """
+    Tambahkan kolom content & category materi ke query Hasillatihanfonem.
+    idsoal polimorfik (kata / kalimat) sehingga kedua tabel di-left join sesuai typelatihan.
+    """
+    return (
+        query
+        .add_columns(
+            func.coalesce(Materifonemkata.kata, Materifonemkalimat.kalimat).label("content"),
+            func.coalesce(Materifonemkata.kategori, Materifonemkalimat.kategori).label("category")
+        )
+        .outerjoin(Materifonemkata, and_(Hasillatihanfonem.typelatihan == "Word", Materifonemkata.idmaterifonemkata == Hasillatihanfonem.idsoal))
+        .outerjoin(Materifonemkalimat, and_(Hasillatihanfonem.typelatihan == "Sentence", Materifonemkalimat.idmaterifonemkalimat == Hasillatihanfonem.idsoal))
+    )
 
 class HistoryRepository:
+    """
+    Riwayat latihan/ujian talent dalam jendela `days_back` hari, terbaru dulu.
+    Tanpa `limit` seluruh jendela dikembalikan; dengan `limit` halaman dibaca offset atau keyset (`cursor`).
+    """
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get_phoneme_history(self, talent_id: int, days_back: int = 7, skip: int = 0, limit: int = 10):
+    async def _page(self, query, keys, skip: int, limit: Optional[int], cursor: Optional[str]) -> Page:
+        if limit is None:
+            rows = (await self.db.execute(query.order_by(*[desc(k) for k in keys]))).all()
+            return Page(rows=rows)
+        return await fetch_page(self.db, query, keys, limit, skip, cursor, with_total=False)
+
+    async def get_phoneme_history(self, talent_id: int, days_back: int = 7, skip: int = 0, limit: Optional[int] = 10, cursor: Optional[str] = None) -> Page:
         cutoff = datetime.utcnow() - timedelta(days=days_back)
-        
-        query = (
-            select(Hasillatihanfonem)
-            .where(
-                Hasillatihanfonem.idtalent == talent_id,
-                Hasillatihanfonem.waktulatihan >= cutoff
-            )
-            .order_by(desc(Hasillatihanfonem.waktulatihan))
-            .offset(skip)
-            .limit(limit)
+        query = join_phoneme_material(select(Hasillatihanfonem)).where(
+            Hasillatihanfonem.idtalent == talent_id,
+            Hasillatihanfonem.waktulatihan >= cutoff
         )
-        result = await self.db.execute(query)
-        items = result.scalars().all()
-        
-        # Perlu manual fetch nama soal karena polimorfik (Word/Sentence)
-        enriched_items = []
-        for item in items:
-            soal_text = "Unknown"
-            if item.typelatihan == "Word":
-                q = select(Materifonemkata.kata).where(Materifonemkata.idmaterifonemkata == item.idsoal)
-                soal_text = await self.db.scalar(q)
-            elif item.typelatihan == "Sentence":
-                q = select(Materifonemkalimat.kalimat).where(Materifonemkalimat.idmaterifonemkalimat == item.idsoal)
-                soal_text = await self.db.scalar(q)
-            
-            enriched_items.append({
-                "raw": item,
-                "soal_text": soal_text
-            })
-            
-        return enriched_items
+        page = await self._page(query, [Hasillatihanfonem.waktulatihan, Hasillatihanfonem.idhasilfonem], skip, limit, cursor)
 
-    async def get_conversation_history(self, talent_id: int, days_back: int = 7):
+        # Nama soal ikut di-join (Word/Sentence), satu query per halaman
+        page.rows = [
+            {"raw": row.Hasillatihanfonem, "soal_text": row.content if row.Hasillatihanfonem.typelatihan in ("Word", "Sentence") else "Unknown"}
+            for row in page.rows
+        ]
+        return page
+
+    async def get_conversation_history(self, talent_id: int, days_back: int = 7, skip: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None) -> Page:
         cutoff = datetime.utcnow() - timedelta(days=days_back)
         query = (
             select(Hasillatihanpercakapan, Materipercakapan.topic)
@@ -54,51 +63,40 @@ class HistoryRepository:
                 Hasillatihanpercakapan.idtalent == talent_id,
                 Hasillatihanpercakapan.waktulatihan >= cutoff
             )
-            .order_by(desc(Hasillatihanpercakapan.waktulatihan))
         )
-        result = await self.db.execute(query)
-        return result.all() # Returns tuples (Model, topic_string)
+        page = await self._page(query, [Hasillatihanpercakapan.waktulatihan, Hasillatihanpercakapan.idhasilpercakapan], skip, limit, cursor)
+        page.rows = [(row.Hasillatihanpercakapan, row.topic) for row in page.rows] # tuples (Model, topic_string)
+        return page
 
-    async def get_interview_history(self, talent_id: int, days_back: int = 7):
+    async def get_interview_history(self, talent_id: int, days_back: int = 7, skip: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None) -> Page:
         cutoff = datetime.utcnow() - timedelta(days=days_back)
-        query = (
-            select(Hasillatihaninterview)
-            .where(
-                Hasillatihaninterview.idtalent == talent_id,
-                Hasillatihaninterview.waktulatihan >= cutoff
-            )
-            .order_by(desc(Hasillatihaninterview.waktulatihan))
+        query = select(Hasillatihaninterview).where(
+            Hasillatihaninterview.idtalent == talent_id,
+            Hasillatihaninterview.waktulatihan >= cutoff
         )
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        page = await self._page(query, [Hasillatihaninterview.waktulatihan, Hasillatihaninterview.idhasilinterview], skip, limit, cursor)
+        page.rows = [row.Hasillatihaninterview for row in page.rows]
+        return page
 
-    async def get_exam_history(self, talent_id: int, days_back: int = 7):
+    async def get_exam_history(self, talent_id: int, days_back: int = 7, skip: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None) -> Page:
         cutoff = datetime.utcnow() - timedelta(days=days_back)
+        # Detail per ujian diagregasi jadi JSON array di query yang sama (bukan query per ujian)
+        detail_json = func.json_build_object("score", Detailujianfonem.nilai, "kalimat", Materiujiankalimat.kalimat)
+        details = func.coalesce(
+            func.json_agg(aggregate_order_by(detail_json, Detailujianfonem.iddetail)).filter(Materiujiankalimat.idmateriujiankalimat != None),
+            literal("[]").cast(JSON),
+            type_=JSON
+        ).label("details")
         query = (
-            select(Ujianfonem)
+            select(Ujianfonem, details)
+            .outerjoin(Detailujianfonem, Detailujianfonem.idujian == Ujianfonem.idujian)
+            .outerjoin(Materiujiankalimat, Detailujianfonem.idsoal == Materiujiankalimat.idmateriujiankalimat)
             .where(
                 Ujianfonem.idtalent == talent_id,
                 Ujianfonem.waktuujian >= cutoff
             )
-            .order_by(desc(Ujianfonem.waktuujian))
+            .group_by(Ujianfonem.idujian)
         )
-        result = await self.db.execute(query)
-        exams = result.scalars().all()
-        
-        # Fetch details for each exam
-        history_data = []
-        for exam in exams:
-            q_detail = (
-                select(Detailujianfonem, Materiujiankalimat.kalimat)
-                .join(Materiujiankalimat, Detailujianfonem.idsoal == Materiujiankalimat.idmateriujiankalimat)
-                .where(Detailujianfonem.idujian == exam.idujian)
-            )
-            details_res = await self.db.execute(q_detail)
-            details = [{"score": r.Detailujianfonem.nilai, "kalimat": r.kalimat} for r in details_res]
-            
-            history_data.append({
-                "exam": exam,
-                "details": details
-            })
-            
-        return history_data
\ No newline at end of file
+        page = await self._page(query, [Ujianfonem.waktuujian, Ujianfonem.idujian], skip, limit, cursor)
+        page.rows = [{"exam": row.Ujianfonem, "details": row.details} for row in page.rows]
+        return page
@@ -0,0 +1,86 @@
+import logging
+from sqlalchemy import select, func, delete, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import Leaderboardsnapshot, Talent, Hasillatihanfonem, Ujianfonem, Hasillatihanpercakapan, Hasillatihaninterview
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+import pytz
+
+logger = logging.getLogger(__name__)
+
+class LeaderboardRepository:
+    """
+    Snapshot leaderboard highest-scoring (tabel leaderboardsnapshot).
+    refresh() membangun ulang per kategori dalam satu transaksi: pembaca tetap melihat snapshot lama sampai commit.
+    """
+    CATEGORIES = ("phoneme_material_exercise", "phoneme_exercise", "phoneme_exam", "conversation", "interview")
+    REFRESH_LOCK_KEY = 720461
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _source(category: str):
+        """Agregat per talent: score, attempts (kunci urut kedua), total_attempts, last_date"""
+        if category in ("phoneme_material_exercise", "phoneme_exercise"):
+            type_latihan = "Word" if category == "phoneme_material_exercise" else "Sentence"
+            return select(
+                Talent.idtalent, Talent.nama, Talent.email,
+                func.avg(Hasillatihanfonem.nilai).label("score"),
+                func.count(func.distinct(Hasillatihanfonem.idsoal)).label("attempts"),
+                func.count(Hasillatihanfonem.idhasilfonem).label("total_attempts"),
+                func.max(Hasillatihanfonem.waktulatihan).label("last_date")
+            ).join(Hasillatihanfonem, Talent.idtalent == Hasillatihanfonem.idtalent).where(Hasillatihanfonem.typelatihan == type_latihan).group_by(Talent.idtalent)
+        if category == "phoneme_exam":
+            return select(
+                Talent.idtalent, Talent.nama, Talent.email,
+                func.avg(Ujianfonem.nilai).label("score"),
+                func.count(func.distinct(Ujianfonem.kategori)).label("attempts"),
+                func.count(Ujianfonem.idujian).label("total_attempts"),
+                func.max(Ujianfonem.waktuujian).label("last_date")
+            ).join(Ujianfonem, Talent.idtalent == Ujianfonem.idtalent).where(Ujianfonem.nilai != None).group_by(Talent.idtalent)
+        model, pk = (Hasillatihaninterview, Hasillatihaninterview.idhasilinterview) if category == "interview" else (Hasillatihanpercakapan, Hasillatihanpercakapan.idhasilpercakapan)
+        return select(
+            Talent.idtalent, Talent.nama, Talent.email,
+            func.avg(model.wpm).label("score"),
+            func.count(pk).label("attempts"),
+            func.count(pk).label("total_attempts"),
+            func.max(model.waktulatihan).label("last_date")
+        ).join(model, Talent.idtalent == model.idtalent).group_by(Talent.idtalent)
+
+    async def refresh(self, categories: Optional[Sequence[str]] = None) -> Dict[str, int]:
+        """Bangun ulang snapshot (semua kategori default) lalu commit; mengembalikan jumlah baris per kategori"""
+        # Serialisasi refresh antar worker agar delete+insert tidak bentrok di primary key
+        await self.db.execute(select(func.pg_advisory_xact_lock(self.REFRESH_LOCK_KEY)))
+        refreshed_at = datetime.now(pytz.utc)
+        counts = {}
+        for category in categories or self.CATEGORIES:
+            src = self._source(category).subquery()
+            ranked = select(
+                literal(category),
+                func.row_number().over(order_by=[src.c.score.desc().nulls_last(), src.c.attempts.desc(), src.c.idtalent]),
+                src.c.idtalent, src.c.nama, src.c.email, src.c.score, src.c.attempts, src.c.total_attempts, src.c.last_date,
+                literal(refreshed_at)
+            )
+            await self.db.execute(delete(Leaderboardsnapshot).where(Leaderboardsnapshot.category == category))
+            result = await self.db.execute(Leaderboardsnapshot.__table__.insert().from_select(
+                ["category", "rank", "idtalent", "nama", "email", "score", "attempts", "total_attempts", "last_date", "refreshed_at"],
+                ranked
+            ))
+            counts[category] = result.rowcount
+        await self.db.commit()
+        return counts
+
+    async def get_page(self, category: str, skip: int, limit: int, search: str = None):
+        """Satu halaman snapshot (urut rank) + total dari window count + waktu snapshot"""
+        query = select(Leaderboardsnapshot, func.count().over().label("total")).where(Leaderboardsnapshot.category == category)
+        if search: query = query.where(Leaderboardsnapshot.nama.ilike(f"%{search}%"))
+        rows = (await self.db.execute(query.order_by(Leaderboardsnapshot.rank).offset(skip).limit(limit))).all()
+        if rows:
+            return [r.Leaderboardsnapshot for r in rows], rows[0].total, rows[0].Leaderboardsnapshot.refreshed_at
+
+        # Halaman kosong: total & waktu snapshot diambil terpisah
+        count_query = select(func.count(), func.max(Leaderboardsnapshot.refreshed_at)).where(Leaderboardsnapshot.category == category)
+        if search: count_query = count_query.where(Leaderboardsnapshot.nama.ilike(f"%{search}%"))
+        total, refreshed_at = (await self.db.execute(count_query)).one()
+        return [], total or 0, refreshed_at
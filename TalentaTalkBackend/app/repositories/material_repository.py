@@ -1,18 +1,22 @@
-from sqlalchemy import select, func, distinct
+from sqlalchemy import select, func, distinct, union_all, literal, any_, bindparam, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from app.models.models import Materipercakapan, Materifonemkata, Materifonemkalimat, Materiujian, Materiujiankalimat, Materiinterview
 from app.core.exceptions import DuplicateError
+from app.services.interview_snapshot import InterviewQuestionSnapshot
+from app.services.material_sampler import MaterialSampler
+from app.repositories.counter_repository import CounterRepository
+from app.utils.pagination import Page, fetch_page
 
 class MaterialRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.counters = CounterRepository(db)
 
     # --- READ METHODS (General) ---
     async def get_random_topic(self):
-        query = select(Materipercakapan).order_by(func.random()).limit(1)
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await self._pick_one(Materipercakapan, Materipercakapan.idmateripercakapan, lambda index: index.random_topic())
 
     async def get_phoneme_content(self, id: int, type: str):
         if type == "word":
@@ -23,35 +27,46 @@ class MaterialRepository:
         return result.scalar_one_or_none()
 
     # --- PRETEST & RANDOM FETCHING ---
+    # Id dipilih acak dari MaterialSampler (in-memory), baris diambil by id dengan satu `= ANY(:ids)`
+    async def get_sampling_rows(self):
+        """(kind, id, teks filter) semua kata, kalimat, dan topik dalam satu query untuk MaterialSampler"""
+        query = union_all(
+            select(literal("word"), Materifonemkata.idmaterifonemkata, Materifonemkata.fonem),
+            select(literal("sentence"), Materifonemkalimat.idmaterifonemkalimat, Materifonemkalimat.kategori),
+            select(literal("topic"), Materipercakapan.idmateripercakapan, literal(None, String)),
+        )
+        return (await self.db.execute(query)).all()
+
+    async def _get_by_ids(self, model, pk, ids: list):
+        query = select(model).where(pk == any_(bindparam("ids", list(ids), type_=ARRAY(Integer))))
+        rows = {getattr(r, pk.key): r for r in (await self.db.execute(query)).scalars().all()}
+        return [rows[i] for i in ids if i in rows]
+
+    async def _pick_one(self, model, pk, pick):
+        # Id basi (dihapus di worker lain sebelum TTL habis) -> muat ulang index sekali
+        for _ in range(2):
+            chosen = pick(await MaterialSampler.get(self))
+            if chosen is None: return None
+            rows = await self._get_by_ids(model, pk, [chosen])
+            if rows: return rows[0]
+            MaterialSampler.invalidate()
+        return None
+
     async def get_random_sentences(self, limit: int = 10):
-        cat_query = select(Materifonemkalimat.kategori).distinct()
-        categories = (await self.db.execute(cat_query)).scalars().all()
-        
-        results = []
-        for cat in categories:
-            if len(results) >= limit: break
-            q = select(Materifonemkalimat).where(Materifonemkalimat.kategori == cat).order_by(func.random()).limit(1)
-            item = (await self.db.execute(q)).scalar_one_or_none()
-            if item: results.append(item)
-            
-        if len(results) < limit:
-            needed = limit - len(results)
-            exclude_ids = [r.idmaterifonemkalimat for r in results]
-            q_more = select(Materifonemkalimat).where(Materifonemkalimat.idmaterifonemkalimat.notin_(exclude_ids)).order_by(func.random()).limit(needed)
-            more_items = (await self.db.execute(q_more)).scalars().all()
-            results.extend(more_items)
-            
+        """Soal pretest terstratifikasi (satu per kategori, sisanya acak) dalam satu round trip"""
+        ids = (await MaterialSampler.get(self)).stratified_sentences(limit)
+        results = await self._get_by_ids(Materifonemkalimat, Materifonemkalimat.idmaterifonemkalimat, ids)
+        if len(results) < len(ids):
+            MaterialSampler.invalidate()
+            ids = (await MaterialSampler.get(self)).stratified_sentences(limit)
+            results = await self._get_by_ids(Materifonemkalimat, Materifonemkalimat.idmaterifonemkalimat, ids)
         return results
 
     async def get_random_word_by_phoneme(self, phoneme: str):
-        query = select(Materifonemkata).where(Materifonemkata.fonem.ilike(f"%{phoneme}%")).order_by(func.random()).limit(1)
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await self._pick_one(Materifonemkata, Materifonemkata.idmaterifonemkata, lambda index: index.random_word(phoneme))
 
     async def get_random_sentence_by_phoneme(self, phoneme: str):
-        query = select(Materifonemkalimat).where(Materifonemkalimat.kategori.ilike(f"%{phoneme}%")).order_by(func.random()).limit(1)
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await self._pick_one(Materifonemkalimat, Materifonemkalimat.idmaterifonemkalimat, lambda index: index.random_sentence(phoneme))
 
     async def get_word_by_id(self, id: int):
         return await self.db.get(Materifonemkata, id)
@@ -132,12 +147,24 @@ class MaterialRepository:
     async def get_interview_question_by_id(self, id: int):
         return await self.db.get(Materiinterview, id)
 
+    async def get_active_interview_questions(self):
+        query = select(Materiinterview).where(Materiinterview.is_active == True).order_by(Materiinterview.idmateriinterview.asc())
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def get_interview_questions_by_ids(self, ids: list):
+        if not ids: return []
+        result = await self.db.execute(select(Materiinterview).where(Materiinterview.idmateriinterview.in_(ids)))
+        return result.scalars().all()
+
     # --- ADMIN CRUD OPERATIONS ---
     async def create_word(self, data: dict):
         try:
             obj = Materifonemkata(**data)
             self.db.add(obj)
+            await self.counters.increment(CounterRepository.WORD)
             await self.db.commit()
+            MaterialSampler.invalidate()
             await self.db.refresh(obj)
             return obj
         except IntegrityError:
@@ -149,18 +176,23 @@ class MaterialRepository:
         stmt = update(Materifonemkata).where(Materifonemkata.idmaterifonemkata == id).values(**data)
         await self.db.execute(stmt)
         await self.db.commit()
+        MaterialSampler.invalidate()
 
     async def delete_word(self, id: int):
         from sqlalchemy import delete
         stmt = delete(Materifonemkata).where(Materifonemkata.idmaterifonemkata == id)
-        await self.db.execute(stmt)
+        result = await self.db.execute(stmt)
+        await self.counters.increment(CounterRepository.WORD, -result.rowcount)
         await self.db.commit()
+        MaterialSampler.invalidate()
 
     async def create_sentence(self, data: dict):
         try:
             obj = Materifonemkalimat(**data)
             self.db.add(obj)
+            await self.counters.increment(CounterRepository.SENTENCE)
             await self.db.commit()
+            MaterialSampler.invalidate()
             await self.db.refresh(obj)
             return obj
         except IntegrityError:
@@ -172,12 +204,15 @@ class MaterialRepository:
         stmt = update(Materifonemkalimat).where(Materifonemkalimat.idmaterifonemkalimat == id).values(**data)
         await self.db.execute(stmt)
         await self.db.commit()
+        MaterialSampler.invalidate()
 
     async def delete_sentence(self, id: int):
         from sqlalchemy import delete
         stmt = delete(Materifonemkalimat).where(Materifonemkalimat.idmaterifonemkalimat == id)
-        await self.db.execute(stmt)
+        result = await self.db.execute(stmt)
+        await self.counters.increment(CounterRepository.SENTENCE, -result.rowcount)
         await self.db.commit()
+        MaterialSampler.invalidate()
 
     async def create_exam_set(self, category: str, items: list):
         try:
@@ -191,6 +226,8 @@ class MaterialRepository:
                     fonem=item["phoneme"]
                 )
                 self.db.add(detail)
+            await self.db.flush()
+            await self.counters.refresh_exam_categories()
             await self.db.commit()
             return exam_header
         except Exception as e:
@@ -204,6 +241,7 @@ class MaterialRepository:
         from sqlalchemy import delete
         await self.db.execute(delete(Materiujiankalimat).where(Materiujiankalimat.idmateriujian == id))
         await self.db.execute(delete(Materiujian).where(Materiujian.idmateriujian == id))
+        await self.counters.refresh_exam_categories()
         await self.db.commit()
 
     async def update_exam_sentences(self, exam_id: int, items: list):
@@ -216,9 +254,19 @@ class MaterialRepository:
     async def create_interview_question(self, question: str):
         obj = Materiinterview(question=question, is_active=True)
         self.db.add(obj)
+        await self.counters.increment(CounterRepository.INTERVIEW_QUESTION)
         await self.db.commit()
         await self.db.refresh(obj)
+        InterviewQuestionSnapshot.invalidate()
         return obj
+
+    async def create_interview_questions_bulk(self, questions: list):
+        objs = [Materiinterview(question=q, is_active=True) for q in questions]
+        self.db.add_all(objs)
+        await self.counters.increment(CounterRepository.INTERVIEW_QUESTION, len(objs))
+        await self.db.commit()
+        InterviewQuestionSnapshot.invalidate()
+        return objs
         
     async def update_interview_question(self, id: int, question: str):
         obj = await self.get_interview_question_by_id(id)
@@ -226,12 +274,15 @@ class MaterialRepository:
             obj.question = question
             await self.db.commit()
             await self.db.refresh(obj)
+            InterviewQuestionSnapshot.invalidate()
         return obj
 
     async def delete_interview_question(self, id: int):
         from sqlalchemy import delete
-        await self.db.execute(delete(Materiinterview).where(Materiinterview.idmateriinterview == id))
+        result = await self.db.execute(delete(Materiinterview).where(Materiinterview.idmateriinterview == id))
+        await self.counters.increment(CounterRepository.INTERVIEW_QUESTION, -result.rowcount)
         await self.db.commit()
+        InterviewQuestionSnapshot.invalidate()
         
     async def toggle_interview_status(self, id: int):
         obj = await self.get_interview_question_by_id(id)
@@ -239,6 +290,7 @@ class MaterialRepository:
             obj.is_active = not obj.is_active
             await self.db.commit()
             await self.db.refresh(obj)
+            InterviewQuestionSnapshot.invalidate()
         return obj
         
     async def swap_interview_order(self, id: int, direction: str):
@@ -258,6 +310,7 @@ class MaterialRepository:
             current.question, current.is_active = target.question, target.is_active
             target.question, target.is_active = temp_q, temp_s
             await self.db.commit()
+            InterviewQuestionSnapshot.invalidate()
             return True
         return False
         
@@ -275,4 +328,27 @@ class MaterialRepository:
         
     async def get_sentences_by_category(self, category: str):
         result = await self.db.execute(select(Materifonemkalimat).where(Materifonemkalimat.kategori == category))
-        return result.scalars().all()
\ No newline at end of file
+        return result.scalars().all()
+    async def get_words_by_category_paginated(self, category: str, skip: int, limit: int) -> Page:
+        """Satu halaman kata per kategori (kolom yang ditampilkan saja), total dari window count"""
+        query = select(
+            Materifonemkata.idmaterifonemkata, Materifonemkata.kata, Materifonemkata.meaning,
+            Materifonemkata.definition, Materifonemkata.fonem
+        ).where(Materifonemkata.kategori == category)
+        return await fetch_page(self.db, query, [Materifonemkata.idmaterifonemkata], limit, skip, descending=False)
+
+    async def get_sentences_by_category_paginated(self, category: str, skip: int, limit: int) -> Page:
+        query = select(
+            Materifonemkalimat.idmaterifonemkalimat, Materifonemkalimat.kalimat, Materifonemkalimat.fonem
+        ).where(Materifonemkalimat.kategori == category)
+        return await fetch_page(self.db, query, [Materifonemkalimat.idmaterifonemkalimat], limit, skip, descending=False)
+
+    async def get_exams_by_category_paginated(self, category: str, skip: int, limit: int) -> Page:
+        """Satu halaman set ujian per kategori beserta jumlah kalimatnya (grouped), total dari window count"""
+        query = (
+            select(Materiujian.idmateriujian, Materiujian.updated_at, func.count(Materiujiankalimat.idmateriujiankalimat).label("total_sentence"))
+            .outerjoin(Materiujiankalimat, Materiujiankalimat.idmateriujian == Materiujian.idmateriujian)
+            .where(Materiujian.kategori == category)
+            .group_by(Materiujian.idmateriujian)
+        )
+        return await fetch_page(self.db, query, [Materiujian.idmateriujian], limit, skip, descending=False)
@@ -0,0 +1,114 @@
+from sqlalchemy import select, func, case, cast, delete, Float
+from sqlalchemy.dialects.postgresql import insert, aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import Talentphonemeconfusion, Hasillatihanfonem
+from app.utils.phoneme_utils import PhonemeMatcher
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple, Optional, Any
+
+class PhonemeConfusionRepository:
+    BACKFILL_BATCH_SIZE = 500
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def extract_alignment(stored: Any) -> List[Dict]:
+        """phoneme_comparison disimpan sebagai result_full (dict) atau langsung list alignment"""
+        if isinstance(stored, dict):
+            return stored.get("phoneme_comparison") or []
+        if isinstance(stored, list):
+            return stored
+        return []
+
+    async def _upsert_counts(self, talent_id: int, counts: Dict[Tuple[str, str, str], int]):
+        merged: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for (target, realised, status), count in counts.items():
+            row = merged.setdefault((target, realised), {"status": status, "count": 0})
+            row["count"] += count
+
+        if not merged:
+            return
+
+        rows = [
+            {"idtalent": talent_id, "target_phoneme": t, "realised_phoneme": r, "status": v["status"], "count": v["count"]}
+            for (t, r), v in merged.items()
+        ]
+        stmt = insert(Talentphonemeconfusion).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["idtalent", "target_phoneme", "realised_phoneme"],
+            set_={
+                "count": Talentphonemeconfusion.count + stmt.excluded.count,
+                "status": stmt.excluded.status,
+                "updated_at": func.now()
+            }
+        )
+        await self.db.execute(stmt)
+
+    async def add_alignment(self, talent_id: int, alignment: List[Dict]):
+        """Tambah hitungan dari satu attempt. Tidak commit, ikut transaksi pemanggil."""
+        await self._upsert_counts(talent_id, PhonemeMatcher.count_confusions(alignment))
+
+    async def get_weakest_phonemes(self, talent_id: int, limit: int = 5, min_attempts: int = 3) -> List[Dict[str, Any]]:
+        C = Talentphonemeconfusion
+        attempts = func.sum(C.count)
+        earned = func.sum(case((C.status == "correct", C.count * 100), (C.status == "similar", C.count * 75), else_=0))
+        accuracy = (cast(earned, Float) / attempts).label("accuracy")
+
+        def status_total(status: str):
+            return func.coalesce(func.sum(C.count).filter(C.status == status), 0)
+
+        query = (
+            select(
+                C.target_phoneme,
+                attempts.label("attempts"),
+                status_total("correct").label("correct"),
+                status_total("similar").label("similar"),
+                status_total("incorrect").label("incorrect"),
+                status_total("missing").label("missing"),
+                accuracy,
+                func.array_agg(aggregate_order_by(C.realised_phoneme, C.count.desc())).filter(C.status != "correct").label("confused_with")
+            )
+            .where(C.idtalent == talent_id, C.target_phoneme != "")
+            .group_by(C.target_phoneme)
+            .having(attempts >= min_attempts)
+            .order_by(accuracy.asc(), attempts.desc())
+            .limit(limit)
+        )
+        result = await self.db.execute(query)
+
+        return [
+            {
+                "phoneme": r.target_phoneme,
+                "attempts": r.attempts,
+                "correct": r.correct,
+                "similar": r.similar,
+                "incorrect": r.incorrect,
+                "missing": r.missing,
+                "accuracy": round(r.accuracy or 0, 1),
+                "confusedWith": [p for p in (r.confused_with or []) if p][:3]
+            }
+            for r in result
+        ]
+
+    async def rebuild(self, talent_id: Optional[int] = None) -> int:
+        """Hitung ulang confusion matrix dari seluruh Hasillatihanfonem (backfill)"""
+        clear_stmt = delete(Talentphonemeconfusion)
+        source = select(Hasillatihanfonem.idtalent, Hasillatihanfonem.phoneme_comparison).where(Hasillatihanfonem.idtalent != None)
+        if talent_id is not None:
+            clear_stmt = clear_stmt.where(Talentphonemeconfusion.idtalent == talent_id)
+            source = source.where(Hasillatihanfonem.idtalent == talent_id)
+
+        per_talent: Dict[int, Counter] = defaultdict(Counter)
+        processed = 0
+        stream = await self.db.stream(source.execution_options(yield_per=self.BACKFILL_BATCH_SIZE))
+        async for row in stream:
+            alignment = self.extract_alignment(row.phoneme_comparison)
+            per_talent[row.idtalent].update(PhonemeMatcher.count_confusions(alignment))
+            processed += 1
+
+        await self.db.execute(clear_stmt)
+        for tid, counts in per_talent.items():
+            await self._upsert_counts(tid, counts)
+        await self.db.commit()
+        return processed
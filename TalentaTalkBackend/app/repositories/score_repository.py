@@ -1,13 +1,23 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.models import Hasillatihanfonem, Hasillatihanpercakapan, Hasillatihaninterview
+from app.repositories.phoneme_confusion_repository import PhonemeConfusionRepository
+from app.repositories.talent_stats_repository import TalentStatsRepository
 from datetime import datetime
 import pytz
 
 class ScoreRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.stats_repo = TalentStatsRepository(db)
 
     async def save_phoneme_result(self, talent_id: int, soal_id: int, type: str, score: float, comparison: dict):
+        result = await self.stage_phoneme_result(talent_id, soal_id, type, score, comparison)
+        await self.db.commit()
+        await self.db.refresh(result)
+        return result
+
+    async def stage_phoneme_result(self, talent_id: int, soal_id: int, type: str, score: float, comparison: dict):
+        """Insert hasil + confusion + rollup (flush, belum commit); pemanggil yang menutup transaksi"""
         result = Hasillatihanfonem(
             idtalent=talent_id,
             idsoal=soal_id,
@@ -17,8 +27,29 @@ class ScoreRepository:
             waktulatihan=datetime.now(pytz.utc)
         )
         self.db.add(result)
+        # Confusion matrix diupdate dalam transaksi yang sama dengan hasil latihan
+        await PhonemeConfusionRepository(self.db).add_alignment(
+            talent_id, PhonemeConfusionRepository.extract_alignment(comparison)
+        )
+        # Rollup statistik talent juga (flush dulu agar rebuild awal ikut menghitung hasil ini)
+        await self.db.flush()
+        await self.stats_repo.record_phoneme(talent_id, type, soal_id, score, result.waktulatihan)
+        return result
+
+    async def get_phoneme_result(self, result_id: int):
+        return await self.db.get(Hasillatihanfonem, result_id)
+
+    async def attach_phoneme_analysis(self, result_id: int, analysis: dict, status: str):
+        """Tempel hasil analisis AI ke JSON phoneme_comparison lalu commit (juga menutup transaksi stage_phoneme_result)"""
+        result = await self.db.get(Hasillatihanfonem, result_id)
+        if not result:
+            return None
+        comparison = dict(result.phoneme_comparison or {})
+        comparison["gemini_analysis"] = analysis
+        comparison["analysis_status"] = status
+        # Kolom JSON tidak mutable-tracked, jadi assign ulang objek baru
+        result.phoneme_comparison = comparison
         await self.db.commit()
-        await self.db.refresh(result)
         return result
 
     async def save_chat_result(self, talent_id: int, topic_id: int, wpm: float, grammar: str):
@@ -30,6 +61,8 @@ class ScoreRepository:
             waktulatihan=datetime.now(pytz.utc)
         )
         self.db.add(result)
+        await self.db.flush()
+        await self.stats_repo.record_conversation(talent_id, wpm, result.waktulatihan)
         await self.db.commit()
         await self.db.refresh(result)
         return result
@@ -43,6 +76,8 @@ class ScoreRepository:
             waktulatihan=datetime.now(pytz.utc)
         )
         self.db.add(result)
+        await self.db.flush()
+        await self.stats_repo.record_interview(talent_id, wpm, result.waktulatihan)
         await self.db.commit()
         await self.db.refresh(result)
         return result
\ No newline at end of file
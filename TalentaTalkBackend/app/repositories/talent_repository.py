@@ -1,72 +1,85 @@
-from sqlalchemy import select, func, or_, desc, and_
+from sqlalchemy import select, func, or_, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.base import BaseRepository
+from app.repositories.counter_repository import CounterRepository
+from app.repositories.talent_stats_repository import TalentStatsRepository
+from app.repositories.history_repository import join_phoneme_material
+from app.utils.pagination import Page, fetch_page, keyset_after
+from typing import Any, Dict, List, Optional
 from app.models.models import (
-    Talent, Ujianfonem, Hasillatihanfonem, Materifonemkata, 
-    Materifonemkalimat, Hasillatihanpercakapan, Materipercakapan,
+    Talent, Ujianfonem, Hasillatihanfonem, Hasillatihanpercakapan, Materipercakapan,
     Hasillatihaninterview, Detailujianfonem, Materiujiankalimat
 )
 
 class TalentRepository(BaseRepository[Talent]):
     def __init__(self, db: AsyncSession):
         super().__init__(Talent, db)
+        self.counters = CounterRepository(db)
+        self.stats_repo = TalentStatsRepository(db)
+
+    async def create(self, obj_in: dict) -> Talent:
+        db_obj = Talent(**obj_in)
+        self.db.add(db_obj)
+        await self.counters.increment(CounterRepository.TALENT)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+
+    async def delete(self, db_obj: Talent) -> None:
+        await self.db.delete(db_obj)
+        await self.counters.increment(CounterRepository.TALENT, -1)
+        await self.db.commit()
 
     async def get_by_email(self, email: str):
         query = select(Talent).where(Talent.email == email)
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
-    async def get_talents_paginated(self, skip: int = 0, limit: int = 10, search: str = None):
+    async def get_talents_paginated(self, skip: int = 0, limit: int = 10, search: str = None, cursor: Optional[str] = None, with_total: bool = True) -> Page:
         query = select(Talent)
         if search:
             search_filter = or_(Talent.nama.ilike(f"%{search}%"), Talent.email.ilike(f"%{search}%"))
             query = query.filter(search_filter)
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await self.db.scalar(count_query)
-        query = query.order_by(Talent.idtalent.asc()).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        return result.scalars().all(), total
+        page = await fetch_page(self.db, query, [Talent.idtalent], limit, skip, cursor, with_total, descending=False)
+        page.rows = [r.Talent for r in page.rows]
+        return page
 
     async def get_talent_progress_stats(self, talent_id: int):
-        q_exam = select(Ujianfonem.nilai).where(Ujianfonem.idtalent == talent_id).order_by(desc(Ujianfonem.waktuujian)).limit(1)
-        latest_exam = await self.db.scalar(q_exam)
-        q_high = select(func.max(Ujianfonem.nilai)).where(Ujianfonem.idtalent == talent_id)
-        highest_exam = await self.db.scalar(q_high)
-        total_word = await self.db.scalar(select(func.count(Materifonemkata.idmaterifonemkata)))
-        total_sent = await self.db.scalar(select(func.count(Materifonemkalimat.idmaterifonemkalimat)))
-        total_materi = (total_word or 0) + (total_sent or 0)
-        q_done = select(func.count(func.distinct(Hasillatihanfonem.idsoal))).where(Hasillatihanfonem.idtalent == talent_id)
-        done = await self.db.scalar(q_done) or 0
-        progress_percent = (done / total_materi * 100) if total_materi > 0 else 0
-        return {"latest_exam": latest_exam, "highest_exam": highest_exam, "progress": progress_percent}
+        return (await self.get_talents_progress_stats([talent_id]))[talent_id]
 
-    async def get_phoneme_history_paginated(self, talent_id: int, type_latihan: str, skip: int, limit: int):
-        base_query = select(Hasillatihanfonem).where(and_(Hasillatihanfonem.idtalent == talent_id, Hasillatihanfonem.typelatihan == type_latihan))
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total = await self.db.scalar(count_query) or 0
-        query = base_query.order_by(desc(Hasillatihanfonem.waktulatihan)).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        items = result.scalars().all()
-        enriched = []
-        for item in items:
-            text_val = "Unknown"
-            category = "General"
-            if type_latihan == "Word":
-                text_val = await self.db.scalar(select(Materifonemkata.kata).where(Materifonemkata.idmaterifonemkata == item.idsoal))
-                category = await self.db.scalar(select(Materifonemkata.kategori).where(Materifonemkata.idmaterifonemkata == item.idsoal))
-            else:
-                text_val = await self.db.scalar(select(Materifonemkalimat.kalimat).where(Materifonemkalimat.idmaterifonemkalimat == item.idsoal))
-                category = await self.db.scalar(select(Materifonemkalimat.kategori).where(Materifonemkalimat.idmaterifonemkalimat == item.idsoal))
-            enriched.append({"category": category, "content": text_val, "score": item.nilai, "date": item.waktulatihan})
-        return enriched, total
+    async def get_talents_progress_stats(self, talent_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Versi batch get_talent_progress_stats: satu query rollup + total materi sekali per request"""
+        rows = await self.stats_repo.get_or_build_many(talent_ids)
+        total_materi = await self.get_total_phoneme_material()
+        results = {}
+        for talent_id in talent_ids:
+            stats = TalentStatsRepository.summary(rows.get(talent_id))
+            done = stats["phoneme_items_done"]
+            results[talent_id] = {
+                "latest_exam": stats["latest_exam"],
+                "highest_exam": stats["highest_exam"],
+                "progress": (done / total_materi * 100) if total_materi > 0 else 0
+            }
+        return results
 
-    async def get_exam_history_paginated(self, talent_id: int, skip: int, limit: int):
-        base_query = select(Ujianfonem).where(Ujianfonem.idtalent == talent_id)
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total = await self.db.scalar(count_query) or 0
-        query = base_query.order_by(desc(Ujianfonem.waktuujian)).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        return result.scalars().all(), total
+    async def get_total_phoneme_material(self) -> int:
+        counts = await self.counters.get_counts()
+        return counts[CounterRepository.WORD] + counts[CounterRepository.SENTENCE]
+
+    async def get_phoneme_history_paginated(self, talent_id: int, type_latihan: str, skip: int, limit: int, cursor: Optional[str] = None, with_total: bool = True) -> Page:
+        # Satu query: materi di-join sesuai typelatihan; keyset (waktulatihan, id) jika cursor diberikan
+        query = join_phoneme_material(select(Hasillatihanfonem.nilai, Hasillatihanfonem.waktulatihan)).where(
+            Hasillatihanfonem.idtalent == talent_id, Hasillatihanfonem.typelatihan == type_latihan
+        )
+        page = await fetch_page(self.db, query, [Hasillatihanfonem.waktulatihan, Hasillatihanfonem.idhasilfonem], limit, skip, cursor, with_total)
+        page.rows = [{"category": r.category, "content": r.content, "score": r.nilai, "date": r.waktulatihan} for r in page.rows]
+        return page
+
+    async def get_exam_history_paginated(self, talent_id: int, skip: int, limit: int, cursor: Optional[str] = None, with_total: bool = True) -> Page:
+        query = select(Ujianfonem).where(Ujianfonem.idtalent == talent_id)
+        page = await fetch_page(self.db, query, [Ujianfonem.waktuujian, Ujianfonem.idujian], limit, skip, cursor, with_total)
+        page.rows = [r.Ujianfonem for r in page.rows]
+        return page
 
     async def get_exam_attempt_detail(self, talent_id: int, attempt_id: int):
         exam = await self.db.get(Ujianfonem, attempt_id)
@@ -75,22 +88,26 @@ class TalentRepository(BaseRepository[Talent]):
         result = await self.db.execute(q_details)
         return exam, result.all()
 
-    async def get_conversation_history_paginated(self, talent_id: int, skip: int, limit: int):
-        base_query = select(Hasillatihanpercakapan, Materipercakapan.topic).join(Materipercakapan, Hasillatihanpercakapan.idmateripercakapan == Materipercakapan.idmateripercakapan).where(Hasillatihanpercakapan.idtalent == talent_id)
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total = await self.db.scalar(count_query) or 0
-        query = base_query.order_by(desc(Hasillatihanpercakapan.waktulatihan)).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        return result.all(), total
+    async def get_conversation_history_paginated(self, talent_id: int, skip: int, limit: int, cursor: Optional[str] = None, with_total: bool = True) -> Page:
+        query = select(Hasillatihanpercakapan, Materipercakapan.topic).join(Materipercakapan, Hasillatihanpercakapan.idmateripercakapan == Materipercakapan.idmateripercakapan).where(Hasillatihanpercakapan.idtalent == talent_id)
+        return await fetch_page(self.db, query, [Hasillatihanpercakapan.waktulatihan, Hasillatihanpercakapan.idhasilpercakapan], limit, skip, cursor, with_total)
 
-    async def get_interview_history_paginated(self, talent_id: int, skip: int, limit: int):
-        base_query = select(Hasillatihaninterview).where(Hasillatihaninterview.idtalent == talent_id)
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total = await self.db.scalar(count_query) or 0
-        query = base_query.order_by(desc(Hasillatihaninterview.waktulatihan)).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        return result.scalars().all(), total
+    async def get_interview_history_paginated(self, talent_id: int, skip: int, limit: int, cursor: Optional[str] = None, with_total: bool = True) -> Page:
+        query = select(Hasillatihaninterview).where(Hasillatihaninterview.idtalent == talent_id)
+        page = await fetch_page(self.db, query, [Hasillatihaninterview.waktulatihan, Hasillatihaninterview.idhasilinterview], limit, skip, cursor, with_total)
+        page.rows = [r.Hasillatihaninterview for r in page.rows]
+        return page
     
+    async def count_interviews_until(self, talent_id: int, item: Hasillatihaninterview) -> int:
+        """Jumlah interview talent sampai (dan termasuk) `item` menurut urutan (waktulatihan, id)"""
+        # Sama dengan urutan halaman riwayat (waktulatihan NULL dianggap terbaru): item itu sendiri + semua yang sesudahnya
+        keys = [Hasillatihaninterview.waktulatihan, Hasillatihaninterview.idhasilinterview]
+        query = select(func.count()).select_from(Hasillatihaninterview).where(
+            Hasillatihaninterview.idtalent == talent_id,
+            or_(Hasillatihaninterview.idhasilinterview == item.idhasilinterview, keyset_after(keys, [item.waktulatihan, item.idhasilinterview]))
+        )
+        return await self.db.scalar(query) or 0
+
     async def get_interview_detail(self, talent_id: int, attempt_id: int):
         query = select(Hasillatihaninterview).where(and_(Hasillatihaninterview.idhasilinterview == attempt_id, Hasillatihaninterview.idtalent == talent_id))
         result = await self.db.execute(query)
@@ -0,0 +1,245 @@
+from sqlalchemy import select, func, tuple_, union, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import AsyncSessionLocal
+from app.models.models import Talentstats, Talent, Hasillatihanfonem, Hasillatihanpercakapan, Hasillatihaninterview, Ujianfonem
+from app.utils.time_utils import TimeUtils
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+class TalentStatsRepository:
+    """
+    Rollup statistik per talent (tabel talentstats).
+    Method record_* dipanggil di transaksi yang sama dengan penyimpanan hasil (setelah flush), tanpa commit.
+    Jika baris rollup belum ada, baris dibangun penuh dari tabel hasil sehingga hasil yang baru di-flush ikut terhitung.
+    """
+    UPSERT_BATCH_SIZE = 500
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def wib_date(col):
+        # Kolom waktu disimpan naive UTC
+        return func.date(func.timezone('Asia/Jakarta', func.timezone('UTC', col)))
+
+    @staticmethod
+    def activity_days(scope=None):
+        """Subquery (idtalent, day): tanggal aktivitas unik (WIB) dari keempat tabel hasil"""
+        return union(*[
+            select(col_talent.label("idtalent"), TalentStatsRepository.wib_date(col_time).label("day")).where(scope(col_talent) if scope else true())
+            for col_talent, col_time in (
+                (Hasillatihanfonem.idtalent, Hasillatihanfonem.waktulatihan),
+                (Ujianfonem.idtalent, Ujianfonem.waktuujian),
+                (Hasillatihanpercakapan.idtalent, Hasillatihanpercakapan.waktulatihan),
+                (Hasillatihaninterview.idtalent, Hasillatihaninterview.waktulatihan),
+            )
+        ]).subquery("activity_days")
+
+    @staticmethod
+    def _blank(talent_id: int) -> Talentstats:
+        return Talentstats(
+            idtalent=talent_id, phoneme_count=0, phoneme_score_sum=0.0, phoneme_scored_count=0, phoneme_items_done=0,
+            conversation_count=0, conversation_wpm_sum=0.0, interview_count=0, interview_wpm_sum=0.0,
+            exam_count=0, exam_score_sum=0.0, current_run=0, highest_streak=0, week_active_days=0
+        )
+
+    @staticmethod
+    def _touch(row: Talentstats, day: date):
+        """Update streak untuk aktivitas pada tanggal `day` (WIB); tanggal lama/sama diabaikan"""
+        last = row.last_activity_date
+        if last is not None and day <= last:
+            return
+        row.current_run = row.current_run + 1 if last is not None and (day - last).days == 1 else 1
+        row.highest_streak = max(row.highest_streak, row.current_run)
+        row.last_activity_date = day
+        week_start = day - timedelta(days=day.weekday())
+        if row.week_start == week_start:
+            row.week_active_days += 1
+        else:
+            row.week_start, row.week_active_days = week_start, 1
+
+    async def _locked_row(self, talent_id: int) -> Optional[Talentstats]:
+        """Baris rollup terkunci (FOR UPDATE). None jika baris baru saja dibangun penuh (tidak perlu update inkremental)"""
+        row = await self.db.get(Talentstats, talent_id, with_for_update=True, populate_existing=True)
+        if row is None:
+            await self.rebuild(talent_id)
+        return row
+
+    # --- INCREMENTAL UPDATES ---
+    async def record_phoneme(self, talent_id: int, type: str, soal_id: int, score: float, at: datetime):
+        row = await self._locked_row(talent_id)
+        if row is None: return
+        attempts = await self.db.scalar(select(func.count()).select_from(Hasillatihanfonem).where(
+            Hasillatihanfonem.idtalent == talent_id, Hasillatihanfonem.typelatihan == type, Hasillatihanfonem.idsoal == soal_id
+        ))
+        row.phoneme_count += 1
+        # Rata-rata hanya dari attempt bernilai (sama dengan avg(nilai) yang mengabaikan NULL)
+        if score is not None:
+            row.phoneme_score_sum += score
+            row.phoneme_scored_count += 1
+        if attempts == 1:
+            row.phoneme_items_done += 1
+        self._touch(row, TimeUtils.to_wib_date(at))
+
+    async def record_conversation(self, talent_id: int, wpm: float, at: datetime):
+        row = await self._locked_row(talent_id)
+        if row is None: return
+        row.conversation_count += 1
+        row.conversation_wpm_sum += wpm or 0
+        self._touch(row, TimeUtils.to_wib_date(at))
+
+    async def record_interview(self, talent_id: int, wpm: float, at: datetime):
+        row = await self._locked_row(talent_id)
+        if row is None: return
+        row.interview_count += 1
+        row.interview_wpm_sum += wpm or 0
+        self._touch(row, TimeUtils.to_wib_date(at))
+
+    async def record_activity(self, talent_id: int, at: datetime):
+        """Aktivitas tanpa nilai (mis. mulai ujian) tetap dihitung untuk streak"""
+        row = await self._locked_row(talent_id)
+        if row is None: return
+        self._touch(row, TimeUtils.to_wib_date(at))
+
+    async def record_exam_score(self, exam: Ujianfonem, previous_score: Optional[float]):
+        row = await self._locked_row(exam.idtalent)
+        if row is None: return
+        score = exam.nilai or 0
+        if previous_score is None:
+            row.exam_count += 1
+            row.exam_score_sum += score
+        else:
+            # Ujian dinilai ulang: ganti kontribusi nilai lama
+            row.exam_score_sum += score - previous_score
+        row.highest_exam = score if row.highest_exam is None else max(row.highest_exam, score)
+        if row.latest_exam_at is None or (exam.waktuujian and exam.waktuujian >= row.latest_exam_at):
+            row.latest_exam, row.latest_exam_at = score, exam.waktuujian
+
+    # --- READ ---
+    @staticmethod
+    async def _build_missing(talent_ids: Sequence[int]):
+        """Bangun baris rollup yang belum ada di session & transaksi sendiri, sehingga jalur GET tidak meng-commit session request"""
+        async with AsyncSessionLocal() as session:
+            await TalentStatsRepository(session).rebuild(talent_ids=talent_ids, only_missing=True)
+            await session.commit()
+
+    async def get_or_build(self, talent_id: int) -> Optional[Talentstats]:
+        row = await self.db.get(Talentstats, talent_id)
+        if row is None:
+            await self._build_missing([talent_id])
+            row = await self.db.get(Talentstats, talent_id, populate_existing=True)
+        return row
+
+    async def get_or_build_many(self, talent_ids: Sequence[int]) -> Dict[int, Talentstats]:
+        """Baris rollup untuk banyak talent sekaligus; yang belum ada dibangun dalam satu rebuild"""
+        if not talent_ids:
+            return {}
+        query = select(Talentstats).where(Talentstats.idtalent.in_(talent_ids))
+        rows = {r.idtalent: r for r in (await self.db.execute(query)).scalars().all()}
+        missing = [tid for tid in talent_ids if tid not in rows]
+        if missing:
+            await self._build_missing(missing)
+            query = select(Talentstats).where(Talentstats.idtalent.in_(missing)).execution_options(populate_existing=True)
+            rows.update({r.idtalent: r for r in (await self.db.execute(query)).scalars().all()})
+        return rows
+
+    @staticmethod
+    def summary(row: Optional[Talentstats]) -> Dict[str, Any]:
+        """Nilai turunan (rata-rata, streak relatif hari ini) dari baris rollup"""
+        row = row or TalentStatsRepository._blank(0)
+        today = TimeUtils.today_wib()
+        this_week = today - timedelta(days=today.weekday())
+        is_active = row.last_activity_date is not None and (today - row.last_activity_date).days <= 1
+        return {
+            "phoneme_count": row.phoneme_count,
+            "avg_pronunciation": row.phoneme_score_sum / row.phoneme_scored_count if row.phoneme_scored_count else 0.0,
+            "phoneme_items_done": row.phoneme_items_done,
+            "conversation_count": row.conversation_count,
+            "avg_wpm_conversation": row.conversation_wpm_sum / row.conversation_count if row.conversation_count else 0.0,
+            "interview_count": row.interview_count,
+            "avg_wpm_interview": row.interview_wpm_sum / row.interview_count if row.interview_count else 0.0,
+            "exam_count": row.exam_count,
+            "avg_exam_score": row.exam_score_sum / row.exam_count if row.exam_count else 0.0,
+            "latest_exam": row.latest_exam,
+            "latest_exam_at": row.latest_exam_at,
+            "highest_exam": row.highest_exam,
+            "current_streak": row.current_run if is_active else 0,
+            "highest_streak": row.highest_streak,
+            "week_active_days": row.week_active_days if row.week_start == this_week else 0
+        }
+
+    # --- REBUILD ---
+    async def rebuild(self, talent_id: int = None, talent_ids: Optional[Sequence[int]] = None, only_missing: bool = False) -> int:
+        """
+        Hitung ulang rollup dari tabel hasil (satu talent, daftar talent, atau semua). Tidak commit; mengembalikan jumlah baris.
+        only_missing: baris yang sudah ada (mis. baru dibuat jalur tulis secara bersamaan) tidak ditimpa.
+        """
+        def scope(col):
+            if talent_ids is not None:
+                return col.in_(talent_ids)
+            return col == talent_id if talent_id is not None else true()
+
+        talent_ids = (await self.db.execute(select(Talent.idtalent).where(scope(Talent.idtalent)))).scalars().all()
+        rows: Dict[int, Talentstats] = {tid: self._blank(tid) for tid in talent_ids}
+        if not rows:
+            return 0
+
+        phoneme = select(
+            Hasillatihanfonem.idtalent, func.count(Hasillatihanfonem.idhasilfonem), func.sum(Hasillatihanfonem.nilai),
+            func.count(Hasillatihanfonem.nilai), func.count(func.distinct(tuple_(Hasillatihanfonem.typelatihan, Hasillatihanfonem.idsoal)))
+        ).where(scope(Hasillatihanfonem.idtalent)).group_by(Hasillatihanfonem.idtalent)
+        for tid, count, total, scored_count, items in (await self.db.execute(phoneme)).all():
+            if tid in rows:
+                row = rows[tid]
+                row.phoneme_count, row.phoneme_score_sum, row.phoneme_scored_count, row.phoneme_items_done = count, total or 0.0, scored_count, items
+
+        for model, pk, count_attr, sum_attr in (
+            (Hasillatihanpercakapan, Hasillatihanpercakapan.idhasilpercakapan, "conversation_count", "conversation_wpm_sum"),
+            (Hasillatihaninterview, Hasillatihaninterview.idhasilinterview, "interview_count", "interview_wpm_sum"),
+        ):
+            query = select(model.idtalent, func.count(pk), func.sum(model.wpm)).where(scope(model.idtalent)).group_by(model.idtalent)
+            for tid, count, total in (await self.db.execute(query)).all():
+                if tid in rows:
+                    setattr(rows[tid], count_attr, count)
+                    setattr(rows[tid], sum_attr, total or 0.0)
+
+        scored = Ujianfonem.nilai != None
+        exams = select(Ujianfonem.idtalent, func.count(Ujianfonem.idujian), func.sum(Ujianfonem.nilai), func.max(Ujianfonem.nilai)).where(scored, scope(Ujianfonem.idtalent)).group_by(Ujianfonem.idtalent)
+        for tid, count, total, highest in (await self.db.execute(exams)).all():
+            if tid in rows:
+                rows[tid].exam_count, rows[tid].exam_score_sum, rows[tid].highest_exam = count, total or 0.0, highest
+        latest = (
+            select(Ujianfonem.idtalent, Ujianfonem.nilai, Ujianfonem.waktuujian)
+            .where(scored, scope(Ujianfonem.idtalent))
+            .distinct(Ujianfonem.idtalent)
+            .order_by(Ujianfonem.idtalent, Ujianfonem.waktuujian.desc().nulls_last())
+        )
+        for tid, score, at in (await self.db.execute(latest)).all():
+            if tid in rows:
+                rows[tid].latest_exam, rows[tid].latest_exam_at = score, at
+
+        # Tanggal aktivitas unik (WIB) per talent, diputar ulang berurutan untuk streak
+        days = self.activity_days(scope)
+        activity: Dict[int, List[date]] = defaultdict(list)
+        for tid, day in (await self.db.execute(select(days.c.idtalent, days.c.day).where(days.c.day != None).order_by(days.c.idtalent, days.c.day))).all():
+            activity[tid].append(day)
+        for tid, talent_days in activity.items():
+            if tid in rows:
+                for day in talent_days:
+                    self._touch(rows[tid], day)
+
+        columns = [c.name for c in Talentstats.__table__.columns if c.name != "updated_at"]
+        values = [{name: getattr(row, name) for name in columns} for row in rows.values()]
+        for start in range(0, len(values), self.UPSERT_BATCH_SIZE):
+            stmt = insert(Talentstats).values(values[start:start + self.UPSERT_BATCH_SIZE])
+            if only_missing:
+                stmt = stmt.on_conflict_do_nothing(index_elements=["idtalent"])
+            else:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["idtalent"],
+                    set_={**{name: stmt.excluded[name] for name in columns if name != "idtalent"}, "updated_at": func.now()}
+                )
+            await self.db.execute(stmt)
+        return len(values)
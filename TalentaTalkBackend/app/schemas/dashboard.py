@@ -45,6 +45,7 @@ class PaginationInfo(BaseModel):
 class PaginatedListResponse(BaseModel):
     learners: List[LearnerItem]
     pagination: PaginationInfo
+    snapshotAt: Optional[str] = None
 
 # --- Admin Profile ---
 class AdminProfile(BaseModel):
@@ -13,4 +13,6 @@ class PhonemeCheckResponse(BaseModel):
     target_phonemes: str
     user_phonemes: str
     phoneme_comparison: List[PhonemeComparisonItem]
-    gemini_analysis: Optional[Dict[str, Any]] = None
\ No newline at end of file
+    gemini_analysis: Optional[Dict[str, Any]] = None
+    analysis_id: Optional[int] = None
+    analysis_status: Optional[str] = None
\ No newline at end of file
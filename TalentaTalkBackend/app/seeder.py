@@ -2,7 +2,7 @@ import asyncio
 import logging
 from passlib.context import CryptContext
 from sqlalchemy import select, delete
-from app.core.database import AsyncSessionLocal, engine, Base
+from app.core.database import AsyncSessionLocal
 from app.models.models import Manajemen
 
 # Logging config
@@ -25,9 +25,6 @@ ADMIN_DATA = [
 ]
 
 async def seed_admins():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
     async with AsyncSessionLocal() as session:
         try:
             result = await session.execute(select(Manajemen).where(Manajemen.email == ADMIN_DATA[0]["email"]))
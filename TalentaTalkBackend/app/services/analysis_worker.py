@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.repositories.score_repository import ScoreRepository
+from app.services.llm_service import LLMService
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class AnalysisJob:
+    result_id: int
+    target_phonemes: str
+    user_phonemes: str
+    target_text: str
+
+class PhonemeAnalysisWorker:
+    """
+    Worker in-process untuk analisis Gemini yang ditunda (deferred).
+    Hasil ditempel ke baris Hasillatihanfonem lalu waiter (SSE) dibangunkan.
+    """
+    STATUS_PENDING = "pending"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+
+    _queue: Optional[asyncio.Queue] = None
+    _workers: List[asyncio.Task] = []
+    _events: Dict[int, asyncio.Event] = {}
+
+    @classmethod
+    async def start(cls):
+        if cls._workers:
+            return
+        cls._queue = asyncio.Queue(maxsize=settings.PHONEME_ANALYSIS_QUEUE_SIZE)
+        cls._workers = [
+            asyncio.create_task(cls._run(i), name=f"phoneme-analysis-{i}")
+            for i in range(settings.PHONEME_ANALYSIS_WORKERS)
+        ]
+        logger.info(f"Phoneme analysis worker started ({len(cls._workers)} tasks)")
+
+    @classmethod
+    async def stop(cls):
+        for task in cls._workers:
+            task.cancel()
+        await asyncio.gather(*cls._workers, return_exceptions=True)
+        cls._workers = []
+        cls._queue = None
+
+    @classmethod
+    def submit(cls, job: AnalysisJob) -> bool:
+        if cls._queue is None:
+            return False
+        try:
+            cls._queue.put_nowait(job)
+            return True
+        except asyncio.QueueFull:
+            logger.warning(f"Phoneme analysis queue full, job {job.result_id} dropped")
+            return False
+
+    @classmethod
+    def get_event(cls, result_id: int) -> asyncio.Event:
+        """Event yang di-set saat analisis result_id selesai diproses di proses ini"""
+        return cls._events.setdefault(result_id, asyncio.Event())
+
+    @classmethod
+    def release_event(cls, result_id: int):
+        cls._events.pop(result_id, None)
+
+    @classmethod
+    async def _process(cls, job: AnalysisJob):
+        try:
+            analysis = await asyncio.wait_for(
+                LLMService.analyze_phoneme_quality(job.target_phonemes, job.user_phonemes, job.target_text),
+                timeout=settings.PHONEME_ANALYSIS_TIMEOUT
+            )
+            status = cls.STATUS_COMPLETED
+        except Exception as e:
+            logger.error(f"Deferred analysis {job.result_id} failed: {e}")
+            analysis = {"error": "AI Analysis unavailable"}
+            status = cls.STATUS_FAILED
+
+        async with AsyncSessionLocal() as session:
+            await ScoreRepository(session).attach_phoneme_analysis(job.result_id, analysis, status)
+
+    @classmethod
+    async def _run(cls, worker_no: int):
+        while True:
+            job = await cls._queue.get()
+            try:
+                await cls._process(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Analysis worker {worker_no} error on {job.result_id}: {e}")
+            finally:
+                cls._queue.task_done()
+                event = cls._events.pop(job.result_id, None)
+                if event is not None:
+                    event.set()
@@ -0,0 +1,76 @@
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.services.llm_service import LLMService
+
+class ConversationMemory:
+    """
+    Memori percakapan dengan budget token: giliran terbaru disimpan verbatim,
+    giliran lama dipadatkan ke ringkasan berjalan (rolling summary).
+    Token diestimasi ~4 karakter per token.
+    """
+    MIN_RECENT_TURNS = 2
+
+    def __init__(self, token_budget: Optional[int] = None, summary_tokens: Optional[int] = None,
+                 recent_turns: Optional[int] = None, summary: str = "", turns: Optional[List[Dict[str, str]]] = None):
+        self.token_budget = token_budget or settings.CONVERSATION_MEMORY_TOKEN_BUDGET
+        self.summary_tokens = summary_tokens or settings.CONVERSATION_MEMORY_SUMMARY_TOKENS
+        self.recent_turns = recent_turns or settings.CONVERSATION_MEMORY_RECENT_TURNS
+        self.summary = summary
+        self.turns: List[Dict[str, str]] = turns or []
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        return len(text) // 4 + 1
+
+    def token_count(self) -> int:
+        total = self.estimate_tokens(self.summary) if self.summary else 0
+        return total + sum(self.estimate_tokens(t["content"]) for t in self.turns)
+
+    def add(self, role: str, content: str):
+        self.turns.append({"role": role, "content": content})
+
+    def _split_point(self) -> int:
+        """Index giliran pertama yang tetap verbatim (terbaru yang muat di budget)"""
+        recent_budget = self.token_budget - self.summary_tokens
+        kept, used = 0, 0
+        for turn in reversed(self.turns):
+            cost = self.estimate_tokens(turn["content"])
+            if kept >= self.recent_turns or (kept >= self.MIN_RECENT_TURNS and used + cost > recent_budget):
+                break
+            kept += 1
+            used += cost
+        return len(self.turns) - kept
+
+    def _truncate_summary(self, text: str) -> str:
+        limit = self.summary_tokens * 4
+        return text if len(text) <= limit else "..." + text[-(limit - 3):]
+
+    async def compact(self) -> bool:
+        """Padatkan giliran lama ke summary bila melebihi budget; True jika ada yang dipadatkan"""
+        if self.token_count() <= self.token_budget:
+            return False
+        cut = self._split_point()
+        if cut <= 0:
+            return False
+
+        older, self.turns = self.turns[:cut], self.turns[cut:]
+        summary = await LLMService.summarize_conversation(self.summary, older, self.summary_tokens)
+        if not summary:
+            # Gemini tidak tersedia: ringkasan ekstraktif (potong dari yang terbaru)
+            summary = " ".join([self.summary] + [f"{t['role']}: {t['content']}" for t in older]).strip()
+        self.summary = self._truncate_summary(summary)
+        return True
+
+    def render(self) -> str:
+        """Transkrip ringkas untuk disisipkan ke prompt"""
+        lines = [f"SUMMARY OF EARLIER TURNS: {self.summary}"] if self.summary else []
+        lines.extend(f"{t['role'].upper()}: {t['content']}" for t in self.turns)
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"summary": self.summary, "turns": self.turns}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "ConversationMemory":
+        data = data or {}
+        return cls(summary=data.get("summary", ""), turns=list(data.get("turns", [])))
@@ -2,14 +2,24 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.material_repository import MaterialRepository
 from app.repositories.score_repository import ScoreRepository
 from app.services.llm_service import LLMService
+from app.services.conversation_memory import ConversationMemory
+from app.services.session_store import get_session_store
 from app.core.exceptions import AppError
+from typing import AsyncIterator, Tuple, Dict, Any, Optional
 import json
 import re
 
 class ConversationService:
+    # Memori per X-Session-ID (opsional); tanpa session id chat tetap stateless
+    SESSION_NAMESPACE = "conversation"
+    STREAM_DELIMITER = "###GRAMMAR###"
+    # Dipakai saat Gemini tidak tersedia (circuit breaker terbuka / kuota habis)
+    FALLBACK_REPLY = "Sorry, I couldn't catch that right now. Could you tell me a bit more?"
+
     def __init__(self, db: AsyncSession):
         self.material_repo = MaterialRepository(db)
         self.score_repo = ScoreRepository(db)
+        self.store = get_session_store()
 
     # Hardcoded Topics
     HARDCODED_TOPICS = [
@@ -26,7 +36,28 @@ class ConversationService:
     async def start_session(self):
         return {"topic": "Select a topic", "message": "Please select a topic to begin."}
 
-    async def process_chat(self, user_input: str, duration: str, talent_id: int, topic_id: int = 1):
+    async def _load_memory(self, session_id: Optional[str]) -> Tuple[Optional[ConversationMemory], Optional[int]]:
+        if not session_id:
+            return None, None
+        stored = await self.store.get(self.SESSION_NAMESPACE, session_id)
+        if not stored:
+            return ConversationMemory(), None
+        return ConversationMemory.from_dict(stored.data), stored.version
+
+    async def _save_memory(self, session_id: Optional[str], memory: Optional[ConversationMemory], version: Optional[int], user_input: str, reply: str):
+        if memory is None:
+            return
+        memory.add("user", user_input)
+        memory.add("assistant", reply)
+        await self.store.save(self.SESSION_NAMESPACE, session_id, memory.to_dict(), version)
+
+    @staticmethod
+    def _history_block(memory: Optional[ConversationMemory]) -> str:
+        if memory is None or not (memory.summary or memory.turns):
+            return ""
+        return f"Conversation so far:\n{memory.render()}"
+
+    async def process_chat(self, user_input: str, duration: str, talent_id: int, topic_id: int = 1, session_id: Optional[str] = None):
         selected_topic = next((t for t in self.HARDCODED_TOPICS if t["id"] == topic_id), self.HARDCODED_TOPICS[0])
         topic_name = selected_topic["title"]
 
@@ -34,8 +65,13 @@ class ConversationService:
         wpm = CalculationHelper.calculate_wpm(user_input, duration)
         confidence = min(100, max(0, int(wpm)))
         
+        memory, version = await self._load_memory(session_id)
+        if memory is not None:
+            await memory.compact()
+
         prompt = f"""
         Context: Professional Conversation about '{topic_name}'.
+        {self._history_block(memory)}
         User said: "{user_input}"
         Task: Check grammar & Respond naturally relevant to the topic.
         Return JSON: {{ "grammar_check": "...", "response": "..." }}
@@ -53,6 +89,8 @@ class ConversationService:
                 grammar_text = js.get("grammar_check", "")
         except:
             pass
+        if ai_raw == LLMService.FALLBACK_RESPONSE or not response_text.strip():
+            response_text = self.FALLBACK_REPLY
 
         await self.score_repo.save_chat_result(
             talent_id=talent_id,
@@ -60,9 +98,66 @@ class ConversationService:
             wpm=wpm,
             grammar=grammar_text[:255]
         )
+        await self._save_memory(session_id, memory, version, user_input, response_text)
 
         return {
             "response": response_text,
             "confidence_score": confidence,
             "grammar_check": grammar_text
-        }
\ No newline at end of file
+        }
+
+    async def stream_chat(self, user_input: str, duration: str, talent_id: int, topic_id: int = 1, session_id: Optional[str] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Versi streaming process_chat. Yield ("token", {...}) selama balasan AI mengalir,
+        lalu satu ("done", {...}) berisi grammar + skor setelah hasil disimpan.
+        """
+        selected_topic = next((t for t in self.HARDCODED_TOPICS if t["id"] == topic_id), self.HARDCODED_TOPICS[0])
+        topic_name = selected_topic["title"]
+
+        from app.utils.calculation_utils import CalculationHelper
+        wpm = CalculationHelper.calculate_wpm(user_input, duration)
+        confidence = min(100, max(0, int(wpm)))
+
+        memory, version = await self._load_memory(session_id)
+        if memory is not None:
+            await memory.compact()
+
+        # Balasan ditulis duluan agar bisa langsung di-stream, grammar menyusul setelah delimiter
+        prompt = f"""
+        Context: Professional Conversation about '{topic_name}'.
+        {self._history_block(memory)}
+        User said: "{user_input}"
+        Task: Respond naturally relevant to the topic, then check the user's grammar.
+        Output plain text (no JSON, no markdown) in exactly this format:
+        <your response>
+        {self.STREAM_DELIMITER}
+        <grammar check>
+        """
+        response_parts = []
+        grammar_text = "Analysis included"
+        async for kind, text in LLMService.stream_sections(prompt, self.STREAM_DELIMITER):
+            if kind == "token":
+                response_parts.append(text)
+                yield "token", {"text": text}
+            elif text:
+                grammar_text = text
+
+        response_text = "".join(response_parts).strip()
+        if not response_text:
+            response_text = self.FALLBACK_REPLY
+            yield "token", {"text": response_text}
+
+        saved = await self.score_repo.save_chat_result(
+            talent_id=talent_id,
+            topic_id=1,
+            wpm=wpm,
+            grammar=grammar_text[:255]
+        )
+        await self._save_memory(session_id, memory, version, user_input, response_text)
+
+        yield "done", {
+            "response": response_text,
+            "confidence_score": confidence,
+            "grammar_check": grammar_text,
+            "id": saved.idhasilpercakapan
+        }
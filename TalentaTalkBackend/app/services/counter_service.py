@@ -0,0 +1,14 @@
+import logging
+from typing import Dict
+from app.core.database import AsyncSessionLocal
+from app.repositories.counter_repository import CounterRepository
+
+logger = logging.getLogger(__name__)
+
+async def reconcile_counters() -> Dict[str, Dict[str, int]]:
+    """Job berkala: koreksi drift statcounter (penulisan di luar aplikasi, seeder, restore DB)"""
+    async with AsyncSessionLocal() as session:
+        drift = await CounterRepository(session).reconcile()
+    if drift:
+        logger.warning(f"Stat counter drift corrected: {drift}")
+    return drift
@@ -2,72 +2,192 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.material_repository import MaterialRepository
 from app.repositories.score_repository import ScoreRepository
 from app.services.llm_service import LLMService
+from app.services.conversation_memory import ConversationMemory
+from app.services.session_store import get_session_store, StoredSession
+from app.services.interview_snapshot import InterviewQuestionSnapshot
 from app.utils.calculation_utils import CalculationHelper
 from app.core.exceptions import AppError, NotFoundError
+from app.utils.pipeline import run_concurrently
 import json
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Tuple, Sequence
 
 class InterviewService:
-    _sessions: Dict[str, Any] = {}
+    SESSION_NAMESPACE = "interview"
+    STREAM_DELIMITER = "###FEEDBACK###"
 
     def __init__(self, db: AsyncSession):
         self.material_repo = MaterialRepository(db)
         self.score_repo = ScoreRepository(db)
+        self.store = get_session_store()
+
+    async def _load_session(self, session_id: str, detail: str) -> StoredSession:
+        stored = await self.store.get(self.SESSION_NAMESPACE, session_id)
+        if not stored: raise AppError(status_code=400, detail=detail)
+        return stored
+
+    async def _questions(self, session: Dict[str, Any]) -> Sequence[str]:
+        snapshot = await InterviewQuestionSnapshot.resolve(self.material_repo, session["snapshot_version"], session["question_ids"])
+        # Version bisa berubah bila snapshot dibangun ulang dari teks terbaru; simpan agar giliran berikutnya langsung hit cache
+        session["snapshot_version"] = snapshot.version
+        return snapshot.questions
+
+    async def _save_session(self, session_id: str, stored: StoredSession):
+        stored.version = await self.store.save(self.SESSION_NAMESPACE, session_id, stored.data, stored.version)
 
     async def start_session(self, session_id: str):
         if not session_id: session_id = str(uuid.uuid4())
-        questions = await self.material_repo.get_interview_questions(0, 100)
-        if not questions: raise NotFoundError("Interview Questions")
-        self._sessions[session_id] = {"questions": [q.question for q in questions], "current_index": 0, "step": "main", "history": [], "answers": [], "completed": False, "off_topic_count": 0}
-        return {"session_id": session_id, "question": questions[0].question, "step": "main"}
+        # Session hanya menyimpan version snapshot + id, bukan seluruh teks pertanyaan
+        snapshot = await InterviewQuestionSnapshot.get(self.material_repo)
+        if not snapshot.questions: raise NotFoundError("Interview Questions")
+        memory = ConversationMemory()
+        memory.add("interviewer", snapshot.questions[0])
+        session = {"snapshot_version": snapshot.version, "question_ids": list(snapshot.ids), "current_index": 0, "step": "main", "memory": memory.to_dict(), "answers": [], "completed": False, "off_topic_count": 0}
+        await self.store.save(self.SESSION_NAMESPACE, session_id, session, None)
+        return {"session_id": session_id, "question": snapshot.questions[0], "step": "main"}
 
     async def get_session_status(self, session_id: str):
-        session = self._sessions.get(session_id)
-        if not session: return {"status": "not_found", "session_exists": False}
-        return {"success": True, "status": {"session_id": session_id, "interview_started": True, "interview_completed": session["completed"], "current_question_index": session["current_index"], "total_questions": len(session["questions"]), "current_step": session["step"], "session_exists": True}}
+        stored = await self.store.get(self.SESSION_NAMESPACE, session_id)
+        if not stored: return {"status": "not_found", "session_exists": False}
+        session = stored.data
+        return {"success": True, "status": {"session_id": session_id, "interview_started": True, "interview_completed": session["completed"], "current_question_index": session["current_index"], "total_questions": len(session["question_ids"]), "current_step": session["step"], "session_exists": True}}
 
     async def process_answer(self, session_id: str, answer: str, duration: str):
-        session = self._sessions.get(session_id)
-        if not session: raise AppError(status_code=400, detail="Session expired. Please restart.")
+        stored = await self._load_session(session_id, "Session expired. Please restart.")
+        questions = await self._questions(stored.data)
+        result = await self._process_answer(stored.data, questions, answer, duration)
+        await self._save_session(session_id, stored)
+        return result
+
+    async def _process_answer(self, session: Dict[str, Any], questions: Sequence[str], answer: str, duration: str):
         if session["completed"]: return {"status": "completed", "message": "Interview already finished."}
-        current_q_text = session["questions"][session["current_index"]]
+        current_q_text = questions[session["current_index"]]
         
+        evaluation = None
         if session["step"] == "main":
-            relevance = await LLMService.check_relevance(current_q_text, answer)
+            # Satu round trip; hanya output malformed yang kembali ke check_relevance + followup terpisah
+            # (Gemini tidak tersedia -> evaluasi fallback, tanpa call tambahan)
+            # Pemadatan memori (jika perlu) berjalan bersamaan, tidak menambah latency giliran ini
+            evaluation, _ = await run_concurrently(
+                LLMService.evaluate_interview_answer(current_q_text, answer),
+                self._compact_memory(session)
+            )
+            relevance = evaluation if evaluation is not None else await LLMService.check_relevance(current_q_text, answer)
             if not relevance.get("is_relevant", True):
                 session["off_topic_count"] += 1
-                return {"status": "off_topic", "message": f"Your answer seems unrelated. {relevance.get('reason', 'Please focus on the question.')} Let's try again: {current_q_text}", "interview_completed": False}
+                return {"status": "off_topic", "message": f"Your answer seems unrelated. {relevance.get('reason') or 'Please focus on the question.'} Let's try again: {current_q_text}", "interview_completed": False}
 
         wpm = CalculationHelper.calculate_wpm(answer, duration)
         session["answers"].append({"question": current_q_text, "answer": answer, "wpm": wpm})
-        session["history"].append({"role": "user", "content": answer})
+        self._remember(session, "user", answer)
 
         if session["step"] == "main":
-            ai_resp = await LLMService.generate_interview_followup(current_q_text, answer)
+            ai_resp = evaluation if evaluation is not None else await LLMService.generate_interview_followup(current_q_text, answer)
             session["step"] = "followup"
             followup_q = ai_resp.get("followup_question", "Could you explain more?")
-            session["history"].append({"role": "interviewer", "content": followup_q})
+            self._remember(session, "interviewer", followup_q)
             return {"status": "continue", "feedback": ai_resp.get("feedback", "Good."), "message": followup_q, "interview_completed": False}
             
         elif session["step"] == "followup":
-            session["current_index"] += 1
-            session["step"] = "main"
-            if session["current_index"] >= len(session["questions"]):
-                session["completed"] = True
-                return {"status": "completed", "feedback": "Excellent. That concludes our interview.", "message": "Interview completed.", "interview_completed": True}
-            next_q = session["questions"][session["current_index"]]
-            session["history"].append({"role": "interviewer", "content": next_q})
-            return {"status": "continue", "feedback": "Thank you.", "message": next_q, "interview_completed": False}
+            return self._advance_question(session, questions)
+
+    @staticmethod
+    def _remember(session: Dict[str, Any], role: str, content: str):
+        session["memory"]["turns"].append({"role": role, "content": content})
+
+    @staticmethod
+    async def _compact_memory(session: Dict[str, Any]):
+        memory = ConversationMemory.from_dict(session["memory"])
+        if await memory.compact():
+            session["memory"] = memory.to_dict()
+
+    def _advance_question(self, session: Dict[str, Any], questions: Sequence[str]) -> Dict[str, Any]:
+        session["current_index"] += 1
+        session["step"] = "main"
+        if session["current_index"] >= len(questions):
+            session["completed"] = True
+            return {"status": "completed", "feedback": "Excellent. That concludes our interview.", "message": "Interview completed.", "interview_completed": True}
+        next_q = questions[session["current_index"]]
+        self._remember(session, "interviewer", next_q)
+        return {"status": "continue", "feedback": "Thank you.", "message": next_q, "interview_completed": False}
+
+    async def stream_answer(self, session_id: str, answer: str, duration: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Versi streaming process_answer. Follow-up question di-stream sebagai ("token", {...}),
+        feedback dan status dikirim di ("done", {...}). Session baru disimpan setelah stream selesai.
+        """
+        stored = await self._load_session(session_id, "Session expired. Please restart.")
+        questions = await self._questions(stored.data)
+        async for event, data in self._stream_answer(stored.data, questions, answer, duration):
+            if event == "done":
+                await self._save_session(session_id, stored)
+            yield event, data
+
+    async def _stream_answer(self, session: Dict[str, Any], questions: Sequence[str], answer: str, duration: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        if session["completed"]:
+            yield "done", {"status": "completed", "message": "Interview already finished."}
+            return
+        current_q_text = questions[session["current_index"]]
+
+        if session["step"] != "main":
+            wpm = CalculationHelper.calculate_wpm(answer, duration)
+            session["answers"].append({"question": current_q_text, "answer": answer, "wpm": wpm})
+            self._remember(session, "user", answer)
+            result = self._advance_question(session, questions)
+            yield "token", {"text": result["message"]}
+            yield "done", result
+            return
+
+        relevance, _ = await run_concurrently(
+            LLMService.check_relevance(current_q_text, answer),
+            self._compact_memory(session)
+        )
+        if not relevance.get("is_relevant", True):
+            session["off_topic_count"] += 1
+            message = f"Your answer seems unrelated. {relevance.get('reason', 'Please focus on the question.')} Let's try again: {current_q_text}"
+            yield "token", {"text": message}
+            yield "done", {"status": "off_topic", "message": message, "interview_completed": False}
+            return
+
+        prompt = f"""
+        SYSTEM ROLE: Technical Recruiter.
+        Context: Q: "{current_q_text}" A: "{answer}"
+        Task: 1 probing follow-up question, then 1 sentence feedback.
+        Output plain text (no JSON, no markdown) in exactly this format:
+        <follow-up question>
+        {self.STREAM_DELIMITER}
+        <feedback>
+        """
+        parts = []
+        feedback = "Good."
+        async for kind, text in LLMService.stream_sections(prompt, self.STREAM_DELIMITER):
+            if kind == "token":
+                parts.append(text)
+                yield "token", {"text": text}
+            elif text:
+                feedback = text
+        followup_q = "".join(parts).strip()
+        if not followup_q:
+            followup_q = "Could you explain more?"
+            yield "token", {"text": followup_q}
+
+        wpm = CalculationHelper.calculate_wpm(answer, duration)
+        session["answers"].append({"question": current_q_text, "answer": answer, "wpm": wpm})
+        self._remember(session, "user", answer)
+        session["step"] = "followup"
+        self._remember(session, "interviewer", followup_q)
+        yield "done", {"status": "continue", "feedback": feedback, "message": followup_q, "interview_completed": False}
 
     async def generate_summary(self, session_id: str, talent_id: int):
-        session = self._sessions.get(session_id)
-        if not session: raise AppError(status_code=400, detail="Session not found")
-        ai_summary = await LLMService.generate_interview_feedback(session["history"])
+        stored = await self._load_session(session_id, "Session not found")
+        session = stored.data
+        # Transkrip dibatasi budget token: giliran lama sudah berupa ringkasan
+        await self._compact_memory(session)
+        ai_summary = await LLMService.generate_interview_feedback(ConversationMemory.from_dict(session["memory"]).render())
         answers = session["answers"]
         total_wpm = sum(a["wpm"] for a in answers)
         avg_wpm = total_wpm / len(answers) if answers else 0
         grammar_score = ai_summary.get("summary", {}).get("overall_performance", {}).get("grammar_usage", "Fair")
         saved_record = await self.score_repo.save_interview_result(talent_id=talent_id, wpm=avg_wpm, grammar=grammar_score, feedback=json.dumps(ai_summary))
-        if session_id in self._sessions: del self._sessions[session_id]
+        await self.store.delete(self.SESSION_NAMESPACE, session_id)
         return {"success": True, "summary": ai_summary.get("summary"), "statistics": {"average_wpm": round(avg_wpm, 2), "total_answers": len(answers)}, "id": saved_record.idhasilinterview}
\ No newline at end of file
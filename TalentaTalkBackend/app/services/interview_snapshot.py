@@ -0,0 +1,93 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+from app.core.config import settings
+from app.core.exceptions import AppError
+
+@dataclass(frozen=True)
+class QuestionSnapshot:
+    version: str
+    ids: Tuple[int, ...]
+    questions: Tuple[str, ...]
+    loaded_at: float
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+class InterviewQuestionSnapshot:
+    """
+    Snapshot in-process daftar pertanyaan interview aktif (urut id).
+    Version = hash konten, sehingga semua worker dengan data sama menghasilkan version sama.
+    Di-invalidate oleh jalur admin (create/update/delete/toggle/swap/import); TTL membatasi
+    staleness di worker lain. Beberapa version terakhir disimpan untuk session yang sedang berjalan.
+    """
+    _current: Optional[QuestionSnapshot] = None
+    _history: "OrderedDict[str, QuestionSnapshot]" = OrderedDict()
+    _lock: Optional[asyncio.Lock] = None
+
+    @staticmethod
+    def _make_version(ids: Sequence[int], questions: Sequence[str]) -> str:
+        digest = hashlib.sha1()
+        for qid, text in zip(ids, questions):
+            digest.update(f"{qid}\x00{text}\x01".encode("utf-8"))
+        return digest.hexdigest()[:12]
+
+    @classmethod
+    def _remember(cls, snapshot: QuestionSnapshot):
+        cls._history[snapshot.version] = snapshot
+        cls._history.move_to_end(snapshot.version)
+        while len(cls._history) > settings.INTERVIEW_SNAPSHOT_HISTORY:
+            cls._history.popitem(last=False)
+
+    @classmethod
+    def _is_fresh(cls, snapshot: Optional[QuestionSnapshot]) -> bool:
+        return snapshot is not None and time.monotonic() - snapshot.loaded_at < settings.INTERVIEW_SNAPSHOT_TTL
+
+    @classmethod
+    async def get(cls, repo) -> QuestionSnapshot:
+        """Snapshot aktif terbaru; query DB hanya saat kosong, kadaluarsa, atau setelah invalidate"""
+        if cls._is_fresh(cls._current):
+            return cls._current
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        async with cls._lock:
+            if cls._is_fresh(cls._current):
+                return cls._current
+            rows = await repo.get_active_interview_questions()
+            ids = tuple(r.idmateriinterview for r in rows)
+            questions = tuple(r.question for r in rows)
+            snapshot = QuestionSnapshot(cls._make_version(ids, questions), ids, questions, time.monotonic())
+            cls._remember(snapshot)
+            cls._current = snapshot
+            return snapshot
+
+    @classmethod
+    async def resolve(cls, repo, version: str, question_ids: Sequence[int]) -> QuestionSnapshot:
+        """
+        Snapshot yang dipakai sebuah session. Jika version sudah tidak dikenal di proses ini
+        (worker lain / terlalu lama), bangun ulang dari id pertanyaan session. Version hasil bangun ulang
+        dihitung dari teks saat ini (bisa berbeda jika pertanyaan sudah diedit); pemanggil menyimpan version baru itu.
+        Pertanyaan yang sudah dihapus -> 409, session harus dimulai ulang.
+        """
+        snapshot = cls._history.get(version)
+        if snapshot is not None:
+            return snapshot
+        current = await cls.get(repo)
+        if current.version == version:
+            return current
+
+        rows = {r.idmateriinterview: r.question for r in await repo.get_interview_questions_by_ids(list(question_ids))}
+        if any(qid not in rows for qid in question_ids):
+            raise AppError(status_code=409, detail="Interview questions have changed. Please restart the interview.")
+        ids = tuple(question_ids)
+        questions = tuple(rows[qid] for qid in ids)
+        snapshot = QuestionSnapshot(cls._make_version(ids, questions), ids, questions, time.monotonic())
+        cls._remember(snapshot)
+        return snapshot
+
+    @classmethod
+    def invalidate(cls):
+        cls._current = None
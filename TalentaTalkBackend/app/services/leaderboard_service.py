@@ -0,0 +1,11 @@
+import logging
+from typing import Dict
+from app.core.database import AsyncSessionLocal
+from app.repositories.leaderboard_repository import LeaderboardRepository
+
+logger = logging.getLogger(__name__)
+
+async def refresh_leaderboards() -> Dict[str, int]:
+    """Job berkala: bangun ulang snapshot leaderboard highest-scoring"""
+    async with AsyncSessionLocal() as session:
+        return await LeaderboardRepository(session).refresh()
@@ -0,0 +1,118 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+class LLMResponseCache:
+    """
+    Cache respons LLM dua tingkat: LRU in-memory di depan SQLite lokal (persisten, dengan TTL).
+    Key = hash dari model id + prompt yang sudah dinormalisasi.
+    """
+    _WHITESPACE = re.compile(r"\s+")
+
+    def __init__(self, path: str, max_entries: int = 5000, default_ttl: int = 7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"memoryHits": 0, "diskHits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+    @classmethod
+    def make_key(cls, model_id: str, prompt: str) -> str:
+        normalized = cls._WHITESPACE.sub(" ", prompt).strip()
+        return hashlib.sha256(f"{model_id}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    # --- SQLITE BACKING STORE (dipanggil lewat threadpool) ---
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def _disk_get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._connect().execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if not row or row[1] < time.time():
+            return None
+        return row[0], row[1]
+
+    def _disk_set(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)", (key, value, expires_at))
+            # Bersihkan entry kadaluarsa sesekali agar file tidak tumbuh terus
+            if self._stats["writes"] % 500 == 0:
+                conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (time.time(),))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- MEMORY FRONT ---
+    def _remember(self, key: str, value: str, expires_at: float):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[1] >= time.time():
+                self._memory.move_to_end(key)
+                self._stats["memoryHits"] += 1
+                return entry[0]
+            del self._memory[key]
+
+        try:
+            found = await run_in_threadpool(self._disk_get, key)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error(f"LLM cache read error: {e}")
+            found = None
+
+        if found is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["diskHits"] += 1
+        self._remember(key, found[0], found[1])
+        return found[0]
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None):
+        expires_at = time.time() + (ttl or self.default_ttl)
+        self._remember(key, value, expires_at)
+        self._stats["writes"] += 1
+        try:
+            await run_in_threadpool(self._disk_set, key, value, expires_at)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error(f"LLM cache write error: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self._stats["memoryHits"] + self._stats["diskHits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "memoryEntries": len(self._memory),
+            "maxEntries": self.max_entries,
+            "hitRate": round(hits / lookups, 3) if lookups else 0.0,
+        }
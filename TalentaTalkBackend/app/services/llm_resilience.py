@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Rate limiter client-side: `rate_per_minute` token terisi merata, maksimal `burst` token tersimpan"""
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, timeout: float) -> bool:
+        """Tunggu sampai token tersedia; False jika waktu tunggu melebihi timeout"""
+        deadline = time.monotonic() + timeout
+        # Lock menjaga urutan FIFO antar waiter
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate if self.rate > 0 else timeout
+                if time.monotonic() + wait > deadline:
+                    return False
+                await asyncio.sleep(wait)
+
+    def available(self) -> float:
+        self._refill()
+        return round(self._tokens, 2)
+
+class CircuitBreaker:
+    """
+    closed -> open setelah `failure_threshold` kegagalan beruntun.
+    Setelah `recovery_timeout` detik masuk half_open: satu request percobaan, sukses menutup kembali.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._stats = {"opened": 0, "shortCircuited": 0}
+
+    def allow_request(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self._stats["shortCircuited"] += 1
+        return False
+
+    def release_probe(self):
+        """Request percobaan batal tanpa hasil (rate limit / cancel): slot probe dibuka lagi untuk request berikutnya"""
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info("LLM circuit breaker closed")
+        self.state = self.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self._stats["opened"] += 1
+                logger.warning(f"LLM circuit breaker opened after {self._failures} failures")
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        retry_in = 0.0
+        if self.state == self.OPEN:
+            retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+        return {
+            "state": self.state,
+            "consecutiveFailures": self._failures,
+            "retryInSeconds": round(retry_in, 1),
+            **self._stats,
+        }
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: Optional[float] = None) -> float:
+    """Exponential backoff dengan full jitter; Retry-After dari server dipakai sebagai batas bawah"""
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(cap, retry_after))
+    return delay
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
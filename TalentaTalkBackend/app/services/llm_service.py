@@ -1,15 +1,153 @@
 import aiohttp
+import asyncio
 import logging
 import json
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
 from app.core.config import settings
 from app.core.exceptions import AppError
+from app.services.llm_cache import LLMResponseCache
+from app.services.llm_resilience import TokenBucket, CircuitBreaker, backoff_delay, parse_retry_after
+from app.utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 class LLMService:
     HEADERS = {"Content-Type": "application/json"}
+    FALLBACK_RESPONSE = "{}"
+    # Gemini tidak tersedia (breaker open / rate limited / retry habis): default sama dengan alur lama, tanpa call tambahan
+    INTERVIEW_EVALUATION_FALLBACK = {"is_relevant": True, "reason": "", "feedback": "Thank you.", "followup_question": "Can you elaborate?"}
+    RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+    # --- SHARED HTTP CLIENT (keep-alive pool, dibuka/ditutup oleh lifespan) ---
+    _session: Optional[aiohttp.ClientSession] = None
+    _connector: Optional[aiohttp.TCPConnector] = None
+    _in_flight = 0
+    _total_requests = 0
+
+    # --- RESPONSE CACHE (opt-in per method) ---
+    _cache: Optional[LLMResponseCache] = None
+
+    # --- RESILIENCE (quota, concurrency, breaker) ---
+    _limiter: Optional[TokenBucket] = None
+    _semaphore: Optional[asyncio.Semaphore] = None
+    _breaker: Optional[CircuitBreaker] = None
+    _resilience_stats = {"retries": 0, "rateLimited": 0, "failures": 0}
+
+    # --- REQUEST COALESCING (payload identik yang sedang in-flight) ---
+    _flights = SingleFlight()
+
+    @classmethod
+    def _create_session(cls) -> aiohttp.ClientSession:
+        cls._connector = aiohttp.TCPConnector(
+            limit=settings.GEMINI_HTTP_POOL_LIMIT,
+            limit_per_host=settings.GEMINI_HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=settings.GEMINI_HTTP_DNS_TTL,
+            use_dns_cache=True,
+            keepalive_timeout=settings.GEMINI_HTTP_KEEPALIVE,
+        )
+        # total=None: respons streaming boleh berjalan lama selama tetap mengalir (sock_read)
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=settings.GEMINI_CONNECT_TIMEOUT,
+            sock_connect=settings.GEMINI_CONNECT_TIMEOUT,
+            sock_read=settings.GEMINI_READ_TIMEOUT,
+        )
+        return aiohttp.ClientSession(connector=cls._connector, timeout=timeout, headers=cls.HEADERS)
+
+    @staticmethod
+    def _request_timeout() -> aiohttp.ClientTimeout:
+        """Timeout request non-streaming: batas total agar respons yang menetes pelan tidak menahan request selamanya"""
+        return aiohttp.ClientTimeout(
+            total=settings.GEMINI_TOTAL_TIMEOUT,
+            connect=settings.GEMINI_CONNECT_TIMEOUT,
+            sock_connect=settings.GEMINI_CONNECT_TIMEOUT,
+            sock_read=settings.GEMINI_READ_TIMEOUT,
+        )
+
+    @classmethod
+    async def startup(cls):
+        if cls._session is None or cls._session.closed:
+            cls._session = cls._create_session()
+            logger.info("LLM HTTP client pool started")
+
+    @classmethod
+    async def shutdown(cls):
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+            # Beri waktu transport SSL menutup koneksi dengan bersih
+            await asyncio.sleep(0.25)
+            logger.info("LLM HTTP client pool closed")
+        cls._session = None
+        cls._connector = None
+        if cls._cache is not None:
+            cls._cache.close()
+
+    @classmethod
+    def _get_session(cls) -> aiohttp.ClientSession:
+        # Fallback untuk pemakaian di luar lifespan (script/command)
+        if cls._session is None or cls._session.closed:
+            cls._session = cls._create_session()
+        return cls._session
+
+    @classmethod
+    def _get_cache(cls) -> Optional[LLMResponseCache]:
+        if not settings.LLM_CACHE_ENABLED:
+            return None
+        if cls._cache is None:
+            cls._cache = LLMResponseCache(
+                settings.LLM_CACHE_PATH,
+                max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                default_ttl=settings.LLM_CACHE_TTL,
+            )
+        return cls._cache
+
+    @classmethod
+    def get_cache_stats(cls) -> Dict[str, Any]:
+        if not settings.LLM_CACHE_ENABLED:
+            return {"enabled": False}
+        cache = cls._get_cache()
+        return {"enabled": True, **cache.get_stats()}
+
+    @classmethod
+    def _get_guards(cls) -> Tuple[TokenBucket, asyncio.Semaphore, CircuitBreaker]:
+        if cls._limiter is None:
+            cls._limiter = TokenBucket(settings.LLM_RATE_LIMIT_PER_MINUTE, settings.LLM_RATE_BURST)
+            cls._semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+            cls._breaker = CircuitBreaker(settings.LLM_BREAKER_FAILURE_THRESHOLD, settings.LLM_BREAKER_RECOVERY_SECONDS)
+        return cls._limiter, cls._semaphore, cls._breaker
+
+    @classmethod
+    def get_resilience_stats(cls) -> Dict[str, Any]:
+        limiter, semaphore, breaker = cls._get_guards()
+        return {
+            "rateLimitPerMinute": settings.LLM_RATE_LIMIT_PER_MINUTE,
+            "tokensAvailable": limiter.available(),
+            "maxConcurrency": settings.LLM_MAX_CONCURRENCY,
+            "concurrencyAvailable": semaphore._value,
+            "breaker": breaker.get_stats(),
+            "coalescing": cls._flights.get_stats(),
+            **cls._resilience_stats,
+        }
+
+    @classmethod
+    def get_pool_stats(cls) -> Dict[str, Any]:
+        connector = cls._connector
+        active = idle = 0
+        if connector is not None and not connector.closed:
+            active = len(getattr(connector, "_acquired", ()))
+            idle = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+        limit = settings.GEMINI_HTTP_POOL_LIMIT
+        return {
+            "open": cls._session is not None and not cls._session.closed,
+            "limit": limit,
+            "limitPerHost": settings.GEMINI_HTTP_POOL_LIMIT_PER_HOST,
+            "activeConnections": active,
+            "idleConnections": idle,
+            "utilization": round(active / limit, 3) if limit else 0.0,
+            "inFlightRequests": cls._in_flight,
+            "totalRequests": cls._total_requests,
+        }
 
     @staticmethod
     def _clean_json_string(text: str) -> str:
@@ -17,42 +155,228 @@ class LLMService:
         text = re.sub(r'```\s*', '', text)
         return text.strip()
 
+    @staticmethod
+    async def _acquire_slot(breaker: CircuitBreaker, limiter: TokenBucket) -> bool:
+        """Breaker + token bucket; False berarti pakai fallback lokal tanpa memanggil Gemini"""
+        if not breaker.allow_request():
+            return False
+        if not await LLMService._acquire_token(limiter):
+            breaker.release_probe()
+            return False
+        return True
+
+    @staticmethod
+    async def _acquire_token(limiter: TokenBucket) -> bool:
+        """Satu token per request upstream (termasuk retry); False jika kuota client-side habis"""
+        if await limiter.acquire(settings.LLM_RATE_WAIT_TIMEOUT):
+            return True
+        LLMService._resilience_stats["rateLimited"] += 1
+        logger.warning("LLM client-side rate limit exceeded, using fallback")
+        return False
+
+    @staticmethod
+    async def _next_attempt(attempt: int, retry_after: Optional[float], limiter: TokenBucket, breaker: CircuitBreaker) -> bool:
+        """Backoff + token baru sebelum retry. False = menyerah (jatah retry/kuota habis), dicatat sebagai kegagalan"""
+        if not await LLMService._retry_wait(attempt, retry_after) or not await LLMService._acquire_token(limiter):
+            LLMService._record_failure(breaker)
+            return False
+        return True
+
+    @staticmethod
+    async def _retry_wait(attempt: int, retry_after: Optional[float] = None) -> bool:
+        """Tidur sebelum retry berikutnya; False jika jatah retry habis"""
+        if attempt >= settings.LLM_MAX_RETRIES:
+            return False
+        LLMService._resilience_stats["retries"] += 1
+        await asyncio.sleep(backoff_delay(attempt, settings.LLM_BACKOFF_BASE, settings.LLM_BACKOFF_MAX, retry_after))
+        return True
+
+    @staticmethod
+    def _record_failure(breaker: CircuitBreaker):
+        LLMService._resilience_stats["failures"] += 1
+        breaker.record_failure()
+
     @staticmethod
     async def _send_request(payload: dict) -> str:
+        """Request identik yang sedang berjalan berbagi satu panggilan upstream"""
+        key = LLMResponseCache.make_key(settings.GEMINI_MODEL_ID, json.dumps(payload, sort_keys=True, ensure_ascii=False))
+        return await LLMService._flights.do(key, lambda: LLMService._post_with_retry(payload))
+
+    @staticmethod
+    async def _post_with_retry(payload: dict) -> str:
         url = f"{settings.GEMINI_API_URL}?key={settings.GEMINI_API_KEY}"
+        limiter, semaphore, breaker = LLMService._get_guards()
+        if not await LLMService._acquire_slot(breaker, limiter):
+            return LLMService.FALLBACK_RESPONSE
+        # Request ini pemegang slot probe half_open? Dilepas jika berhenti tanpa hasil (cancel/timeout pemanggil)
+        probe = breaker.state == CircuitBreaker.HALF_OPEN
 
+        session = LLMService._get_session()
+        attempt = 0
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url, 
-                    json=payload, 
-                    headers=LLMService.HEADERS, 
-                    timeout=30
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Gemini API Error ({response.status}): {error_text}")
-                        if response.status == 429:
-                            raise AppError(status_code=429, detail="AI Traffic Limit Exceeded")
-                        raise AppError(status_code=502, detail="AI Service Provider Error")
-                    
-                    data = await response.json()
-                    try:
-                        return data["candidates"][0]["content"]["parts"][0]["text"]
-                    except (KeyError, IndexError):
-                        logger.error(f"Unexpected API Response format: {data}")
-                        return "{}"
-        except Exception as e:
-            logger.error(f"LLM Network Error: {e}")
-            if isinstance(e, AppError):
-                raise e
-            return "{}"
-    
-    @staticmethod
-    async def generate(prompt_text: str) -> str:
-        return await LLMService._send_request({
+            while True:
+                retry_after = None
+                try:
+                    async with semaphore:
+                        LLMService._in_flight += 1
+                        LLMService._total_requests += 1
+                        try:
+                            async with session.post(url, json=payload, timeout=LLMService._request_timeout()) as response:
+                                if response.status == 200:
+                                    data = await response.json()
+                                    breaker.record_success()
+                                    try:
+                                        return data["candidates"][0]["content"]["parts"][0]["text"]
+                                    except (KeyError, IndexError):
+                                        logger.error(f"Unexpected API Response format: {data}")
+                                        return LLMService.FALLBACK_RESPONSE
+
+                                error_text = await response.text()
+                                logger.error(f"Gemini API Error ({response.status}): {error_text}")
+                                if response.status not in LLMService.RETRYABLE_STATUSES:
+                                    # 4xx selain 429 = masalah request/konfigurasi, bukan provider down
+                                    breaker.record_success()
+                                    raise AppError(status_code=502, detail="AI Service Provider Error")
+                                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        finally:
+                            LLMService._in_flight -= 1
+                except AppError:
+                    raise
+                except Exception as e:
+                    logger.error(f"LLM Network Error: {e}")
+
+                # Sampai di sini = 429/5xx/network error
+                if not await LLMService._next_attempt(attempt, retry_after, limiter, breaker):
+                    return LLMService.FALLBACK_RESPONSE
+                attempt += 1
+        except BaseException:
+            if probe:
+                breaker.release_probe()
+            raise
+
+    @staticmethod
+    async def stream_generate(prompt_text: str) -> AsyncIterator[str]:
+        """
+        Streaming generateContent (SSE), yield potongan teks segera setelah diterima.
+        Saat Gemini tidak tersedia tidak ada yang di-yield; pemanggil memakai fallback lokal.
+        """
+        url = f"{settings.GEMINI_STREAM_URL}?alt=sse&key={settings.GEMINI_API_KEY}"
+        payload = {"contents": [{"parts": [{"text": prompt_text}]}]}
+        limiter, semaphore, breaker = LLMService._get_guards()
+        if not await LLMService._acquire_slot(breaker, limiter):
+            return
+        probe = breaker.state == CircuitBreaker.HALF_OPEN
+
+        session = LLMService._get_session()
+        attempt = 0
+        try:
+            while True:
+                retry_after = None
+                started = False
+                try:
+                    async with semaphore:
+                        LLMService._in_flight += 1
+                        LLMService._total_requests += 1
+                        try:
+                            async with session.post(url, json=payload) as response:
+                                if response.status != 200:
+                                    error_text = await response.text()
+                                    logger.error(f"Gemini Stream Error ({response.status}): {error_text}")
+                                    if response.status not in LLMService.RETRYABLE_STATUSES:
+                                        breaker.record_success()
+                                        raise AppError(status_code=502, detail="AI Service Provider Error")
+                                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                                else:
+                                    async for raw_line in response.content:
+                                        line = raw_line.decode("utf-8").strip()
+                                        if not line.startswith("data:"):
+                                            continue
+                                        try:
+                                            chunk = json.loads(line[5:])
+                                            parts = chunk["candidates"][0]["content"]["parts"]
+                                        except (ValueError, KeyError, IndexError):
+                                            continue
+                                        text = "".join(p.get("text", "") for p in parts)
+                                        if text:
+                                            started = True
+                                            yield text
+                                    breaker.record_success()
+                                    return
+                        finally:
+                            LLMService._in_flight -= 1
+                except AppError:
+                    raise
+                except Exception as e:
+                    logger.error(f"LLM Stream Network Error: {e}")
+                    if started:
+                        # Token sudah terkirim ke client, tidak bisa diulang dari awal
+                        LLMService._record_failure(breaker)
+                        return
+
+                if not await LLMService._next_attempt(attempt, retry_after, limiter, breaker):
+                    return
+                attempt += 1
+        except BaseException:
+            # Termasuk GeneratorExit/CancelledError saat client SSE putus di tengah probe
+            if probe:
+                breaker.release_probe()
+            raise
+
+    @staticmethod
+    async def stream_sections(prompt_text: str, delimiter: str) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Stream respons berformat '<teks untuk user>{delimiter}<metadata>'.
+        Yield ("token", teks) untuk bagian pertama, lalu satu ("tail", metadata) di akhir.
+        """
+        buffer = ""
+        tail = None
+        keep = len(delimiter) - 1
+        async for chunk in LLMService.stream_generate(prompt_text):
+            if tail is not None:
+                tail += chunk
+                continue
+            buffer += chunk
+            if delimiter in buffer:
+                head, tail = buffer.split(delimiter, 1)
+                if head:
+                    yield "token", head
+                buffer = ""
+            elif len(buffer) > keep:
+                # Tahan beberapa karakter terakhir, bisa jadi awal delimiter yang terpotong
+                emit, buffer = buffer[:len(buffer) - keep], buffer[len(buffer) - keep:]
+                yield "token", emit
+        if buffer:
+            yield "token", buffer
+        yield "tail", (tail or "").strip()
+
+    @staticmethod
+    def _is_cacheable(raw: str) -> bool:
+        """Hanya simpan respons JSON yang valid, bukan fallback/error"""
+        try:
+            parsed = json.loads(LLMService._clean_json_string(raw))
+        except (ValueError, TypeError):
+            return False
+        return isinstance(parsed, dict) and bool(parsed)
+
+    @staticmethod
+    async def generate(prompt_text: str, cache: bool = False) -> str:
+        response_cache = LLMService._get_cache() if cache else None
+        if response_cache is None:
+            return await LLMService._send_request({
+                "contents": [{"parts": [{"text": prompt_text}]}]
+            })
+
+        key = LLMResponseCache.make_key(settings.GEMINI_MODEL_ID, prompt_text)
+        cached = await response_cache.get(key)
+        if cached is not None:
+            return cached
+
+        raw = await LLMService._send_request({
             "contents": [{"parts": [{"text": prompt_text}]}]
         })
+        if LLMService._is_cacheable(raw):
+            await response_cache.set(key, raw)
+        return raw
 
     @staticmethod
     async def generate_with_history(history: List[Dict[str, str]], system_prompt: str) -> str:
@@ -76,18 +400,74 @@ class LLMService:
         Task: 1 sentence feedback, 1 probing follow-up question.
         Return JSON: {{ "feedback": "...", "followup_question": "..." }}
         """
-        raw = await LLMService.generate(prompt)
+        raw = await LLMService.generate(prompt, cache=True)
         try:
             return json.loads(LLMService._clean_json_string(raw))
         except:
             return {"feedback": "Thank you.", "followup_question": "Can you elaborate?"}
 
     @staticmethod
-    async def generate_interview_feedback(history: List[Dict[str, str]]) -> Dict[str, Any]:
-        history_text = "\n".join([f"{h['role'].upper()}: {h['content']}" for h in history])
+    def _validate_interview_evaluation(data: Any) -> Optional[Dict[str, Any]]:
+        """Skema wajib evaluate_interview_answer; None jika output model tidak sesuai"""
+        if not isinstance(data, dict) or not isinstance(data.get("is_relevant"), bool):
+            return None
+        result = {"is_relevant": data["is_relevant"], "reason": str(data.get("reason") or "")}
+        if not result["is_relevant"]:
+            return result
+        feedback, followup = data.get("feedback"), data.get("followup_question")
+        if not isinstance(feedback, str) or not isinstance(followup, str) or not feedback.strip() or not followup.strip():
+            return None
+        result.update(feedback=feedback.strip(), followup_question=followup.strip())
+        return result
+
+    @staticmethod
+    async def evaluate_interview_answer(question: str, answer: str) -> Optional[Dict[str, Any]]:
+        """
+        Relevansi + feedback + follow-up dalam satu round trip. None = output malformed, pakai alur lama.
+        Saat Gemini tidak tersedia (FALLBACK_RESPONSE) langsung kembalikan INTERVIEW_EVALUATION_FALLBACK.
+        """
+        prompt = f"""
+        SYSTEM ROLE: Technical Recruiter.
+        Context: Q: "{question}" A: "{answer}"
+        Task: Decide if the answer is logically relevant to the question.
+        If relevant, give 1 sentence feedback and 1 probing follow-up question.
+        If not relevant, explain why in "reason" and leave feedback/followup_question empty.
+        Return JSON: {{ "is_relevant": true/false, "reason": "...", "feedback": "...", "followup_question": "..." }}
+        """
+        raw = await LLMService.generate(prompt, cache=True)
+        if raw == LLMService.FALLBACK_RESPONSE:
+            return dict(LLMService.INTERVIEW_EVALUATION_FALLBACK)
+        try:
+            data = json.loads(LLMService._clean_json_string(raw))
+        except ValueError:
+            data = None
+        result = LLMService._validate_interview_evaluation(data)
+        if result is None:
+            logger.warning(f"Malformed interview evaluation output: {raw[:200]}")
+        return result
+
+    @staticmethod
+    async def summarize_conversation(previous_summary: str, turns: List[Dict[str, str]], max_tokens: int) -> str:
+        """Gabungkan ringkasan lama + giliran lama jadi satu ringkasan baru; string kosong jika gagal"""
+        turns_text = "\n".join([f"{t['role'].upper()}: {t['content']}" for t in turns])
+        prompt = f"""
+        Existing summary: "{previous_summary or '-'}"
+        New turns:
+        {turns_text}
+        Task: Update the summary so it covers the existing summary and the new turns.
+        Keep names, facts, topics and recurring grammar mistakes. Max {max_tokens * 3} characters.
+        Return plain text only.
+        """
+        raw = await LLMService.generate(prompt)
+        if raw == LLMService.FALLBACK_RESPONSE:
+            return ""
+        return raw.strip()
+
+    @staticmethod
+    async def generate_interview_feedback(transcript: str) -> Dict[str, Any]:
         prompt = f"""
         Analyze this interview transcript:
-        {history_text}
+        {transcript}
         
         Return JSON:
         {{
@@ -116,7 +496,7 @@ class LLMService:
         Is the answer logically relevant?
         Return JSON: {{ "is_relevant": true/false, "reason": "..." }}
         """
-        raw = await LLMService.generate(prompt)
+        raw = await LLMService.generate(prompt, cache=True)
         try:
             return json.loads(LLMService._clean_json_string(raw))
         except:
@@ -139,7 +519,7 @@ class LLMService:
             "improvement_tips": ["list"]
         }}
         """
-        raw = await LLMService.generate(prompt)
+        raw = await LLMService.generate(prompt, cache=True)
         try:
             return json.loads(LLMService._clean_json_string(raw))
         except:
@@ -0,0 +1,91 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+
+@dataclass
+class MaterialIndex:
+    """Id materi in-memory untuk pemilihan acak O(1); teks filter disimpan lowercase"""
+    words: List[Tuple[int, str]]
+    sentences_by_category: Dict[str, List[int]]
+    sentence_ids: List[int]
+    topic_ids: List[int]
+    loaded_at: float
+    _matches: Dict[Tuple[str, str], List[int]] = field(default_factory=dict)
+
+    def _match(self, kind: str, needle: str) -> List[int]:
+        # Setara ILIKE '%needle%'; hasil per fonem di-memo sampai index dimuat ulang
+        key = (kind, needle.lower())
+        if key not in self._matches:
+            if kind == "word":
+                self._matches[key] = [wid for wid, fonem in self.words if key[1] in fonem]
+            else:
+                self._matches[key] = [sid for cat, ids in self.sentences_by_category.items() if key[1] in cat.lower() for sid in ids]
+        return self._matches[key]
+
+    def random_word(self, phoneme: str) -> Optional[int]:
+        ids = self._match("word", phoneme)
+        return random.choice(ids) if ids else None
+
+    def random_sentence(self, phoneme: str) -> Optional[int]:
+        ids = self._match("sentence", phoneme)
+        return random.choice(ids) if ids else None
+
+    def random_topic(self) -> Optional[int]:
+        return random.choice(self.topic_ids) if self.topic_ids else None
+
+    def stratified_sentences(self, limit: int) -> List[int]:
+        """Satu kalimat acak per kategori, sisanya acak dari semua kalimat (tanpa duplikat)"""
+        picked = []
+        for ids in self.sentences_by_category.values():
+            if len(picked) >= limit: break
+            picked.append(random.choice(ids))
+        chosen = set(picked)
+        needed = min(limit, len(self.sentence_ids))
+        while len(picked) < needed:
+            sid = random.choice(self.sentence_ids)
+            if sid not in chosen:
+                chosen.add(sid)
+                picked.append(sid)
+        return picked
+
+class MaterialSampler:
+    """
+    Index in-process id materi (kata + fonem, kalimat per kategori, topik) untuk pengganti ORDER BY random().
+    Di-invalidate oleh jalur admin (create/update/delete kata & kalimat); TTL membatasi staleness di worker lain.
+    Id yang sudah terhapus di worker lain ditangani pemanggil dengan invalidate lalu ambil ulang.
+    """
+    _current: Optional[MaterialIndex] = None
+    _lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def _is_fresh(cls, index: Optional[MaterialIndex]) -> bool:
+        return index is not None and time.monotonic() - index.loaded_at < settings.MATERIAL_SAMPLER_TTL
+
+    @classmethod
+    async def get(cls, repo) -> MaterialIndex:
+        """Index terbaru; query DB (satu UNION ALL) hanya saat kosong, kadaluarsa, atau setelah invalidate"""
+        if cls._is_fresh(cls._current):
+            return cls._current
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        async with cls._lock:
+            if cls._is_fresh(cls._current):
+                return cls._current
+            words, sentences_by_category, sentence_ids, topic_ids = [], {}, [], []
+            for kind, id, text in await repo.get_sampling_rows():
+                if kind == "word":
+                    if text: words.append((id, text.lower()))
+                elif kind == "sentence":
+                    sentence_ids.append(id)
+                    if text: sentences_by_category.setdefault(text, []).append(id)
+                else:
+                    topic_ids.append(id)
+            cls._current = MaterialIndex(words, sentences_by_category, sentence_ids, topic_ids, time.monotonic())
+            return cls._current
+
+    @classmethod
+    def invalidate(cls):
+        cls._current = None
@@ -177,6 +177,30 @@ class MaterialService:
         except Exception as e:
             raise AppError(status_code=400, detail=f"Import failed: {str(e)}")
 
+    async def import_interview_questions_from_excel(self, file_content: bytes):
+        try:
+            df = pd.read_excel(io.BytesIO(file_content))
+            self._validate_columns(df, ['pertanyaan'])
+
+            questions, errors = [], []
+            for idx, row in df.iterrows():
+                try:
+                    question = str(row['pertanyaan']).strip()
+                    if not question or question.lower() == "nan":
+                        raise ValueError("Question is empty")
+                    if len(question) > 255:
+                        raise ValueError("Question must be at most 255 characters")
+                    questions.append(question)
+                except Exception as e:
+                    errors.append({"row": idx + 2, "error": str(e)})
+
+            # Satu commit (dan satu invalidasi snapshot) untuk seluruh file
+            if questions:
+                await self.repo.create_interview_questions_bulk(questions)
+            return {"successCount": len(questions), "errorCount": len(errors), "errors": errors}
+        except Exception as e:
+            raise AppError(status_code=400, detail=f"Import failed: {str(e)}")
+
     async def update_word(self, id: int, data: dict):
         word = await self.repo.get_word_by_id(id)
         if not word: raise NotFoundError("Word")
@@ -1,12 +1,18 @@
+import logging
 from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
 from app.repositories.material_repository import MaterialRepository
 from app.repositories.score_repository import ScoreRepository
 from app.services.audio_service import AudioService
 from app.services.llm_service import LLMService
+from app.services.analysis_worker import PhonemeAnalysisWorker, AnalysisJob
 from app.utils.phoneme_utils import PhonemeMatcher
+from app.utils.pipeline import StageTimer, run_concurrently
 from app.core.exceptions import NotFoundError
 from gruut import sentences as gruut_sentences
 
+logger = logging.getLogger(__name__)
+
 class PhonemeService:
     def __init__(self, material_repo: MaterialRepository, score_repo: ScoreRepository):
         self.material_repo = material_repo
@@ -24,60 +30,105 @@ class PhonemeService:
         except:
             return ""
 
-    async def process_pronunciation(self, talent_id: int, content_id: int, audio_bytes: bytes, type: str):
-        # 1. Ambil Target
+    async def _load_target(self, content_id: int, type: str) -> Tuple[str, str]:
         content = await self.material_repo.get_phoneme_content(content_id, type)
         if not content:
             raise NotFoundError(f"Material {type}")
-            
+
         target_text = content.kata if type == "word" else content.kalimat
         target_phonemes = content.fonem
-        
+
         # Robustness: Jika DB kosong, generate on-the-fly
         if not target_phonemes:
             target_phonemes = self._generate_phonemes_fallback(target_text)
-        
-        # 2. Transkripsi Audio
+        return target_text, target_phonemes
+
+    @staticmethod
+    async def _transcribe(audio_bytes: bytes) -> str:
         try:
-            user_phonemes = await AudioService.transcribe(audio_bytes)
+            return await AudioService.transcribe(audio_bytes)
         except Exception as e:
             # Fallback jika Audio Service error
             print(f"Audio Service Error: {e}")
-            user_phonemes = ""
-        
-        # 3. Scoring
-        alignment = PhonemeMatcher.align_phonemes(target_phonemes, user_phonemes)
-        accuracy = PhonemeMatcher.calculate_accuracy(alignment)
-        
-        # 4. AI Analysis (dengan Try-Except agar tidak memblokir flow utama)
+            return ""
+
+    @staticmethod
+    async def _analyze(target_phonemes: str, user_phonemes: str, target_text: str) -> Tuple[Dict[str, Any], str]:
         try:
-            ai_analysis = await LLMService.analyze_phoneme_quality(
-                target_phonemes, user_phonemes, target_text
-            )
+            ai_analysis = await LLMService.analyze_phoneme_quality(target_phonemes, user_phonemes, target_text)
+            return ai_analysis, PhonemeAnalysisWorker.STATUS_COMPLETED
         except Exception:
-            ai_analysis = {"error": "AI Analysis unavailable"}
-        
-        # 5. Result Object
+            return {"error": "AI Analysis unavailable"}, PhonemeAnalysisWorker.STATUS_FAILED
+
+    async def process_pronunciation(self, talent_id: int, content_id: int, audio_bytes: bytes, type: str,
+                                    deferred: bool = False, timer: Optional[StageTimer] = None):
+        """
+        Pipeline bertahap:
+        [material || transkripsi] -> alignment -> [simpan hasil (flush) || analisis AI] -> tempel analisis + commit.
+        Mode langsung: hasil dan analisis di-commit dalam satu transaksi, jadi tidak pernah tersimpan pending.
+        Mode deferred: simpan pending -> antrikan ke worker; gagal antri -> tandai failed.
+        Durasi tiap stage dicatat di `timer` (untuk header Server-Timing).
+        """
+        timer = timer or StageTimer()
+
+        # 1. Target & transkripsi audio tidak saling bergantung
+        (target_text, target_phonemes), user_phonemes = await run_concurrently(
+            timer.run("material", self._load_target(content_id, type)),
+            timer.run("transcribe", self._transcribe(audio_bytes)),
+        )
+
+        # 2. Scoring
+        with timer.measure("align"):
+            alignment = PhonemeMatcher.align_phonemes(target_phonemes, user_phonemes)
+            accuracy = PhonemeMatcher.calculate_accuracy(alignment)
+
+        # 3. Result Object
         result_full = {
             "similarity_percent": f"{accuracy}%",
             "accuracy_score": accuracy,
             "target_phonemes": target_phonemes,
             "user_phonemes": user_phonemes,
             "phoneme_comparison": alignment,
-            "gemini_analysis": ai_analysis
+            "gemini_analysis": None,
+            "analysis_status": PhonemeAnalysisWorker.STATUS_PENDING
         }
-
-        # 6. Save DB
         db_type = "Word" if type.lower() == "word" else "Sentence"
-        await self.score_repo.save_phoneme_result(
-            talent_id=talent_id,
-            soal_id=content_id,
-            type=db_type,
-            score=accuracy,
-            comparison=result_full
-        )
-        
-        return result_full
+
+        # 4a. Mode langsung: insert (flush, belum commit) bersamaan dengan analisis AI,
+        # lalu analisis ditempel ke row yang sama dan di-commit sekali
+        if not deferred:
+            saved, (ai_analysis, analysis_status) = await run_concurrently(
+                timer.run("persist", self.score_repo.stage_phoneme_result(talent_id, content_id, db_type, accuracy, result_full)),
+                timer.run("analysis", self._analyze(target_phonemes, user_phonemes, target_text)),
+            )
+            await timer.run("attach", self.score_repo.attach_phoneme_analysis(saved.idhasilfonem, ai_analysis, analysis_status))
+            return {**result_full, "gemini_analysis": ai_analysis, "analysis_status": analysis_status, "analysis_id": saved.idhasilfonem}
+
+        # 4b. Mode deferred: simpan pending, analisis dikerjakan worker
+        saved = await timer.run("persist", self.score_repo.save_phoneme_result(
+            talent_id=talent_id, soal_id=content_id, type=db_type, score=accuracy, comparison=result_full
+        ))
+        try:
+            if PhonemeAnalysisWorker.submit(AnalysisJob(saved.idhasilfonem, target_phonemes, user_phonemes, target_text)):
+                return {**result_full, "analysis_id": saved.idhasilfonem}
+        except Exception as e:
+            logger.warning(f"Phoneme analysis job {saved.idhasilfonem} not queued: {e}")
+
+        # 5. Tidak bisa diantrikan: tandai failed agar row tidak tertahan di pending
+        ai_analysis, analysis_status = {"error": "AI Analysis unavailable"}, PhonemeAnalysisWorker.STATUS_FAILED
+        await timer.run("attach", self.score_repo.attach_phoneme_analysis(saved.idhasilfonem, ai_analysis, analysis_status))
+        return {**result_full, "gemini_analysis": ai_analysis, "analysis_status": analysis_status, "analysis_id": saved.idhasilfonem}
+
+    async def get_analysis(self, analysis_id: int):
+        """Status & hasil analisis AI untuk satu attempt (polling deferred mode)"""
+        result = await self.score_repo.get_phoneme_result(analysis_id)
+        if not result: raise NotFoundError("Analysis")
+        comparison = result.phoneme_comparison or {}
+        return {
+            "analysis_id": result.idhasilfonem,
+            "status": comparison.get("analysis_status", PhonemeAnalysisWorker.STATUS_COMPLETED),
+            "gemini_analysis": comparison.get("gemini_analysis")
+        }
 
     async def get_word_by_id(self, id: int):
         word = await self.material_repo.get_word_by_id(id)
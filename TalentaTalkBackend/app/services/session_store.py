@@ -0,0 +1,181 @@
+import json
+import logging
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+import pytz
+from sqlalchemy import update, delete, select
+from sqlalchemy.dialects.postgresql import insert
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.exceptions import AppError
+from app.models.models import Appsession
+
+logger = logging.getLogger(__name__)
+
+class SessionConflictError(AppError):
+    def __init__(self, detail: str = "Session was modified by another request. Please retry."):
+        super().__init__(status_code=409, detail=detail)
+
+@dataclass
+class StoredSession:
+    data: Dict[str, Any]
+    version: int
+
+class SessionStore:
+    """
+    Kontrak penyimpanan session (interview, percakapan).
+    save() memakai optimistic concurrency: expected_version harus sama dengan versi tersimpan
+    (None = session baru), jika tidak raise SessionConflictError.
+    """
+    name = "base"
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "conflicts": 0, "bytesWritten": 0}
+
+    @staticmethod
+    def encode(data: Dict[str, Any]) -> bytes:
+        return zlib.compress(json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+    @staticmethod
+    def decode(blob: bytes) -> Dict[str, Any]:
+        return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    async def get(self, namespace: str, key: str) -> Optional[StoredSession]:
+        raise NotImplementedError
+
+    async def save(self, namespace: str, key: str, data: Dict[str, Any], expected_version: Optional[int]) -> int:
+        raise NotImplementedError
+
+    async def delete(self, namespace: str, key: str):
+        raise NotImplementedError
+
+    def _conflict(self, namespace: str, key: str):
+        self._stats["conflicts"] += 1
+        logger.warning(f"Session conflict on {namespace}/{key}")
+        raise SessionConflictError()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "ttlSeconds": self.ttl, **self._stats}
+
+class MemorySessionStore(SessionStore):
+    """LRU + TTL in-process. Hanya aman untuk deployment satu worker."""
+    name = "memory"
+
+    def __init__(self, ttl: int, max_entries: int):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[bytes, int, float]]" = OrderedDict()
+
+    def _live_entry(self, ident: Tuple[str, str]) -> Optional[Tuple[bytes, int, float]]:
+        entry = self._entries.get(ident)
+        if entry is not None and entry[2] < time.monotonic():
+            del self._entries[ident]
+            return None
+        return entry
+
+    async def get(self, namespace: str, key: str) -> Optional[StoredSession]:
+        entry = self._live_entry((namespace, key))
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end((namespace, key))
+        self._stats["hits"] += 1
+        return StoredSession(self.decode(entry[0]), entry[1])
+
+    async def save(self, namespace: str, key: str, data: Dict[str, Any], expected_version: Optional[int]) -> int:
+        ident = (namespace, key)
+        entry = self._live_entry(ident)
+        current = entry[1] if entry else None
+        if current != expected_version:
+            self._conflict(namespace, key)
+
+        blob = self.encode(data)
+        version = (current or 0) + 1
+        self._entries[ident] = (blob, version, time.monotonic() + self.ttl)
+        self._entries.move_to_end(ident)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._stats["writes"] += 1
+        self._stats["bytesWritten"] += len(blob)
+        return version
+
+    async def delete(self, namespace: str, key: str):
+        self._entries.pop((namespace, key), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**super().get_stats(), "entries": len(self._entries), "maxEntries": self.max_entries}
+
+class PostgresSessionStore(SessionStore):
+    """Tabel appsession, dibagi semua worker. Transaksi sendiri, lepas dari session request."""
+    name = "postgres"
+    PURGE_EVERY_WRITES = 200
+
+    def _expires_at(self) -> datetime:
+        return datetime.now(pytz.utc) + timedelta(seconds=self.ttl)
+
+    async def get(self, namespace: str, key: str) -> Optional[StoredSession]:
+        query = select(Appsession.data, Appsession.version).where(
+            Appsession.namespace == namespace,
+            Appsession.key == key,
+            Appsession.expires_at > datetime.now(pytz.utc)
+        )
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(query)).first()
+        if row is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        return StoredSession(self.decode(row.data), row.version)
+
+    async def save(self, namespace: str, key: str, data: Dict[str, Any], expected_version: Optional[int]) -> int:
+        blob = self.encode(data)
+        expires_at = self._expires_at()
+        if expected_version is None:
+            # Session baru; baris kadaluarsa dengan key sama boleh ditimpa
+            stmt = insert(Appsession).values(namespace=namespace, key=key, data=blob, version=1, expires_at=expires_at)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["namespace", "key"],
+                set_={"data": stmt.excluded.data, "version": 1, "expires_at": stmt.excluded.expires_at},
+                where=Appsession.expires_at <= datetime.now(pytz.utc)
+            ).returning(Appsession.version)
+        else:
+            stmt = (
+                update(Appsession)
+                .where(Appsession.namespace == namespace, Appsession.key == key, Appsession.version == expected_version)
+                .values(data=blob, version=Appsession.version + 1, expires_at=expires_at)
+                .returning(Appsession.version)
+            )
+
+        async with AsyncSessionLocal() as db:
+            version = (await db.execute(stmt)).scalar_one_or_none()
+            if version is None:
+                await db.rollback()
+                self._conflict(namespace, key)
+            self._stats["writes"] += 1
+            self._stats["bytesWritten"] += len(blob)
+            if self._stats["writes"] % self.PURGE_EVERY_WRITES == 0:
+                await db.execute(delete(Appsession).where(Appsession.expires_at <= datetime.now(pytz.utc)))
+            await db.commit()
+        return version
+
+    async def delete(self, namespace: str, key: str):
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Appsession).where(Appsession.namespace == namespace, Appsession.key == key))
+            await db.commit()
+
+_store: Optional[SessionStore] = None
+
+def get_session_store() -> SessionStore:
+    """Backend dipilih lewat SESSION_STORE_BACKEND (memory | postgres)"""
+    global _store
+    if _store is None:
+        if settings.SESSION_STORE_BACKEND == "postgres":
+            _store = PostgresSessionStore(settings.SESSION_TTL_SECONDS)
+        else:
+            _store = MemorySessionStore(settings.SESSION_TTL_SECONDS, settings.SESSION_MAX_ENTRIES)
+    return _store
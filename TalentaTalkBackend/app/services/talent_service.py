@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.talent_repository import TalentRepository
+from app.repositories.phoneme_confusion_repository import PhonemeConfusionRepository
 from app.schemas.talent import TalentUpdate
 from app.schemas.auth import TalentCreate
 from app.core.exceptions import NotFoundError, AppError, DuplicateError
@@ -13,13 +14,16 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 class TalentService:
     def __init__(self, db: AsyncSession):
         self.repo = TalentRepository(db)
+        self.confusion_repo = PhonemeConfusionRepository(db)
 
-    async def get_talents_list(self, page: int, limit: int, search: str):
+    async def get_talents_list(self, page: int, limit: int, search: str, cursor: str = None, include_total: bool = True):
         skip = (page - 1) * limit
-        talents, total = await self.repo.get_talents_paginated(skip, limit, search)
+        result = await self.repo.get_talents_paginated(skip, limit, search, cursor, include_total)
+        talents = result.rows
+        all_stats = await self.repo.get_talents_progress_stats([t.idtalent for t in talents])
         results = []
         for t in talents:
-            stats = await self.repo.get_talent_progress_stats(t.idtalent)
+            stats = all_stats[t.idtalent]
             latest = stats['latest_exam'] if stats['latest_exam'] is not None else 0
             highest = stats['highest_exam'] if stats['highest_exam'] is not None else 0
             results.append({
@@ -27,7 +31,7 @@ class TalentService:
                 "pretest": f"{t.pretest_score:.0f}%" if t.pretest_score is not None else "N/A",
                 "highestExam": f"{highest:.0f}%", "progress": f"{stats['progress']:.0f}%"
             })
-        return {"data": results, "total": total, "page": page, "size": limit}
+        return {"data": results, "total": result.total, "page": page, "size": limit, "nextCursor": result.next_cursor}
 
     async def get_talent_detail(self, talent_id: int):
         talent = await self.repo.get_by_id(talent_id)
@@ -42,6 +46,10 @@ class TalentService:
             "progress": f"{stats['progress']:.0f}%"
         }
         
+    async def get_weakest_phonemes(self, talent_id: int, limit: int = 5):
+        items = await self.confusion_repo.get_weakest_phonemes(talent_id, limit=limit)
+        return {"talentId": f"TLT{talent_id:03d}", "weakestPhonemes": items}
+        
     async def create_talent(self, data: TalentCreate):
         # 1. Cek Email Duplikat
         existing = await self.repo.get_by_email(data.email)
@@ -100,27 +108,27 @@ class TalentService:
         except Exception as e:
             raise AppError(status_code=400, detail=f"Import failed: {str(e)}")
 
-    async def get_phoneme_progress(self, talent_id: int, type_latihan: str, page: int, limit: int):
+    async def get_phoneme_progress(self, talent_id: int, type_latihan: str, page: int, limit: int, cursor: str = None, include_total: bool = True):
         skip = (page - 1) * limit
-        items, total = await self.repo.get_phoneme_history_paginated(talent_id, type_latihan, skip, limit)
+        result = await self.repo.get_phoneme_history_paginated(talent_id, type_latihan, skip, limit, cursor, include_total)
         data = []
-        for item in items:
+        for item in result.rows:
             data.append({
                 "phonemeCategory": item["category"], "content": item["content"],
                 "score": f"{item['score']:.0f}%", "date": TimeUtils.format_to_wib(item["date"])
             })
-        return {"data": data, "total": total, "page": page}
+        return {"data": data, "total": result.total, "page": page, "nextCursor": result.next_cursor}
 
-    async def get_exam_progress(self, talent_id: int, page: int, limit: int):
+    async def get_exam_progress(self, talent_id: int, page: int, limit: int, cursor: str = None, include_total: bool = True):
         skip = (page - 1) * limit
-        exams, total = await self.repo.get_exam_history_paginated(talent_id, skip, limit)
+        result = await self.repo.get_exam_history_paginated(talent_id, skip, limit, cursor, include_total)
         data = []
-        for ex in exams:
+        for ex in result.rows:
             data.append({
                 "examId": ex.idujian, "phonemeCategory": ex.kategori,
                 "score": f"{ex.nilai or 0:.0f}%", "date": TimeUtils.format_to_wib(ex.waktuujian)
             })
-        return {"data": data, "total": total, "page": page}
+        return {"data": data, "total": result.total, "page": page, "nextCursor": result.next_cursor}
 
     async def get_exam_attempt_detail(self, talent_id: int, attempt_id: int):
         exam, details = await self.repo.get_exam_attempt_detail(talent_id, attempt_id)
@@ -135,29 +143,35 @@ class TalentService:
             "sentences": sentences_data
         }
 
-    async def get_conversation_progress(self, talent_id: int, page: int, limit: int):
+    async def get_conversation_progress(self, talent_id: int, page: int, limit: int, cursor: str = None, include_total: bool = True):
         skip = (page - 1) * limit
-        items, total = await self.repo.get_conversation_history_paginated(talent_id, skip, limit)
+        result = await self.repo.get_conversation_history_paginated(talent_id, skip, limit, cursor, include_total)
         data = []
-        for row in items:
-            res, topic = row
+        for row in result.rows:
+            res, topic = row.Hasillatihanpercakapan, row.topic
             data.append({
                 "topic": topic or "General", "wpm": f"{res.wpm or 0:.0f}",
                 "grammarIssue": res.grammar or "No issues", "date": TimeUtils.format_to_wib(res.waktulatihan)
             })
-        return {"data": data, "total": total, "page": page}
+        return {"data": data, "total": result.total, "page": page, "nextCursor": result.next_cursor}
 
-    async def get_interview_progress(self, talent_id: int, page: int, limit: int):
+    async def get_interview_progress(self, talent_id: int, page: int, limit: int, cursor: str = None, include_total: bool = True):
         skip = (page - 1) * limit
-        items, total = await self.repo.get_interview_history_paginated(talent_id, skip, limit)
+        result = await self.repo.get_interview_history_paginated(talent_id, skip, limit, cursor, include_total)
+        items = result.rows
+        # Nomor attempt = posisi dari attempt pertama; mode cursor/tanpa total tidak tahu skip, jadi dihitung dari baris teratas
+        if items and (cursor or result.total is None):
+            first_no = await self.repo.count_interviews_until(talent_id, items[0])
+        else:
+            first_no = (result.total or 0) - skip
         data = []
         for idx, item in enumerate(items):
-            attempt_no = total - skip - idx
+            attempt_no = first_no - idx
             data.append({
                 "attempt": attempt_no, "attemptId": item.idhasilinterview, "wordProducePerMinute": f"{item.wpm or 0:.0f}",
                 "feedback": item.feedback[:50] + "..." if item.feedback else "No feedback", "date": TimeUtils.format_to_wib(item.waktulatihan)
             })
-        return {"data": data, "total": total, "page": page}
+        return {"data": data, "total": result.total, "page": page, "nextCursor": result.next_cursor}
 
     async def get_interview_detail(self, talent_id: int, attempt_id: int):
         interview = await self.repo.get_interview_detail(talent_id, attempt_id)
@@ -0,0 +1,96 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+from sqlalchemy import select, func, tuple_, literal, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.exceptions import AppError
+
+class InvalidCursorError(AppError):
+    def __init__(self):
+        super().__init__(status_code=400, detail="Invalid pagination cursor")
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Token opaque (base64url JSON) dari nilai kunci urut baris terakhir"""
+    payload = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_cursor(token: str, size: int) -> List[Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        values = [datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v for v in payload]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise InvalidCursorError()
+    if len(values) != size:
+        raise InvalidCursorError()
+    return values
+
+def _nullable(key) -> bool:
+    return getattr(getattr(key, "expression", key), "nullable", True)
+
+def keyset_after(keys: Sequence[Any], values: Sequence[Any], descending: bool = True):
+    """
+    Predikat "baris sesudah `values`" untuk urutan `keys` (DESC NULLS FIRST / ASC NULLS LAST, yaitu NULL dianggap
+    nilai terbesar, sama dengan urutan index btree). Kolom nullable (mis. waktulatihan) dan nilai cursor NULL
+    ditangani eksplisit; perbandingan tuple biasa memberi NULL untuk baris tersebut sehingga baris hilang.
+    """
+    if not any(v is None for v in values) and (descending or not any(_nullable(k) for k in keys)):
+        # Jalur umum: baris NULL terletak sebelum bound (DESC), jadi perbandingan tuple sudah tepat
+        bound = tuple_(*[literal(v, type_=k.type) for k, v in zip(keys, values)])
+        return tuple_(*keys) < bound if descending else tuple_(*keys) > bound
+    clauses, equal = [], []
+    for k, v in zip(keys, values):
+        if v is None and not descending:
+            # ASC NULLS LAST: tidak ada nilai sesudah NULL di kolom ini
+            equal.append(k.is_(None))
+            continue
+        if v is None:
+            beyond = k.isnot(None)
+        elif descending:
+            beyond = k < literal(v, type_=k.type)
+        else:
+            beyond = or_(k > literal(v, type_=k.type), k.is_(None)) if _nullable(k) else k > literal(v, type_=k.type)
+        clauses.append(and_(*equal, beyond))
+        equal.append(k.is_(None) if v is None else k == literal(v, type_=k.type))
+    return or_(*clauses)
+
+@dataclass
+class Page:
+    rows: List[Any] = field(default_factory=list)
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+async def fetch_page(db: AsyncSession, query, keys: Sequence[Any], limit: int, skip: int = 0,
+                     cursor: Optional[str] = None, with_total: bool = True, descending: bool = True) -> Page:
+    """
+    Paginasi keyset dengan fallback offset.
+    `keys` = kolom urut unik (mis. waktulatihan, id); kolom nullable diurutkan NULL di depan (DESC) / di belakang (ASC)
+    dan NULL ikut ter-encode di cursor. Dengan `cursor`, offset diabaikan dan halaman dibaca lewat keyset_after
+    (index range scan, biaya sama di kedalaman berapa pun).
+    nextCursor selalu diisi jika masih ada halaman berikutnya, jadi klien bisa mulai dari page=1.
+    """
+    page_query = query.add_columns(*[k.label(f"_cursor_{i}") for i, k in enumerate(keys)])
+    page_query = page_query.order_by(*[k.desc().nulls_first() if descending else k.asc().nulls_last() for k in keys])
+    window_total = with_total and not cursor
+    if cursor:
+        page_query = page_query.where(keyset_after(keys, decode_cursor(cursor, len(keys)), descending))
+    else:
+        page_query = page_query.offset(skip)
+    if window_total:
+        # Mode offset: total ikut dari window count di query yang sama
+        page_query = page_query.add_columns(func.count().over().label("_total"))
+
+    rows = (await db.execute(page_query.limit(limit + 1))).all()
+    page = Page(rows=rows[:limit])
+    if len(rows) > limit:
+        last = page.rows[-1]
+        page.next_cursor = encode_cursor([getattr(last, f"_cursor_{i}") for i in range(len(keys))])
+    if window_total and rows:
+        page.total = rows[0]._total
+    elif with_total:
+        # Mode cursor, atau halaman offset di luar jangkauan
+        page.total = await db.scalar(select(func.count()).select_from(query.subquery())) or 0
+    return page
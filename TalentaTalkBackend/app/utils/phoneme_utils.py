@@ -1,4 +1,5 @@
 from difflib import SequenceMatcher
+from collections import Counter
 from typing import List, Dict, Tuple
 from app.core.config import settings
 
@@ -98,4 +99,20 @@ class PhonemeMatcher:
             if status == "correct": total_score += 100
             elif status == "similar": total_score += 75
             valid_items += 1
-        return round(total_score / valid_items, 1) if valid_items > 0 else 0.0
\ No newline at end of file
+        return round(total_score / valid_items, 1) if valid_items > 0 else 0.0
+
+    @staticmethod
+    def count_confusions(alignment: List[Dict]) -> Dict[Tuple[str, str, str], int]:
+        """
+        Ringkas hasil alignment menjadi hitungan (target, realised, status).
+        Fonem 'extra' disimpan dengan target kosong, 'missing' dengan realised kosong.
+        """
+        counts = Counter()
+        for item in alignment or []:
+            status = item.get("status")
+            if not status:
+                continue
+            target = (item.get("target") or "")[:16]
+            realised = (item.get("user") or "")[:16]
+            counts[(target, realised, status)] += 1
+        return dict(counts)
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Dict, List
+from starlette.requests import Request
+from app.core.exceptions import ClientDisconnectedError
+
+class StageTimer:
+    """Catat durasi tiap stage pipeline (ms), diekspos lewat header Server-Timing"""
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    async def run(self, name: str, awaitable: Awaitable[Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.durations[name] = (time.perf_counter() - start) * 1000
+
+    @contextmanager
+    def measure(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = (time.perf_counter() - start) * 1000
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(ms, 1) for name, ms in self.durations.items()}
+
+    def server_timing(self) -> str:
+        total = (time.perf_counter() - self._started) * 1000
+        parts = [f"{name};dur={ms:.1f}" for name, ms in self.durations.items()]
+        parts.append(f"total;dur={total:.1f}")
+        return ", ".join(parts)
+
+async def run_concurrently(*awaitables: Awaitable[Any]) -> List[Any]:
+    """
+    Seperti asyncio.gather, tapi stage lain dibatalkan begitu satu stage gagal
+    (mis. material tidak ditemukan -> transkripsi tidak perlu ditunggu).
+    """
+    tasks = [asyncio.ensure_future(a) for a in awaitables]
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        failed = next((t for t in tasks if t.done() and not t.cancelled() and t.exception() is not None), None)
+        if failed is not None:
+            raise failed.exception()
+        return [t.result() for t in tasks]
+    finally:
+        pending = [t for t in tasks if not t.done()]
+        for t in pending:
+            t.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[Any], poll_interval: float = 0.25) -> Any:
+    """Jalankan awaitable, batalkan bila client memutus koneksi sebelum selesai"""
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise ClientDisconnectedError()
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,48 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Gabungkan pemanggilan async identik yang sedang berjalan: caller dengan key sama
+    menunggu satu task bersama. Hasil maupun exception diteruskan ke semua waiter.
+    Task upstream hanya dibatalkan jika semua waiter-nya sudah batal.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._stats = {"leaders": 0, "coalesced": 0, "abandoned": 0}
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _t, k=key, f=flight: self._forget(k, f))
+            self._stats["leaders"] += 1
+        else:
+            self._stats["coalesced"] += 1
+
+        flight.waiters += 1
+        try:
+            # shield: batalnya satu waiter tidak ikut membatalkan task milik waiter lain
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                self._stats["abandoned"] += 1
+                flight.task.cancel()
+                self._forget(key, flight)
+
+    def _forget(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "inFlight": len(self._flights)}
@@ -0,0 +1,29 @@
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from app.core.exceptions import AppError
+
+logger = logging.getLogger(__name__)
+
+SSE_MEDIA_TYPE = "text/event-stream"
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """Format satu frame Server-Sent Events (data di-encode JSON)"""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {payload}\n\n"
+
+def sse_comment(text: str = "keep-alive") -> str:
+    return f": {text}\n\n"
+
+async def sse_from_events(events: AsyncIterator[Tuple[str, Dict[str, Any]]]) -> AsyncIterator[str]:
+    """Ubah stream (event, data) dari service jadi frame SSE; error setelah header terkirim jadi event 'error'"""
+    try:
+        async for event, data in events:
+            yield format_sse(data, event=event)
+    except AppError as e:
+        yield format_sse({"status_code": e.status_code, "detail": e.detail}, event="error")
+    except Exception as e:
+        logger.error(f"SSE stream error: {e}")
+        yield format_sse({"status_code": 500, "detail": "Stream interrupted"}, event="error")
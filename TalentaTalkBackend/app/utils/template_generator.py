@@ -73,6 +73,20 @@ class TemplateGenerator:
         ]
         return TemplateGenerator._create_excel_buffer(data, columns, instructions)
 
+    @staticmethod
+    def get_interview_question_template() -> io.BytesIO:
+        columns = ["pertanyaan"]
+        data = [
+            ['Tell me about yourself.'],
+            ['Describe a challenging project you worked on.']
+        ]
+        instructions = [
+            "1. Satu baris = satu pertanyaan interview",
+            "2. Maksimal 255 karakter",
+            "3. Pertanyaan baru otomatis aktif"
+        ]
+        return TemplateGenerator._create_excel_buffer(data, columns, instructions)
+
     @staticmethod
     def get_talent_template() -> io.BytesIO:
         columns = ["nama", "email", "role", "password"]
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
 import pytz
 from typing import Optional, List
 
@@ -15,6 +15,16 @@ class TimeUtils:
         if dt.tzinfo is None: dt = pytz.utc.localize(dt)
         return dt.astimezone(TimeUtils.WIB_TZ).strftime("%d/%m/%Y %H:%M:%S")
 
+    @staticmethod
+    def to_wib_date(dt: datetime) -> date:
+        """Tanggal kalender WIB; datetime naive dianggap UTC"""
+        if dt.tzinfo is None: dt = pytz.utc.localize(dt)
+        return dt.astimezone(TimeUtils.WIB_TZ).date()
+
+    @staticmethod
+    def today_wib() -> date:
+        return datetime.now(TimeUtils.WIB_TZ).date()
+
     @staticmethod
     def calculate_streaks(dates: List[datetime]) -> tuple[int, int]:
         """
@@ -0,0 +1,232 @@
+"""
+Stub server lokal yang meniru Gemini generateContent / streamGenerateContent untuk load test & benchmark offline.
+
+Jalankan dari folder TalentaTalkBackend:
+
+    python -m benchmarks.gemini_stub --port 8090 --latency lognormal:600,0.4 --error-rate 0.02 --rate-limit-rate 0.05
+
+Lalu arahkan backend ke stub:
+
+    GEMINI_API_BASE_URL=http://127.0.0.1:8090/v1beta uvicorn app.main:app
+
+Latency (milidetik): fixed:MS | uniform:MIN,MAX | normal:MEAN,STDDEV | lognormal:MEDIAN,SIGMA
+Payload canned per jenis prompt bisa di-override dengan --payloads file.json ({"relevance": {...}, ...}).
+Statistik request: GET /stats
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+# Jenis prompt -> (penanda yang harus ada di prompt). Urutan penting: yang paling spesifik di atas.
+PROMPT_TYPES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("phoneme_analysis", ("Phonetic Analysis",)),
+    ("interview_evaluation", ("logically relevant", "followup_question")),
+    ("relevance", ("logically relevant",)),
+    ("interview_followup_stream", ("Technical Recruiter", "###FEEDBACK###")),
+    ("interview_followup", ("Technical Recruiter",)),
+    ("interview_feedback", ("Analyze this interview transcript",)),
+    ("conversation_stream", ("Professional Conversation", "###GRAMMAR###")),
+    ("conversation", ("Professional Conversation",)),
+]
+
+CANNED_PAYLOADS: Dict[str, Any] = {
+    "phoneme_analysis": {
+        "native_understandable": True,
+        "overall_feedback": "Clear pronunciation overall with minor vowel length issues.",
+        "specific_issues": [{"phoneme": "iː", "issue": "Vowel too short", "suggestion": "Hold the vowel slightly longer."}],
+        "strengths": ["Consonant clusters", "Word stress"],
+        "improvement_tips": ["Practise minimal pairs such as ship/sheep."],
+    },
+    "relevance": {"is_relevant": True, "reason": "The answer addresses the question."},
+    "interview_evaluation": {
+        "is_relevant": True,
+        "reason": "The answer addresses the question.",
+        "feedback": "Good structure, add a concrete example.",
+        "followup_question": "Can you describe a specific situation where you applied that?",
+    },
+    "interview_followup": {
+        "feedback": "Good structure, add a concrete example.",
+        "followup_question": "Can you describe a specific situation where you applied that?",
+    },
+    "interview_followup_stream": (
+        "Can you describe a specific situation where you applied that?\n"
+        "###FEEDBACK###\n"
+        "Good structure, add a concrete example."
+    ),
+    "interview_feedback": {
+        "summary": {
+            "strengths": ["Clear communication", "Relevant examples"],
+            "weaknesses": ["Answers could be more concise"],
+            "overall_performance": {
+                "technical_knowledge": "Good",
+                "communication_speed": "Avg",
+                "grammar_usage": "Good",
+                "recommendation": "Hire",
+            },
+        }
+    },
+    "conversation": {
+        "grammar_check": "Your grammar is correct.",
+        "response": "That's an interesting point. How do you see it affecting your daily work?",
+    },
+    "conversation_stream": (
+        "That's an interesting point. How do you see it affecting your daily work?\n"
+        "###GRAMMAR###\n"
+        "Your grammar is correct."
+    ),
+    "default": "OK",
+}
+
+def parse_latency(spec: str, rng: random.Random) -> Callable[[], float]:
+    """Bangun sampler latency (detik) dari spesifikasi CLI dalam milidetik"""
+    kind, _, raw = spec.partition(":")
+    params = [float(x) for x in raw.split(",") if x] if raw else []
+    if kind == "fixed":
+        value = params[0] if params else 0.0
+        return lambda: value / 1000
+    if kind == "uniform":
+        low, high = params
+        return lambda: rng.uniform(low, high) / 1000
+    if kind == "normal":
+        mean, stddev = params
+        return lambda: max(0.0, rng.gauss(mean, stddev)) / 1000
+    if kind == "lognormal":
+        median, sigma = params
+        return lambda: rng.lognormvariate(math.log(median), sigma) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+def classify_prompt(prompt: str) -> str:
+    for name, markers in PROMPT_TYPES:
+        if all(m in prompt for m in markers):
+            return name
+    return "default"
+
+def extract_prompt(body: Dict[str, Any]) -> str:
+    texts = []
+    for content in body.get("contents", []):
+        for part in content.get("parts", []):
+            texts.append(part.get("text", ""))
+    return "\n".join(texts)
+
+def gemini_response(text: str, finish: bool = True) -> Dict[str, Any]:
+    candidate: Dict[str, Any] = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if finish:
+        candidate["finishReason"] = "STOP"
+    return {
+        "candidates": [candidate],
+        "usageMetadata": {"promptTokenCount": 0, "candidatesTokenCount": len(text) // 4, "totalTokenCount": len(text) // 4},
+        "modelVersion": "stub",
+    }
+
+def gemini_error(status: int, message: str) -> web.Response:
+    reason = {429: "RESOURCE_EXHAUSTED", 503: "UNAVAILABLE"}.get(status, "INTERNAL")
+    headers = {"Retry-After": "1"} if status == 429 else None
+    return web.json_response({"error": {"code": status, "message": message, "status": reason}}, status=status, headers=headers)
+
+class GeminiStub:
+    def __init__(self, latency: Callable[[], float], error_rate: float, rate_limit_rate: float,
+                 chunk_size: int, chunk_delay: float, payloads: Dict[str, Any], rng: random.Random):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.payloads = payloads
+        self.rng = rng
+        self.stats: Counter = Counter()
+
+    def _payload_text(self, prompt_type: str) -> str:
+        payload = self.payloads.get(prompt_type, self.payloads["default"])
+        return payload if isinstance(payload, str) else json.dumps(payload)
+
+    def _injected_failure(self) -> Optional[web.Response]:
+        roll = self.rng.random()
+        if roll < self.rate_limit_rate:
+            self.stats["429"] += 1
+            return gemini_error(429, "Resource has been exhausted (stub).")
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.stats["5xx"] += 1
+            return gemini_error(self.rng.choice([500, 503]), "Injected failure (stub).")
+        return None
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        model, _, action = request.match_info["target"].partition(":")
+        if action not in ("generateContent", "streamGenerateContent"):
+            return gemini_error(404, f"Unknown method {action}")
+
+        body = await request.json()
+        prompt_type = classify_prompt(extract_prompt(body))
+        self.stats[f"{action}:{prompt_type}"] += 1
+
+        await asyncio.sleep(self.latency())
+        failure = self._injected_failure()
+        if failure is not None:
+            return failure
+
+        text = self._payload_text(prompt_type)
+        if action == "generateContent":
+            return web.json_response(gemini_response(text))
+        return await self._stream(request, text)
+
+    async def _stream(self, request: web.Request, text: str) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        chunks = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)] or [""]
+        for index, chunk in enumerate(chunks):
+            payload = gemini_response(chunk, finish=index == len(chunks) - 1)
+            await response.write(f"data: {json.dumps(payload)}\r\n\r\n".encode("utf-8"))
+            if self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+        await response.write_eof()
+        return response
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.stats))
+
+def build_app(stub: GeminiStub) -> web.Application:
+    app = web.Application()
+    app.router.add_post("/v1beta/models/{target}", stub.handle)
+    app.router.add_get("/stats", stub.handle_stats)
+    return app
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stub Gemini API lokal")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", default="fixed:300", help="Distribusi latency dalam ms (lihat docstring)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probabilitas respons 500/503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Probabilitas respons 429")
+    parser.add_argument("--chunk-size", type=int, default=12, help="Jumlah karakter per chunk streaming")
+    parser.add_argument("--chunk-delay", type=float, default=40, help="Jeda antar chunk streaming (ms)")
+    parser.add_argument("--payloads", metavar="PATH", help="JSON override payload per jenis prompt")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    payloads = dict(CANNED_PAYLOADS)
+    if args.payloads:
+        with open(args.payloads, encoding="utf-8") as f:
+            payloads.update(json.load(f))
+
+    stub = GeminiStub(
+        latency=parse_latency(args.latency, rng),
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        chunk_size=max(1, args.chunk_size),
+        chunk_delay=args.chunk_delay / 1000,
+        payloads=payloads,
+        rng=rng,
+    )
+    print(f"Gemini stub listening on http://{args.host}:{args.port}/v1beta")
+    web.run_app(build_app(stub), host=args.host, port=args.port, print=None)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""
+Microbenchmark untuk PhonemeMatcher (normalize_phonemes, align_phonemes, calculate_accuracy).
+
+Jalankan dari folder TalentaTalkBackend (offline, CPU saja):
+
+    python -m benchmarks.phoneme_bench
+    python -m benchmarks.phoneme_bench --save-baseline benchmarks/baseline.json
+    python -m benchmarks.phoneme_bench --compare benchmarks/baseline.json --threshold 0.15
+
+Exit code 1 jika p50 (median antar ronde) suatu case lebih lambat dari baseline melebihi threshold; p99 hanya dilaporkan.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Settings mewajibkan secret; benchmark tidak butuh DB maupun Gemini.
+for _key in ("SECRET_KEY", "GEMINI_API_KEY", "DB_PASSWORD"):
+    os.environ.setdefault(_key, "benchmark")
+
+from app.core.config import settings
+from app.utils.phoneme_utils import PhonemeMatcher
+
+PHONEME_INVENTORY = settings.VOWEL_PHONEMES + settings.DIPHTHONG_PHONEMES + settings.CONSONANT_PHONEMES
+TIE_BAR_FORMS = {v: k for k, v in settings.TIE_BAR_NORMALIZATION.items()}
+
+# Nama case -> (jumlah kata, rata-rata fonem per kata)
+SIZE_PROFILES: Dict[str, Tuple[int, int]] = {
+    "word": (1, 5),
+    "sentence_10w": (10, 4),
+    "sentence_30w": (30, 4),
+    "long_300w": (300, 4),
+}
+
+@dataclass
+class CaseResult:
+    name: str
+    function: str
+    calls: int
+    ops_per_sec: float
+    mean_us: float
+    p50_us: float
+    p99_us: float
+    alloc_peak_bytes: float
+    rounds: int = 1
+
+class SyntheticPhonemes:
+    """Generator pasangan target/user yang reproducible berdasarkan seed"""
+
+    def __init__(self, seed: int, error_rate: float):
+        self.rng = random.Random(seed)
+        self.error_rate = error_rate
+
+    def target(self, words: int, per_word: int) -> List[str]:
+        tokens = []
+        for _ in range(words):
+            length = max(1, int(self.rng.gauss(per_word, 1)))
+            tokens.extend(self.rng.choice(PHONEME_INVENTORY) for _ in range(length))
+        return tokens
+
+    def realise(self, target: List[str]) -> List[str]:
+        """Simulasi ucapan user: substitusi (mirip/acak), delesi, dan insersi"""
+        user = []
+        for phoneme in target:
+            roll = self.rng.random()
+            if roll >= self.error_rate:
+                user.append(phoneme)
+                continue
+            kind = self.rng.random()
+            if kind < 0.5:
+                similars = PhonemeMatcher.get_similar_phonemes(phoneme)
+                user.append(self.rng.choice(similars) if similars and self.rng.random() < 0.6 else self.rng.choice(PHONEME_INVENTORY))
+            elif kind < 0.8:
+                continue
+            else:
+                user.append(phoneme)
+                user.append(self.rng.choice(PHONEME_INVENTORY))
+        return user
+
+    def render(self, tokens: List[str]) -> str:
+        # Sebagian afrikat ditulis dengan tie bar agar normalize_phonemes ikut teruji
+        return " ".join(TIE_BAR_FORMS.get(t, t) if self.rng.random() < 0.5 else t for t in tokens)
+
+    def pairs(self, words: int, per_word: int, count: int) -> List[Tuple[str, str]]:
+        result = []
+        for _ in range(count):
+            target = self.target(words, per_word)
+            result.append((self.render(target), self.render(self.realise(target))))
+        return result
+
+def _measure(fn: Callable, args_list: List[tuple], min_time: float, min_samples: int) -> Tuple[List[float], int]:
+    # Minimal min_samples panggilan agar ekor p99 berisi cukup sampel (1000 -> ~10 sampel di atas p99)
+    timings: List[float] = []
+    calls = 0
+    perf = time.perf_counter
+    deadline = perf() + min_time
+    required = max(len(args_list), min_samples)
+    while perf() < deadline or calls < required:
+        args = args_list[calls % len(args_list)]
+        start = perf()
+        fn(*args)
+        timings.append(perf() - start)
+        calls += 1
+    return timings, calls
+
+def _measure_allocations(fn: Callable, args_list: List[tuple]) -> float:
+    """Puncak memori yang dialokasikan per panggilan (tracemalloc), dipisah dari pengukuran waktu"""
+    tracemalloc.start()
+    try:
+        total = 0
+        for args in args_list:
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn(*args)
+            total += tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+    return total / len(args_list)
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+def run_suite(seed: int, error_rate: float, min_time: float, samples: int, cases: Optional[List[str]] = None,
+              min_samples: int = 1000, rounds: int = 5) -> List[CaseResult]:
+    generator = SyntheticPhonemes(seed, error_rate)
+    results: List[CaseResult] = []
+
+    for name, (words, per_word) in SIZE_PROFILES.items():
+        if cases and name not in cases:
+            continue
+        pairs = generator.pairs(words, per_word, samples)
+        alignments = [PhonemeMatcher.align_phonemes(t, u) for t, u in pairs]
+
+        targets = [(PhonemeMatcher.normalize_phonemes, [(t,) for t, _ in pairs])]
+        targets.append((PhonemeMatcher.align_phonemes, pairs))
+        targets.append((PhonemeMatcher.calculate_accuracy, [(a,) for a in alignments]))
+
+        for fn, args_list in targets:
+            fn(*args_list[0])  # warm-up
+            # Beberapa ronde; yang dilaporkan median antar ronde agar satu ronde yang terganggu noise tidak menggeser hasil
+            all_timings: List[float] = []
+            round_p50, round_p99 = [], []
+            for _ in range(rounds):
+                timings, _ = _measure(fn, args_list, min_time, min_samples)
+                round_p50.append(_percentile(timings, 50))
+                round_p99.append(_percentile(timings, 99))
+                all_timings.extend(timings)
+            alloc_bytes = _measure_allocations(fn, args_list)
+            total = sum(all_timings)
+            results.append(CaseResult(
+                name=name,
+                function=fn.__name__,
+                calls=len(all_timings),
+                ops_per_sec=round(len(all_timings) / total, 1) if total > 0 else 0.0,
+                mean_us=round(statistics.fmean(all_timings) * 1e6, 2),
+                p50_us=round(statistics.median(round_p50) * 1e6, 2),
+                p99_us=round(statistics.median(round_p99) * 1e6, 2),
+                alloc_peak_bytes=round(alloc_bytes, 1),
+                rounds=rounds,
+            ))
+    return results
+
+def _change(old_val: float, new_val: float) -> float:
+    return (new_val - old_val) / old_val if old_val > 0 else 0.0
+
+def compare_to_baseline(results: List[CaseResult], baseline: dict, threshold: float) -> Tuple[List[str], List[str]]:
+    """Gate regresi hanya pada p50 (median antar ronde); p99 terlalu noisy untuk gate sehingga hanya dilaporkan"""
+    previous = {(c["name"], c["function"]): c for c in baseline.get("results", [])}
+    regressions, p99_notes = [], []
+    for r in results:
+        old = previous.get((r.name, r.function))
+        if not old:
+            continue
+        change = _change(old["p50_us"], r.p50_us)
+        if change > threshold:
+            regressions.append(f"{r.name}/{r.function} p50_us: {old['p50_us']:.2f}us -> {r.p50_us:.2f}us (+{change:.0%})")
+        change = _change(old["p99_us"], r.p99_us)
+        if change > threshold:
+            p99_notes.append(f"{r.name}/{r.function} p99_us: {old['p99_us']:.2f}us -> {r.p99_us:.2f}us (+{change:.0%})")
+    return regressions, p99_notes
+
+def print_table(results: List[CaseResult]):
+    header = f"{'case':<14}{'function':<22}{'ops/sec':>12}{'mean us':>11}{'p50 us':>11}{'p99 us':>11}{'alloc B/call':>14}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r.name:<14}{r.function:<22}{r.ops_per_sec:>12,.0f}{r.mean_us:>11.2f}{r.p50_us:>11.2f}{r.p99_us:>11.2f}{r.alloc_peak_bytes:>14,.0f}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark PhonemeMatcher")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--error-rate", type=float, default=0.15, help="Probabilitas error per fonem (0..1)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Durasi minimum per fungsi per case (detik)")
+    parser.add_argument("--samples", type=int, default=50, help="Jumlah pasangan sintetis per case")
+    parser.add_argument("--min-samples", type=int, default=1000, help="Jumlah panggilan minimum per ronde (ekor p99 butuh >= 1000)")
+    parser.add_argument("--rounds", type=int, default=5, help="Jumlah ronde per fungsi; p50/p99 dilaporkan sebagai median antar ronde")
+    parser.add_argument("--case", action="append", choices=list(SIZE_PROFILES), help="Batasi ke case tertentu")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH", help="File baseline JSON untuk deteksi regresi")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Batas regresi relatif (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    if args.rounds < 1 or args.min_samples < 1:
+        parser.error("--rounds dan --min-samples minimal 1")
+
+    results = run_suite(args.seed, args.error_rate, args.min_time, args.samples, args.case, args.min_samples, args.rounds)
+    print_table(results)
+
+    if args.save_baseline:
+        payload = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "params": {"seed": args.seed, "error_rate": args.error_rate, "samples": args.samples,
+                       "min_samples": args.min_samples, "rounds": args.rounds},
+            "results": [asdict(r) for r in results],
+        }
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        print(f"\nBaseline disimpan ke {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("params", {}).get("seed") != args.seed or baseline.get("params", {}).get("error_rate") != args.error_rate:
+            print("\nPeringatan: seed/error-rate berbeda dengan baseline, perbandingan tidak apple-to-apple")
+        regressions, p99_notes = compare_to_baseline(results, baseline, args.threshold)
+        if p99_notes:
+            print(f"\nInfo p99 (> {args.threshold:.0%}, tidak dijadikan gate):")
+            for line in p99_notes:
+                print(f"  {line}")
+        if regressions:
+            print(f"\nREGRESI p50 (> {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nTidak ada regresi di atas {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
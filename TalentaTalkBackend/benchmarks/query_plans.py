@@ -0,0 +1,236 @@
+"""
+Regression test query plan: EXPLAIN setiap query repository di jalur panas, gagal jika ada Seq Scan di tabel besar.
+
+Butuh Postgres lokal yang sudah dimigrasi (env DB_* sama seperti backend). Jalankan dari folder TalentaTalkBackend:
+
+    alembic upgrade head
+    python -m benchmarks.query_plans --seed 200
+    python -m benchmarks.query_plans --scenario talent.phoneme_history --verbose
+
+--seed N mengisi N talent sintetis beserta materi & hasil latihan/ujian lalu ANALYZE (hanya untuk database lokal/scratch).
+Query dijalankan lewat method repository asli; EXPLAIN diambil dari statement yang benar-benar dikirim ke database.
+enable_seqscan dimatikan sehingga Seq Scan hanya muncul jika memang tidak ada index yang bisa dipakai.
+Semua perubahan data dari skenario di-rollback. Exit code 1 jika ada query panas yang jatuh ke Seq Scan.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Settings mewajibkan secret; harness tidak memanggil Gemini.
+for _key in ("SECRET_KEY", "GEMINI_API_KEY"):
+    os.environ.setdefault(_key, "benchmark")
+
+from sqlalchemy import event, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.models.models import (
+    Talent, Hasillatihanfonem, Hasillatihanpercakapan, Hasillatihaninterview, Ujianfonem, Detailujianfonem,
+    Materifonemkata, Materifonemkalimat, Materiujian, Materiujiankalimat, Materipercakapan
+)
+from app.repositories.dashboard_repository import DashboardRepository
+from app.repositories.exam_repository import ExamRepository
+from app.repositories.history_repository import HistoryRepository
+from app.repositories.material_repository import MaterialRepository
+from app.repositories.talent_repository import TalentRepository
+from app.repositories.talent_stats_repository import TalentStatsRepository
+from app.utils.pagination import encode_cursor
+
+# Tabel yang tumbuh bersama jumlah talent/latihan: Seq Scan di sini = regresi
+HOT_TABLES = {
+    "hasillatihanfonem", "hasillatihanpercakapan", "hasillatihaninterview", "ujianfonem", "detailujianfonem",
+    "materifonemkata", "materifonemkalimat", "materiujian", "materiujiankalimat", "talentstats", "talent",
+}
+CATEGORIES = ["Vowels", "Diphthongs", "Consonants", "Minimal Pairs"]
+
+@dataclass
+class Fixture:
+    talent_id: int
+    ujian_id: int
+    exam_id: int
+    category: str
+
+@dataclass
+class PlanResult:
+    scenario: str
+    statements: int = 0
+    seq_scans: List[str] = field(default_factory=list)
+    plans: List[Dict[str, Any]] = field(default_factory=list)
+
+class PlanCapture:
+    """Listener before_cursor_execute: EXPLAIN statement SELECT di cursor yang sama sebelum dieksekusi"""
+    def __init__(self):
+        self.current: Optional[PlanResult] = None
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if self.current is None or executemany or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return
+        cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+        plan = cursor.fetchall()[0][0]
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        self.current.statements += 1
+        self.current.plans.append({"sql": statement, "plan": plan[0]["Plan"]})
+        for node in _walk(plan[0]["Plan"]):
+            if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in HOT_TABLES:
+                self.current.seq_scans.append(f"{node['Relation Name']} (statement #{self.current.statements})")
+
+def _walk(node: Dict[str, Any]):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+def _scenarios(fx: Fixture) -> Dict[str, Callable[[AsyncSession], Awaitable[Any]]]:
+    far_cursor = encode_cursor([datetime.utcnow() + timedelta(days=1), 2**31 - 1])
+    return {
+        "talent.phoneme_history": lambda db: TalentRepository(db).get_phoneme_history_paginated(fx.talent_id, "Word", 0, 10),
+        "talent.phoneme_history_cursor": lambda db: TalentRepository(db).get_phoneme_history_paginated(fx.talent_id, "Sentence", 0, 10, far_cursor),
+        "talent.exam_history": lambda db: TalentRepository(db).get_exam_history_paginated(fx.talent_id, 0, 10),
+        "talent.exam_history_cursor": lambda db: TalentRepository(db).get_exam_history_paginated(fx.talent_id, 0, 10, far_cursor, with_total=False),
+        "talent.conversation_history": lambda db: TalentRepository(db).get_conversation_history_paginated(fx.talent_id, 0, 10),
+        "talent.interview_history": lambda db: TalentRepository(db).get_interview_history_paginated(fx.talent_id, 0, 10),
+        "talent.exam_attempt_detail": lambda db: TalentRepository(db).get_exam_attempt_detail(fx.talent_id, fx.ujian_id),
+        "history.phoneme": lambda db: HistoryRepository(db).get_phoneme_history(fx.talent_id, days_back=30),
+        "history.conversation": lambda db: HistoryRepository(db).get_conversation_history(fx.talent_id, days_back=30),
+        "history.exam": lambda db: HistoryRepository(db).get_exam_history(fx.talent_id, days_back=30, limit=10),
+        "exam.active_exam": lambda db: ExamRepository(db).get_active_exam(fx.talent_id, fx.exam_id),
+        "exam.answered_ids": lambda db: ExamRepository(db).get_answered_question_ids(fx.ujian_id),
+        "exam.remaining_questions": lambda db: ExamRepository(db).get_remaining_questions(fx.exam_id, [1]),
+        "exam.details_with_questions": lambda db: ExamRepository(db).get_exam_details_with_questions(fx.ujian_id),
+        "material.words_by_category": lambda db: MaterialRepository(db).get_words_by_category(fx.category),
+        "material.sentences_by_category": lambda db: MaterialRepository(db).get_sentences_by_category(fx.category),
+        "material.words_by_category_page": lambda db: MaterialRepository(db).get_words_by_category_paginated(fx.category, 0, 10),
+        "material.sentences_by_category_page": lambda db: MaterialRepository(db).get_sentences_by_category_paginated(fx.category, 0, 10),
+        "material.exams_by_category_page": lambda db: MaterialRepository(db).get_exams_by_category_paginated(fx.category, 0, 10),
+        "dashboard.recent_mobile": lambda db: DashboardRepository(db).get_user_recent_activities_mobile(fx.talent_id),
+        "stats.rebuild_one": lambda db: TalentStatsRepository(db).rebuild(fx.talent_id),
+    }
+
+async def seed(db: AsyncSession, talents: int, per_talent: int, rng: random.Random):
+    """Data sintetis: materi per kategori + hasil latihan/ujian per talent, lalu ANALYZE"""
+    now = datetime.utcnow()
+    run = rng.randrange(10**6)
+    word_ids = (await db.execute(insert(Materifonemkata).returning(Materifonemkata.idmaterifonemkata), [
+        {"kategori": CATEGORIES[i % len(CATEGORIES)], "kata": f"word{i}", "fonem": "wɜːd"} for i in range(200)
+    ])).scalars().all()
+    sentence_ids = (await db.execute(insert(Materifonemkalimat).returning(Materifonemkalimat.idmaterifonemkalimat), [
+        {"kategori": CATEGORIES[i % len(CATEGORIES)], "kalimat": f"sentence {i}", "fonem": "ˈsɛntəns"} for i in range(200)
+    ])).scalars().all()
+    exam_ids = (await db.execute(insert(Materiujian).returning(Materiujian.idmateriujian), [
+        {"kategori": CATEGORIES[i % len(CATEGORIES)]} for i in range(20)
+    ])).scalars().all()
+    exam_sentences = {exam_id: (await db.execute(insert(Materiujiankalimat).returning(Materiujiankalimat.idmateriujiankalimat), [
+        {"idmateriujian": exam_id, "kalimat": f"exam sentence {j}", "fonem": "ɪɡˈzæm"} for j in range(5)
+    ])).scalars().all() for exam_id in exam_ids}
+    topic_id = await db.scalar(insert(Materipercakapan).values(topic="Benchmark").returning(Materipercakapan.idmateripercakapan))
+
+    talent_ids = (await db.execute(insert(Talent).returning(Talent.idtalent), [
+        {"nama": f"Plan Talent {i}", "email": f"plan-{run}-{i}@bench.local", "password": "-", "role": "talent"} for i in range(talents)
+    ])).scalars().all()
+    for talent_id in talent_ids:
+        def at(): return now - timedelta(days=rng.randrange(120), seconds=rng.randrange(86400))
+        await db.execute(insert(Hasillatihanfonem), [{
+            "idtalent": talent_id, "typelatihan": rng.choice(["Word", "Sentence"]), "idsoal": rng.choice(word_ids + sentence_ids),
+            "nilai": rng.uniform(40, 100), "waktulatihan": at()
+        } for _ in range(per_talent)])
+        await db.execute(insert(Hasillatihanpercakapan), [
+            {"idtalent": talent_id, "idmateripercakapan": topic_id, "wpm": rng.uniform(60, 160), "waktulatihan": at()} for _ in range(per_talent // 5 + 1)
+        ])
+        await db.execute(insert(Hasillatihaninterview), [
+            {"idtalent": talent_id, "wpm": rng.uniform(60, 160), "feedback": "ok", "waktulatihan": at()} for _ in range(per_talent // 5 + 1)
+        ])
+        for _ in range(per_talent // 10 + 1):
+            exam_id = rng.choice(exam_ids)
+            ujian_id = await db.scalar(insert(Ujianfonem).values(
+                idtalent=talent_id, idmateriujian=exam_id, kategori="Benchmark", nilai=rng.uniform(40, 100), waktuujian=at()
+            ).returning(Ujianfonem.idujian))
+            await db.execute(insert(Detailujianfonem), [
+                {"idujian": ujian_id, "idsoal": soal_id, "nilai": rng.uniform(40, 100)} for soal_id in exam_sentences[exam_id]
+            ])
+    await db.commit()
+    for table in sorted(HOT_TABLES | {"materipercakapan"}):
+        await db.execute(text(f"ANALYZE {table}"))
+    await db.commit()
+
+async def load_fixture(db: AsyncSession) -> Optional[Fixture]:
+    """Talent dengan hasil ujian terbanyak sebagai parameter query"""
+    row = (await db.execute(
+        select(Ujianfonem.idtalent, func.max(Ujianfonem.idujian), func.max(Ujianfonem.idmateriujian), func.max(Materiujian.kategori))
+        .join(Materiujian, Materiujian.idmateriujian == Ujianfonem.idmateriujian)
+        .group_by(Ujianfonem.idtalent).order_by(func.count().desc()).limit(1)
+    )).first()
+    return Fixture(*row) if row else None
+
+async def run(args) -> List[PlanResult]:
+    engine = create_async_engine(
+        settings.SQLALCHEMY_DATABASE_URI, poolclass=NullPool,
+        connect_args={"server_settings": {"enable_seqscan": "off"}}
+    )
+    capture = PlanCapture()
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    results = []
+    try:
+        if args.seed:
+            async with session_factory() as db:
+                await seed(db, args.seed, args.per_talent, random.Random(args.random_seed))
+        async with session_factory() as db:
+            fixture = await load_fixture(db)
+        if fixture is None:
+            print("Database kosong: jalankan dengan --seed N terlebih dahulu")
+            return results
+        for name, scenario in _scenarios(fixture).items():
+            if args.scenario and not any(name.startswith(s) for s in args.scenario):
+                continue
+            async with session_factory() as db:
+                capture.current = PlanResult(name)
+                try:
+                    await scenario(db)
+                finally:
+                    results.append(capture.current)
+                    capture.current = None
+                    await db.rollback()
+    finally:
+        await engine.dispose()
+    return results
+
+def print_report(results: List[PlanResult], verbose: bool):
+    header = f"{'scenario':<34}{'stmts':>6}  status"
+    print(header)
+    print("-" * (len(header) + 20))
+    for r in results:
+        status = "OK" if not r.seq_scans else "SEQ SCAN: " + ", ".join(r.seq_scans)
+        print(f"{r.scenario:<34}{r.statements:>6}  {status}")
+        if verbose:
+            for p in r.plans:
+                nodes = [f"{n['Node Type']}({n.get('Index Name') or n.get('Relation Name') or ''})" for n in _walk(p["plan"])]
+                print(f"    {' > '.join(nodes)}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Regression test query plan repository")
+    parser.add_argument("--seed", type=int, default=0, metavar="N", help="Isi N talent sintetis sebelum EXPLAIN (database lokal saja)")
+    parser.add_argument("--per-talent", type=int, default=50, help="Jumlah hasil latihan fonem per talent sintetis")
+    parser.add_argument("--random-seed", type=int, default=1234)
+    parser.add_argument("--scenario", action="append", help="Batasi ke skenario dengan prefix ini (mis. talent., history.phoneme)")
+    parser.add_argument("--verbose", action="store_true", help="Tampilkan node plan per statement")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    if not results:
+        return 1
+    print_report(results, args.verbose)
+    failed = [r for r in results if r.seq_scans]
+    if failed:
+        print(f"\n{len(failed)} skenario jatuh ke Seq Scan")
+        return 1
+    print(f"\nSemua {len(results)} skenario memakai index")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())